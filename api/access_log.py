@@ -0,0 +1,291 @@
+# LOG DE ACESSO DA API
+"""
+Log de acesso estruturado (uma linha JSON por requisição) emitido por uma
+fila em thread separada, com amostragem das requisições bem-sucedidas, e
+histogramas de latência por rota agregados em memória.
+"""
+
+import json
+import logging
+import queue
+import random
+import sys
+from bisect import bisect_left
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from .config import get_api_config
+
+
+# Limites superiores (ms) dos buckets dos histogramas; o último é infinito
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistograms:
+    """Histogramas de latência por rota (método + template do caminho)"""
+
+    def __init__(self, buckets_ms: tuple = LATENCY_BUCKETS_MS):
+        """
+        Inicializa os histogramas
+
+        Args:
+            buckets_ms: Limites superiores dos buckets, em ordem crescente
+        """
+        self._buckets = tuple(buckets_ms)
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = Lock()
+
+    def observe(self, route: str, duration_ms: float, error: bool = False) -> None:
+        """
+        Registra a duração de uma requisição (custo O(log buckets))
+
+        Args:
+            route: Identificador da rota (ex.: "GET /api/v1/news/{news_id}")
+            duration_ms: Duração em milissegundos
+            error: Indica se a resposta foi um erro (status >= 500)
+        """
+        index = bisect_left(self._buckets, duration_ms)
+
+        with self._lock:
+            data = self._routes.get(route)
+            if data is None:
+                data = {
+                    "counts": [0] * (len(self._buckets) + 1),
+                    "count": 0,
+                    "errors": 0,
+                    "sum_ms": 0.0,
+                    "max_ms": 0.0
+                }
+                self._routes[route] = data
+
+            data["counts"][index] += 1
+            data["count"] += 1
+            data["sum_ms"] += duration_ms
+            if error:
+                data["errors"] += 1
+            if duration_ms > data["max_ms"]:
+                data["max_ms"] = duration_ms
+
+    def _percentile(self, counts: List[int], total: int, p: float) -> Optional[float]:
+        """
+        Estima um percentil pelo limite superior do bucket que o contém
+
+        Returns:
+            Limite do bucket em ms, ou None no bucket "+Inf" (infinito não é
+            serializável em JSON)
+        """
+        target = p * total
+        accumulated = 0
+        for index, count in enumerate(counts):
+            accumulated += count
+            if accumulated >= target:
+                return float(self._buckets[index]) if index < len(self._buckets) else None
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna os histogramas e percentis estimados por rota
+
+        Returns:
+            Dicionário rota -> estatísticas
+        """
+        snapshot = self.snapshot()
+
+        labels = [str(limit) for limit in self._buckets] + ["+Inf"]
+        stats = {}
+        for route, data in sorted(snapshot.items()):
+            total = data["count"]
+            stats[route] = {
+                "count": total,
+                "errors": data["errors"],
+                "avg_ms": round(data["sum_ms"] / total, 3) if total else 0.0,
+                "max_ms": round(data["max_ms"], 3),
+                "p50_ms": self._percentile(data["counts"], total, 0.50),
+                "p95_ms": self._percentile(data["counts"], total, 0.95),
+                "p99_ms": self._percentile(data["counts"], total, 0.99),
+                "buckets_ms": dict(zip(labels, data["counts"]))
+            }
+
+        return stats
+
+    @property
+    def buckets_ms(self) -> tuple:
+        """Limites superiores dos buckets, em milissegundos"""
+        return self._buckets
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna uma cópia das contagens brutas por rota (para exportação)
+
+        Returns:
+            Dicionário rota -> {"counts", "count", "errors", "sum_ms", "max_ms"}
+        """
+        with self._lock:
+            return {route: dict(data, counts=list(data["counts"]))
+                    for route, data in self._routes.items()}
+
+    def clear(self) -> None:
+        """Descarta as medições acumuladas"""
+        with self._lock:
+            self._routes.clear()
+
+
+class AccessLogger:
+    """Log de acesso em JSON, gravado por uma thread dedicada"""
+
+    def __init__(self):
+        """Inicializa o logger de acesso (a thread só inicia em start())"""
+        self.config = get_api_config()
+        log_config = self.config.get_access_log_config()
+
+        self._enabled = log_config["enabled"]
+        self._sample_rate = log_config["sample_rate"]
+        self._slow_ms = log_config["slow_ms"]
+        self._file = log_config["file"]
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._listener: Optional[QueueListener] = None
+
+        # O logger só enfileira: formatação e escrita ficam com o listener
+        self._logger = logging.getLogger("vertex.access")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._logger.handlers = [QueueHandler(self._queue)]
+
+        self.histograms = LatencyHistograms()
+        self._sampled_out = 0
+        self._logged = 0
+
+    def start(self) -> None:
+        """Inicia a thread que grava o log de acesso"""
+        if not self._enabled or self._listener is not None:
+            return
+
+        if self._file:
+            handler = logging.FileHandler(self._file, encoding="utf-8")
+        else:
+            handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+        self._listener = QueueListener(self._queue, handler)
+        self._listener.start()
+
+    def stop(self) -> None:
+        """Grava as linhas pendentes e encerra a thread"""
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+
+    def should_log(self, status_code: int, duration_ms: float) -> bool:
+        """
+        Decide se a requisição entra no log
+
+        Erros (status >= 400) e requisições lentas são sempre registrados;
+        as demais entram com probabilidade ACCESS_LOG_SAMPLE_RATE.
+
+        Args:
+            status_code: Status HTTP da resposta
+            duration_ms: Duração em milissegundos
+
+        Returns:
+            True se a requisição deve ser registrada
+        """
+        if status_code >= 400 or duration_ms >= self._slow_ms:
+            return True
+        return random.random() < self._sample_rate
+
+    def record(self, method: str, route: str, path: str, status_code: int,
+               duration_ms: float, client: str = "", size: Optional[str] = None) -> None:
+        """
+        Agrega a latência da rota e, se amostrada, enfileira a linha de log
+
+        Args:
+            method: Método HTTP
+            route: Template da rota (ex.: /api/v1/news/{news_id})
+            path: Caminho requisitado (sem query string)
+            status_code: Status HTTP da resposta
+            duration_ms: Duração em milissegundos
+            client: IP do cliente
+            size: Valor do header Content-Length da resposta, se houver
+        """
+        self.histograms.observe(
+            f"{method} {route}", duration_ms, error=status_code >= 500)
+
+        if not self._enabled:
+            return
+
+        if not self.should_log(status_code, duration_ms):
+            self._sampled_out += 1
+            return
+
+        self._logged += 1
+        self._logger.info(json.dumps({
+            "ts": datetime.now().isoformat(),
+            "method": method,
+            "route": route,
+            "path": path,
+            "status": status_code,
+            "duration_ms": round(duration_ms, 3),
+            "client": client,
+            "bytes": int(size) if size and size.isdigit() else None,
+            "slow": duration_ms >= self._slow_ms
+        }, ensure_ascii=False, separators=(",", ":")))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna a configuração, os contadores do log e os histogramas por rota
+
+        Returns:
+            Dicionário com estatísticas
+        """
+        return {
+            "enabled": self._enabled,
+            "sample_rate": self._sample_rate,
+            "slow_ms": self._slow_ms,
+            "logged_requests": self._logged,
+            "sampled_out_requests": self._sampled_out,
+            "routes": self.histograms.get_stats()
+        }
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """
+    Obtém o template da rota atendida (ex.: /api/v1/news/{news_id}), evitando
+    uma série de métricas por ID
+
+    O router é incluído com prefixo e a rota só conhece o caminho relativo;
+    o prefixo é recuperado dos segmentos iniciais do caminho requisitado.
+
+    Args:
+        scope: Scope ASGI da requisição, após o roteamento
+
+    Returns:
+        Template da rota ou "<sem rota>" se nenhuma rota atendeu
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if not template:
+        return "<sem rota>"
+
+    route_parts = [part for part in template.split("/") if part]
+    path_parts = [part for part in scope.get("path", "").split("/") if part]
+    prefix_parts = path_parts[:max(0, len(path_parts) - len(route_parts))]
+
+    return "/" + "/".join(prefix_parts + route_parts)
+
+
+# Instância global do log de acesso
+access_logger = AccessLogger()
+
+
+def get_access_logger() -> AccessLogger:
+    """
+    Função de conveniência para obter a instância do log de acesso
+
+    Returns:
+        Instância de AccessLogger
+    """
+    return access_logger
@@ -6,16 +6,26 @@ Configuração completa com CORS, middleware e tratamento de erros.
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+import asyncio
 import time
 import logging
 from datetime import datetime
 
 from .config import get_api_config
 from .routes import router
+from .executor import get_db_executor
+from .services import get_news_service
+from .rate_limit import get_rate_limiter, get_client_key, retry_after_header
+from .compression import CompressionMiddleware
+from .access_log import get_access_logger, route_template
+from .events import get_feed_broadcaster
+from .metrics import (get_metrics_registry, http_requests_total, http_response_size_bytes,
+                      CONTENT_TYPE as METRICS_CONTENT_TYPE)
 from .models import ErrorResponse
+from database.db_manager import get_db_manager
 
 
 # Configuração da API
@@ -28,6 +38,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Log de acesso (gravado em thread própria a partir do startup)
+access_logger = get_access_logger()
+
 # Criar aplicação FastAPI
 app = FastAPI(
     title="Vertex News API",
@@ -39,6 +52,61 @@ app = FastAPI(
 )
 
 
+# Middleware de compressão (o mais interno: comprime o corpo gerado pelas rotas)
+compression_config = api_config.get_compression_config()
+if compression_config["enabled"]:
+    app.add_middleware(CompressionMiddleware,
+                       min_size=compression_config["min_size"])
+
+
+# Middleware de rate limiting (registrado antes do CORS para que as
+# respostas 429 também recebam os headers de CORS)
+rate_limit_config = api_config.get_rate_limit_config()
+
+
+@app.middleware("http")
+async def rate_limit_requests(request: Request, call_next):
+    """Middleware de rate limiting por token bucket (por IP ou chave de API)"""
+    if not rate_limit_config["enabled"] or request.method == "OPTIONS" \
+            or request.url.path in rate_limit_config["exempt_paths"]:
+        return await call_next(request)
+
+    limiter = get_rate_limiter()
+    client_key = get_client_key(
+        request.headers.get("x-api-key", ""),
+        request.client.host if request.client else "",
+        api_config.API_KEYS
+    )
+
+    if limiter.blocking:
+        allowed, retry_after, remaining = await get_db_executor().run(
+            limiter.acquire, client_key)
+    else:
+        allowed, retry_after, remaining = limiter.acquire(client_key)
+
+    if not allowed:
+        return JSONResponse(
+            status_code=429,
+            content=ErrorResponse(
+                success=False,
+                error="Limite de requisições excedido",
+                error_code="RATE_LIMITED",
+                timestamp=datetime.now().isoformat()
+            ).dict(),
+            headers={
+                "Retry-After": retry_after_header(retry_after),
+                "X-RateLimit-Limit": str(rate_limit_config["requests"]),
+                "X-RateLimit-Remaining": "0"
+            }
+        )
+
+    response = await call_next(request)
+    response.headers["X-RateLimit-Limit"] = str(rate_limit_config["requests"])
+    response.headers["X-RateLimit-Remaining"] = str(remaining)
+
+    return response
+
+
 # Middleware de CORS
 app.add_middleware(
     CORSMiddleware,
@@ -49,26 +117,34 @@ app.add_middleware(
 )
 
 
-# Middleware para logging de requisições
+# Middleware do log de acesso e dos histogramas de latência por rota
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Middleware para logging de requisições"""
-    start_time = time.time()
-
-    # Log da requisição
-    logger.info(f"Iniciando requisição: {request.method} {request.url}")
-
-    # Processar requisição
-    response = await call_next(request)
-
-    # Calcular tempo de processamento
-    process_time = time.time() - start_time
-
-    # Log da resposta
-    logger.info(
-        f"Requisição concluída: {request.method} {request.url} "
-        f"- Status: {response.status_code} - Tempo: {process_time:.3f}s"
-    )
+    """Middleware de log de acesso estruturado (amostrado) e latência por rota"""
+    start_time = time.perf_counter()
+
+    try:
+        response = await call_next(request)
+    except Exception:
+        route = route_template(request.scope)
+        http_requests_total.inc(request.method, route, "500")
+        access_logger.record(
+            request.method, route, request.url.path, 500,
+            (time.perf_counter() - start_time) * 1000,
+            request.client.host if request.client else "")
+        raise
+
+    process_time = time.perf_counter() - start_time
+    route = route_template(request.scope)
+    size = response.headers.get("content-length")
+
+    http_requests_total.inc(request.method, route, str(response.status_code))
+    if size and size.isdigit():
+        http_response_size_bytes.observe(int(size), route)
+
+    access_logger.record(
+        request.method, route, request.url.path, response.status_code,
+        process_time * 1000, request.client.host if request.client else "", size)
 
     # Adicionar header de tempo de processamento
     response.headers["X-Process-Time"] = str(process_time)
@@ -160,10 +236,44 @@ async def root():
         "status": "running",
         "docs": "/docs",
         "health": "/api/v1/health",
+        "metrics": "/metrics",
         "timestamp": datetime.now().isoformat()
     }
 
 
+# Métricas no formato do Prometheus
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Exposição das métricas da API no formato texto do Prometheus
+
+    Returns:
+        Contadores e histogramas de requisições, cache, banco e serialização
+    """
+    # A coleta pode consultar o banco (rate limiter SQLite): fora do event loop
+    body = await get_db_executor().run(get_metrics_registry().render)
+    return Response(content=body, media_type=METRICS_CONTENT_TYPE)
+
+
+async def refresh_statistics_periodically():
+    """Recalcula as estatísticas do banco em segundo plano para o health check"""
+    service = get_news_service()
+    interval = max(1, api_config.STATS_REFRESH_INTERVAL)
+
+    while True:
+        try:
+            if not await get_db_executor().run(service.refresh_statistics):
+                logger.warning("Não foi possível atualizar as estatísticas do banco")
+        except Exception as e:
+            logger.error(f"Erro ao atualizar estatísticas do banco: {e}")
+
+        await asyncio.sleep(interval)
+
+
+# Tarefa de atualização das estatísticas (criada no startup)
+stats_refresh_task = None
+
+
 # Evento de startup
 @app.on_event("startup")
 async def startup_event():
@@ -172,6 +282,27 @@ async def startup_event():
     logger.info(
         f"Configurações: Host={api_config.HOST}, Port={api_config.PORT}")
     logger.info(f"CORS Origins: {api_config.get_cors_origins()}")
+    logger.info(
+        f"Executor do banco: {api_config.DB_EXECUTOR_WORKERS} threads")
+
+    if api_config.WORKERS > 1:
+        for name, backend in (("CACHE_BACKEND", api_config.CACHE_BACKEND),
+                              ("RATE_LIMIT_BACKEND", api_config.RATE_LIMIT_BACKEND)):
+            if backend == "memory":
+                logger.warning(
+                    f"{name}=memory com {api_config.WORKERS} workers: "
+                    "cada processo mantém seu próprio estado (use sqlite)")
+
+    # Garantir índices novos (ex.: paginação) em bancos criados por versões anteriores
+    if not await get_db_executor().run(get_db_manager().initialize_main_database):
+        logger.warning("Não foi possível verificar o esquema do banco principal")
+
+    global stats_refresh_task
+    stats_refresh_task = asyncio.create_task(refresh_statistics_periodically())
+
+    await get_feed_broadcaster().start()
+
+    access_logger.start()
     logger.info("API iniciada com sucesso!")
 
 
@@ -181,17 +312,33 @@ async def shutdown_event():
     """Evento executado no encerramento da aplicação"""
     logger.info("Encerrando Vertex News API...")
 
+    if stats_refresh_task is not None:
+        stats_refresh_task.cancel()
+        try:
+            await stats_refresh_task
+        except asyncio.CancelledError:
+            pass
+
+    await get_feed_broadcaster().stop()
+
+    get_db_executor().shutdown()
+    access_logger.stop()
+
 
 # Função para executar a aplicação
 def run_app():
     """Executa a aplicação FastAPI"""
     import uvicorn
 
+    # reload e múltiplos workers são incompatíveis no uvicorn
+    workers = 1 if api_config.DEBUG else max(1, api_config.WORKERS)
+
     uvicorn.run(
         "api.app:app",
         host=api_config.HOST,
         port=api_config.PORT,
         reload=api_config.DEBUG,
+        workers=workers,
         log_level=api_config.LOG_LEVEL.lower()
     )
 
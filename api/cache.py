@@ -1,10 +1,14 @@
-# CACHE EM MEMÓRIA PARA API
+# CACHE DA API
 """
-Sistema de cache em memória para otimizar performance da API.
+Sistema de cache para otimizar performance da API: em memória (por processo)
+ou em um arquivo SQLite compartilhado pelos workers.
 """
 
+import json
+import sqlite3
+import threading
 import time
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List
 from threading import Lock
 from .config import get_api_config
 
@@ -12,6 +16,9 @@ from .config import get_api_config
 class APICache:
     """Cache em memória thread-safe para a API"""
 
+    # Indica se as operações fazem I/O e devem rodar fora do event loop
+    blocking = False
+
     def __init__(self):
         """Inicializa o cache"""
         self.config = get_api_config()
@@ -22,6 +29,22 @@ class APICache:
         self._max_size = cache_config["max_size"]
         self._ttl = cache_config["ttl"]
 
+        # Contadores para monitoramento
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+        # Versão dos dados do banco principal à qual o conteúdo corresponde
+        self._data_version: Optional[int] = None
+
+    @property
+    def data_version(self) -> Optional[int]:
+        """Versão dos dados vista pela última sincronização deste processo"""
+        with self._lock:
+            return self._data_version
+
     def _is_expired(self, timestamp: float) -> bool:
         """Verifica se um item do cache expirou"""
         return time.time() - timestamp > self._ttl
@@ -37,6 +60,7 @@ class APICache:
 
         for key in expired_keys:
             del self._cache[key]
+        self._expirations += len(expired_keys)
 
     def _evict_oldest(self):
         """Remove o item mais antigo quando o cache está cheio"""
@@ -46,6 +70,7 @@ class APICache:
         oldest_key = min(self._cache.keys(),
                          key=lambda k: self._cache[k]["timestamp"])
         del self._cache[oldest_key]
+        self._evictions += 1
 
     def get(self, key: str) -> Optional[Any]:
         """
@@ -59,6 +84,7 @@ class APICache:
         """
         with self._lock:
             if key not in self._cache:
+                self._misses += 1
                 return None
 
             data = self._cache[key]
@@ -66,19 +92,27 @@ class APICache:
             # Verificar se expirou
             if self._is_expired(data["timestamp"]):
                 del self._cache[key]
+                self._expirations += 1
+                self._misses += 1
                 return None
 
+            self._hits += 1
             return data["value"]
 
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, data_version: Optional[int] = None) -> None:
         """
         Armazena um valor no cache
 
         Args:
             key: Chave do cache
             value: Valor a ser armazenado
+            data_version: Versão dos dados usada para gerar o valor; se o
+                cache já foi sincronizado com outra versão, o valor é descartado
         """
         with self._lock:
+            if self._is_stale(data_version, self._data_version):
+                return
+
             # Limpar itens expirados primeiro
             self._cleanup_expired()
 
@@ -89,9 +123,58 @@ class APICache:
             # Armazenar o novo item
             self._cache[key] = {
                 "value": value,
-                "timestamp": time.time()
+                "timestamp": time.time(),
+                # Representações serializadas/comprimidas do valor
+                "variants": {}
             }
 
+    @staticmethod
+    def _is_stale(data_version: Optional[int], current_version: Optional[int]) -> bool:
+        """Indica se um valor foi gerado com uma versão dos dados já substituída"""
+        return (data_version is not None and current_version is not None
+                and data_version != current_version)
+
+    def get_variant(self, key: str, variant: str,
+                    build: Callable[[Any], bytes]) -> Optional[bytes]:
+        """
+        Obtém uma representação em bytes de um item do cache (ex.: JSON
+        comprimido), gerando-a uma única vez por item
+
+        A geração roda fora do lock; o resultado só é guardado se o item não
+        foi substituído nesse meio tempo.
+
+        Args:
+            key: Chave do cache
+            variant: Nome da representação (ex.: "identity", "gzip", "br")
+            build: Função que recebe o valor armazenado e gera os bytes
+
+        Returns:
+            Bytes da representação ou None se o item não existe/expirou
+        """
+        with self._lock:
+            data = self._cache.get(key)
+            if data is None:
+                return None
+
+            if self._is_expired(data["timestamp"]):
+                del self._cache[key]
+                self._expirations += 1
+                return None
+
+            encoded = data["variants"].get(variant)
+            if encoded is not None:
+                return encoded
+
+            value = data["value"]
+
+        encoded = build(value)
+
+        with self._lock:
+            if self._cache.get(key) is data:
+                data["variants"][variant] = encoded
+
+        return encoded
+
     def delete(self, key: str) -> bool:
         """
         Remove um item do cache
@@ -113,6 +196,37 @@ class APICache:
         with self._lock:
             self._cache.clear()
 
+    def sync_data_version(self, version: int) -> bool:
+        """
+        Descarta o conteúdo se os dados do banco mudaram desde que foi gerado
+
+        Args:
+            version: Versão atual dos dados (metadados.data_version)
+
+        Returns:
+            True se o cache foi invalidado
+        """
+        with self._lock:
+            changed = self._data_version is not None and version != self._data_version
+            if changed:
+                self._cache.clear()
+                self._invalidations += 1
+            self._data_version = version
+            return changed
+
+    def _counter_stats(self) -> Dict[str, Any]:
+        """Contadores de acesso do processo atual"""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "evictions": self._evictions,
+            "expirations": self._expirations,
+            "invalidations": self._invalidations,
+            "data_version": self._data_version
+        }
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Retorna estatísticas do cache
@@ -125,17 +239,359 @@ class APICache:
             expired_count = sum(1 for data in self._cache.values()
                                 if self._is_expired(data["timestamp"]))
 
+            variants = [data["variants"].values()
+                        for data in self._cache.values()]
+
             return {
+                "backend": "memory",
                 "total_items": len(self._cache),
                 "expired_items": expired_count,
                 "active_items": len(self._cache) - expired_count,
+                "encoded_variants": sum(len(v) for v in variants),
+                "encoded_bytes": sum(len(body) for v in variants for body in v),
                 "max_size": self._max_size,
-                "ttl": self._ttl
+                "ttl": self._ttl,
+                **self._counter_stats()
             }
 
 
+class SQLiteAPICache(APICache):
+    """
+    Cache em arquivo SQLite compartilhado pelos workers da API
+
+    Os valores são gravados em JSON; as leituras usam mmap e o modo WAL, e
+    não bloqueiam as escritas dos outros processos.
+    """
+
+    blocking = True
+
+    def __init__(self, db_path: str):
+        """
+        Inicializa o cache
+
+        Args:
+            db_path: Arquivo SQLite compartilhado pelos workers
+        """
+        super().__init__()
+        self._db_path = db_path
+        self._mmap_size = self.config.get_cache_config()["mmap_size"]
+        self._local = threading.local()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Obtém a conexão da thread atual, criando as tabelas se necessário"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self._mmap_size)}")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS api_cache (
+                    chave TEXT PRIMARY KEY,
+                    valor TEXT NOT NULL,
+                    criado REAL NOT NULL,
+                    versao INTEGER
+                )
+            """)
+            # Arquivos de cache anteriores não têm a versão dos dados por item
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(api_cache)")]
+            if "versao" not in columns:
+                conn.execute("ALTER TABLE api_cache ADD COLUMN versao INTEGER")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_api_cache_criado ON api_cache(criado)")
+            # Variantes ligadas à gravação do item pelo campo criado
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS api_cache_variantes (
+                    chave TEXT NOT NULL,
+                    variante TEXT NOT NULL,
+                    criado REAL NOT NULL,
+                    corpo BLOB NOT NULL,
+                    PRIMARY KEY (chave, variante)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS api_cache_meta (
+                    chave TEXT PRIMARY KEY,
+                    valor INTEGER
+                )
+            """)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Obtém um valor do cache
+
+        Args:
+            key: Chave do cache
+
+        Returns:
+            Valor armazenado ou None se não encontrado/expirado
+        """
+        try:
+            # Itens gerados com outra versão dos dados são ignorados
+            row = self._get_connection().execute("""
+                SELECT c.valor, c.criado FROM api_cache c
+                LEFT JOIN api_cache_meta m ON m.chave = 'data_version'
+                WHERE c.chave = ? AND (c.versao IS NULL OR m.valor IS NULL OR c.versao = m.valor)
+            """, (key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"[ERRO] Erro ao ler o cache compartilhado: {e}")
+            return None
+
+        with self._lock:
+            if row is None or self._is_expired(row[1]):
+                if row is not None:
+                    self._expirations += 1
+                self._misses += 1
+                return None
+            self._hits += 1
+
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, data_version: Optional[int] = None) -> None:
+        """
+        Armazena um valor no cache
+
+        A versão dos dados é conferida na mesma transação da gravação: um
+        worker que leu o banco antes de outro invalidar o cache não grava
+        sua resposta antiga por cima.
+
+        Args:
+            key: Chave do cache
+            value: Valor a ser armazenado (serializável em JSON)
+            data_version: Versão dos dados usada para gerar o valor
+        """
+        now = time.time()
+
+        try:
+            conn = self._get_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT valor FROM api_cache_meta WHERE chave = 'data_version'").fetchone()
+                if self._is_stale(data_version, row[0] if row else None):
+                    conn.execute("COMMIT")
+                    return
+
+                conn.execute(
+                    "DELETE FROM api_cache WHERE criado < ?", (now - self._ttl,))
+                expired = conn.execute("SELECT changes()").fetchone()[0]
+
+                conn.execute("""
+                    INSERT OR REPLACE INTO api_cache (chave, valor, criado, versao)
+                    VALUES (?, ?, ?, ?)
+                """, (key, json.dumps(value, ensure_ascii=False), now, data_version))
+
+                # Cache cheio: remover os mais antigos
+                conn.execute("""
+                    DELETE FROM api_cache WHERE chave IN (
+                        SELECT chave FROM api_cache ORDER BY criado DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                """, (self._max_size,))
+                evicted = conn.execute("SELECT changes()").fetchone()[0]
+
+                conn.execute("""
+                    DELETE FROM api_cache_variantes WHERE chave = ?
+                    OR chave NOT IN (SELECT chave FROM api_cache)
+                """, (key,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        except sqlite3.Error as e:
+            print(f"[ERRO] Erro ao gravar no cache compartilhado: {e}")
+            return
+
+        with self._lock:
+            self._expirations += expired
+            self._evictions += evicted
+
+    def get_variant(self, key: str, variant: str,
+                    build: Callable[[Any], bytes]) -> Optional[bytes]:
+        """
+        Obtém uma representação em bytes de um item do cache, gerando-a uma
+        única vez por item para todos os workers
+
+        Args:
+            key: Chave do cache
+            variant: Nome da representação (ex.: "identity", "gzip", "br")
+            build: Função que recebe o valor armazenado e gera os bytes
+
+        Returns:
+            Bytes da representação ou None se o item não existe/expirou
+        """
+        try:
+            conn = self._get_connection()
+            row = conn.execute("""
+                SELECT c.valor, c.criado, v.corpo
+                FROM api_cache c
+                LEFT JOIN api_cache_variantes v
+                    ON v.chave = c.chave AND v.variante = ? AND v.criado = c.criado
+                LEFT JOIN api_cache_meta m ON m.chave = 'data_version'
+                WHERE c.chave = ?
+                  AND (c.versao IS NULL OR m.valor IS NULL OR c.versao = m.valor)
+            """, (variant, key)).fetchone()
+
+            if row is None or self._is_expired(row[1]):
+                return None
+            if row[2] is not None:
+                return bytes(row[2])
+
+            encoded = build(json.loads(row[0]))
+
+            # Vinculada ao criado lido: se o item foi regravado, fica órfã
+            conn.execute("""
+                INSERT OR REPLACE INTO api_cache_variantes (chave, variante, criado, corpo)
+                VALUES (?, ?, ?, ?)
+            """, (key, variant, row[1], sqlite3.Binary(encoded)))
+            return encoded
+
+        except sqlite3.Error as e:
+            print(f"[ERRO] Erro ao ler variante do cache compartilhado: {e}")
+            return None
+
+    def delete(self, key: str) -> bool:
+        """
+        Remove um item do cache
+
+        Args:
+            key: Chave do cache
+
+        Returns:
+            True se o item foi removido, False se não existia
+        """
+        try:
+            conn = self._get_connection()
+            removed = conn.execute(
+                "DELETE FROM api_cache WHERE chave = ?", (key,)).rowcount
+            conn.execute(
+                "DELETE FROM api_cache_variantes WHERE chave = ?", (key,))
+            return removed > 0
+        except sqlite3.Error as e:
+            print(f"[ERRO] Erro ao remover do cache compartilhado: {e}")
+            return False
+
+    def clear(self) -> None:
+        """Limpa todo o cache (para todos os workers)"""
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM api_cache")
+            conn.execute("DELETE FROM api_cache_variantes")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def sync_data_version(self, version: int) -> bool:
+        """
+        Descarta o conteúdo se os dados do banco mudaram desde que foi gerado
+
+        A versão fica no próprio arquivo do cache: o primeiro worker a notar
+        a mudança limpa o cache para todos, dentro de uma transação.
+
+        Args:
+            version: Versão atual dos dados (metadados.data_version)
+
+        Returns:
+            True se o cache foi invalidado por este processo
+        """
+        with self._lock:
+            if version == self._data_version:
+                return False
+
+        try:
+            conn = self._get_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT valor FROM api_cache_meta WHERE chave = 'data_version'").fetchone()
+                # Sem versão gravada, o conteúdo tem origem desconhecida
+                changed = row is not None and row[0] != version
+                if row is None or changed:
+                    conn.execute("DELETE FROM api_cache")
+                    conn.execute("DELETE FROM api_cache_variantes")
+                    conn.execute("""
+                        INSERT OR REPLACE INTO api_cache_meta (chave, valor)
+                        VALUES ('data_version', ?)
+                    """, (version,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        except sqlite3.Error as e:
+            print(f"[ERRO] Erro ao sincronizar a versão do cache compartilhado: {e}")
+            return False
+
+        with self._lock:
+            if changed:
+                self._invalidations += 1
+            self._data_version = version
+        return changed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do cache (contadores de acesso deste processo)
+
+        Returns:
+            Dicionário com estatísticas
+        """
+        stats = {
+            "backend": "sqlite",
+            "total_items": 0,
+            "expired_items": 0,
+            "active_items": 0,
+            "encoded_variants": 0,
+            "encoded_bytes": 0,
+            "max_size": self._max_size,
+            "ttl": self._ttl
+        }
+
+        try:
+            conn = self._get_connection()
+            total, expired = conn.execute("""
+                SELECT COUNT(*), COALESCE(SUM(criado < ?), 0) FROM api_cache
+            """, (time.time() - self._ttl,)).fetchone()
+            variants, size = conn.execute("""
+                SELECT COUNT(*), COALESCE(SUM(LENGTH(corpo)), 0) FROM api_cache_variantes
+            """).fetchone()
+            stats.update({
+                "total_items": total,
+                "expired_items": expired,
+                "active_items": total - expired,
+                "encoded_variants": variants,
+                "encoded_bytes": size
+            })
+        except sqlite3.Error as e:
+            print(f"[ERRO] Erro ao obter estatísticas do cache compartilhado: {e}")
+
+        with self._lock:
+            stats.update(self._counter_stats())
+        return stats
+
+
+def create_api_cache() -> APICache:
+    """
+    Cria o cache conforme o backend configurado
+
+    Returns:
+        Instância de APICache
+    """
+    cache_config = get_api_config().get_cache_config()
+
+    if cache_config["backend"] == "sqlite":
+        return SQLiteAPICache(cache_config["db_path"])
+
+    return APICache()
+
+
 # Instância global do cache
-api_cache = APICache()
+api_cache = create_api_cache()
 
 
 def get_api_cache() -> APICache:
@@ -0,0 +1,282 @@
+# COMPRESSÃO DAS RESPOSTAS DA API
+"""
+Middleware de compressão (gzip e, se o pacote brotli estiver instalado, br)
+com tamanho mínimo, e respostas pré-comprimidas a partir do APICache.
+"""
+
+import gzip
+import json
+import zlib
+from typing import Any, Dict, Optional, Type
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .cache import get_api_cache
+from .config import get_api_config
+from .metrics import serialization_duration_seconds
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele, apenas gzip
+    brotli = None
+
+
+# Tipos de conteúdo que valem a pena comprimir (texto)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+# Eventos SSE precisam chegar ao cliente assim que enviados
+EXCLUDED_TYPES = ("text/event-stream",)
+
+
+def available_encodings() -> list:
+    """
+    Retorna as codificações suportadas, da preferida para a menos preferida
+
+    Returns:
+        Lista de codificações ("br" apenas com o pacote brotli instalado)
+    """
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def choose_encoding(accept_encoding: str,
+                    candidates: Optional[list] = None) -> Optional[str]:
+    """
+    Escolhe a codificação da resposta a partir do header Accept-Encoding
+
+    Args:
+        accept_encoding: Valor do header Accept-Encoding
+        candidates: Codificações disponíveis, da preferida para a menos
+            preferida (padrão: available_encodings())
+
+    Returns:
+        "br", "gzip" ou None se o cliente não aceita nenhuma delas
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in candidates if candidates is not None else available_encodings():
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """
+    Comprime um corpo de resposta completo
+
+    Args:
+        body: Bytes originais
+        encoding: "br" ou "gzip"
+
+    Returns:
+        Bytes comprimidos
+    """
+    config = get_api_config().get_compression_config()
+
+    if encoding == "br":
+        return brotli.compress(body, quality=config["brotli_quality"])
+
+    # mtime=0 deixa a saída determinística (igual para o mesmo conteúdo)
+    return gzip.compress(body, compresslevel=config["gzip_level"], mtime=0)
+
+
+def _is_compressible(content_type: str) -> bool:
+    """Indica se o tipo de conteúdo deve ser comprimido"""
+    content_type = content_type.lower()
+    if content_type.startswith(EXCLUDED_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class _StreamCompressor:
+    """Compressor incremental para respostas enviadas em partes"""
+
+    def __init__(self, encoding: str):
+        config = get_api_config().get_compression_config()
+        self._encoding = encoding
+
+        if encoding == "br":
+            self._compressor = brotli.Compressor(
+                quality=config["brotli_quality"])
+        else:
+            # wbits=31: formato gzip
+            self._compressor = zlib.compressobj(
+                config["gzip_level"], zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        """
+        Comprime uma parte, descarregando o que já pode ser enviado
+
+        Args:
+            data: Bytes da parte
+            final: Indica se é a última parte da resposta
+
+        Returns:
+            Bytes comprimidos prontos para envio
+        """
+        if self._encoding == "br":
+            output = self._compressor.process(data)
+            return output + (self._compressor.finish() if final else self._compressor.flush())
+
+        output = self._compressor.compress(data)
+        return output + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI de compressão
+
+    Respostas completas abaixo de min_size seguem sem compressão; respostas
+    já codificadas (ex.: pré-comprimidas pelo cache) passam intactas.
+    """
+
+    def __init__(self, app: ASGIApp, min_size: int = 1024):
+        self.app = app
+        self.min_size = min_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressionResponder(self.app, encoding, self.min_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    """Aplica a compressão a uma única resposta"""
+
+    def __init__(self, app: ASGIApp, encoding: str, min_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.min_size = min_size
+
+        self.initial_message: Optional[Message] = None
+        self.started = False
+        self.passthrough = False
+        self.compressor: Optional[_StreamCompressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Adiar o início: os headers dependem do tamanho do corpo
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = "content-encoding" in headers or \
+                not _is_compressible(headers.get("content-type", ""))
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+
+            if not more_body:
+                # Resposta completa: comprimir só se compensar
+                if len(body) >= self.min_size:
+                    body = compress_body(body, self.encoding)
+                    headers["Content-Encoding"] = self.encoding
+                    headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                await self._start()
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+            # Resposta em partes: comprimir incrementalmente
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            self.compressor = _StreamCompressor(self.encoding)
+            await self._start()
+
+        await self.send({
+            "type": "http.response.body",
+            "body": self.compressor.compress(body, final=not more_body),
+            "more_body": more_body
+        })
+
+    async def _start(self) -> None:
+        """Envia o início da resposta adiado, uma única vez"""
+        if not self.started:
+            self.started = True
+            await self.send(self.initial_message)
+
+
+def cached_json_response(request: Request, cache_key: str, model: Type[BaseModel],
+                         overrides: Optional[Dict[str, Any]] = None) -> Optional[Response]:
+    """
+    Monta a resposta de um item do cache reaproveitando o JSON e as versões
+    comprimidas geradas para ele, em vez de serializar/comprimir a cada acesso
+
+    Args:
+        request: Requisição atual (para o Accept-Encoding)
+        cache_key: Chave do item no APICache
+        model: Modelo de resposta do item (ex.: NewsResponse)
+        overrides: Campos que dependem da requisição e não do item (ex.: o
+            texto da busca); as variantes geradas com eles ficam separadas
+
+    Returns:
+        Response pronta ou None se o item não está mais no cache
+    """
+    cache = get_api_cache()
+    config = get_api_config().get_compression_config()
+    overrides = overrides or {}
+    suffix = f"|{json.dumps(overrides, sort_keys=True, ensure_ascii=False)}" if overrides else ""
+
+    def render(value) -> bytes:
+        with serialization_duration_seconds.time(model.__name__):
+            return JSONResponse(jsonable_encoder(
+                model(**dict(value, cached=True, **overrides)))).body
+
+    body = cache.get_variant(cache_key, "identity" + suffix, render)
+    if body is None:
+        return None
+
+    headers = {"Vary": "Accept-Encoding"}
+    encoding = None
+    if config["enabled"]:
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+
+    if encoding and len(body) >= config["min_size"]:
+        compressed = cache.get_variant(
+            cache_key, encoding + suffix, lambda value: compress_body(render(value), encoding))
+        if compressed is not None:
+            body = compressed
+            headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
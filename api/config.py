@@ -6,6 +6,8 @@ Configurações centralizadas para a API REST do Vertex News.
 import os
 from typing import Dict, Any
 
+from config.config import SNAPSHOT_CONFIG
+
 
 class APIConfig:
     """Classe para configurações da API"""
@@ -17,6 +19,9 @@ class APIConfig:
         self.HOST = os.getenv("API_HOST", "0.0.0.0")
         self.PORT = int(os.getenv("API_PORT", "8000"))
         self.DEBUG = os.getenv("API_DEBUG", "false").lower() == "true"
+        # Processos uvicorn (com mais de um, use os backends "sqlite" de
+        # cache e rate limiting para compartilhar o estado entre eles)
+        self.WORKERS = int(os.getenv("API_WORKERS", "1"))
 
         # Configurações de CORS
         self.CORS_ORIGINS = [
@@ -29,15 +34,71 @@ class APIConfig:
         # Configurações de cache
         self.CACHE_TTL = int(os.getenv("CACHE_TTL", "300"))  # 5 minutos
         self.CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", "100"))
+        # "memory" (por processo) ou "sqlite" (compartilhado entre workers)
+        self.CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+        self.CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", "api_cache.db")
+        self.CACHE_MMAP_SIZE = int(
+            os.getenv("CACHE_MMAP_SIZE", str(64 * 1024 * 1024)))
+        # Intervalo mínimo (s) entre verificações da versão dos dados do banco
+        self.CACHE_VERSION_CHECK_INTERVAL = float(
+            os.getenv("CACHE_VERSION_CHECK_INTERVAL", "1"))
+
+        # Configurações de compressão das respostas (gzip e, se instalado, brotli)
+        self.COMPRESSION_ENABLED = os.getenv(
+            "COMPRESSION_ENABLED", "true").lower() == "true"
+        # Respostas menores que isso não compensam a compressão
+        self.COMPRESSION_MIN_SIZE = int(
+            os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+        self.COMPRESSION_GZIP_LEVEL = int(
+            os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+        self.COMPRESSION_BROTLI_QUALITY = int(
+            os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
 
         # Configurações de rate limiting
         self.RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))
         self.RATE_LIMIT_WINDOW = int(
             os.getenv("RATE_LIMIT_WINDOW", "60"))  # 1 minuto
+        self.RATE_LIMIT_ENABLED = os.getenv(
+            "RATE_LIMIT_ENABLED", "true").lower() == "true"
+        # "memory" (por processo) ou "sqlite" (compartilhado entre workers)
+        self.RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+        self.RATE_LIMIT_DB_PATH = os.getenv(
+            "RATE_LIMIT_DB_PATH", "rate_limit.db")
+        self.RATE_LIMIT_MAX_CLIENTS = int(
+            os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+        # Chaves aceitas no header X-API-Key, separadas por vírgula: só elas
+        # ganham balde próprio (as demais requisições contam por IP)
+        self.API_KEYS = frozenset(
+            chave.strip() for chave in os.getenv("API_KEYS", "").split(",") if chave.strip())
+        self.RATE_LIMIT_EXEMPT_PATHS = [
+            "/", "/metrics", "/api/v1/health", "/api/v1/health/live", "/api/v1/health/ready"]
+
+        # Configurações do executor de acesso ao banco
+        self.DB_EXECUTOR_WORKERS = int(
+            os.getenv("DB_EXECUTOR_WORKERS", "4"))
+
+        # Intervalo de atualização das estatísticas exibidas no health check
+        self.STATS_REFRESH_INTERVAL = int(
+            os.getenv("STATS_REFRESH_INTERVAL", "60"))
+
+        # Eventos do feed (SSE): a versão dos dados é consultada uma vez por
+        # processo e as conexões abertas são notificadas quando ela muda
+        self.EVENTS_POLL_INTERVAL = float(
+            os.getenv("EVENTS_POLL_INTERVAL", "2"))
+        self.EVENTS_KEEPALIVE = float(os.getenv("EVENTS_KEEPALIVE", "15"))
+        self.EVENTS_MAX_CLIENTS = int(
+            os.getenv("EVENTS_MAX_CLIENTS", "5000"))
+        self.EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS", "5000"))
+
+        # Diretório dos snapshots estáticos gerados pelo pipeline (mesma
+        # origem do publisher: SNAPSHOT_CONFIG, que lê SNAPSHOT_DIR)
+        self.SNAPSHOT_DIR = SNAPSHOT_CONFIG['output_dir']
 
         # Configurações de dados
         self.DEFAULT_LIMIT = 15
         self.MAX_LIMIT = 50
+        # Linhas lidas do cursor por lote na exportação (/news/export)
+        self.EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
 
         # Configurações de validação
         self.VALIDATION_CONFIG = {
@@ -51,6 +112,17 @@ class APIConfig:
         self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
         self.LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
+        # Log de acesso (JSON por requisição): erros e requisições lentas
+        # sempre entram; as bem-sucedidas são amostradas
+        self.ACCESS_LOG_ENABLED = os.getenv(
+            "ACCESS_LOG_ENABLED", "true").lower() == "true"
+        self.ACCESS_LOG_SAMPLE_RATE = float(
+            os.getenv("ACCESS_LOG_SAMPLE_RATE", "0.1"))
+        self.ACCESS_LOG_SLOW_MS = float(
+            os.getenv("ACCESS_LOG_SLOW_MS", "500"))
+        # Arquivo de destino (vazio: saída padrão)
+        self.ACCESS_LOG_FILE = os.getenv("ACCESS_LOG_FILE", "")
+
     def get_cors_origins(self) -> list:
         """Retorna as origens permitidas para CORS"""
         return self.CORS_ORIGINS.copy()
@@ -59,14 +131,57 @@ class APIConfig:
         """Retorna configurações de cache"""
         return {
             "ttl": self.CACHE_TTL,
-            "max_size": self.CACHE_MAX_SIZE
+            "max_size": self.CACHE_MAX_SIZE,
+            "backend": self.CACHE_BACKEND,
+            "db_path": self.CACHE_DB_PATH,
+            "mmap_size": self.CACHE_MMAP_SIZE,
+            "version_check_interval": self.CACHE_VERSION_CHECK_INTERVAL
+        }
+
+    def get_compression_config(self) -> Dict[str, Any]:
+        """Retorna configurações de compressão das respostas"""
+        return {
+            "enabled": self.COMPRESSION_ENABLED,
+            "min_size": self.COMPRESSION_MIN_SIZE,
+            "gzip_level": self.COMPRESSION_GZIP_LEVEL,
+            "brotli_quality": self.COMPRESSION_BROTLI_QUALITY
+        }
+
+    def get_access_log_config(self) -> Dict[str, Any]:
+        """Retorna configurações do log de acesso"""
+        return {
+            "enabled": self.ACCESS_LOG_ENABLED,
+            "sample_rate": self.ACCESS_LOG_SAMPLE_RATE,
+            "slow_ms": self.ACCESS_LOG_SLOW_MS,
+            "file": self.ACCESS_LOG_FILE
+        }
+
+    def get_events_config(self) -> Dict[str, Any]:
+        """Retorna configurações dos eventos do feed (SSE)"""
+        return {
+            "poll_interval": self.EVENTS_POLL_INTERVAL,
+            "keepalive": self.EVENTS_KEEPALIVE,
+            "max_clients": self.EVENTS_MAX_CLIENTS,
+            "retry_ms": self.EVENTS_RETRY_MS
         }
 
-    def get_rate_limit_config(self) -> Dict[str, int]:
+    def get_rate_limit_config(self) -> Dict[str, Any]:
         """Retorna configurações de rate limiting"""
         return {
             "requests": self.RATE_LIMIT_REQUESTS,
-            "window": self.RATE_LIMIT_WINDOW
+            "window": self.RATE_LIMIT_WINDOW,
+            "enabled": self.RATE_LIMIT_ENABLED,
+            "backend": self.RATE_LIMIT_BACKEND,
+            "db_path": self.RATE_LIMIT_DB_PATH,
+            "max_clients": self.RATE_LIMIT_MAX_CLIENTS,
+            "api_keys": self.API_KEYS,
+            "exempt_paths": self.RATE_LIMIT_EXEMPT_PATHS.copy()
+        }
+
+    def get_executor_config(self) -> Dict[str, int]:
+        """Retorna configurações do executor de acesso ao banco"""
+        return {
+            "max_workers": self.DB_EXECUTOR_WORKERS
         }
 
     def get_validation_config(self) -> Dict[str, Any]:
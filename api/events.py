@@ -0,0 +1,196 @@
+# EVENTOS DO FEED (SERVER-SENT EVENTS)
+"""
+Difusão de eventos "feed-updated" para os clientes conectados via SSE.
+
+Uma única tarefa por processo acompanha a versão dos dados do banco
+principal (metadados.data_version) e, quando ela muda, acorda todas as
+conexões de uma vez; a mensagem é codificada uma única vez e compartilhada.
+Conexões ociosas ficam apenas aguardando um asyncio.Event.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Optional
+
+from .config import get_api_config
+from .executor import get_db_executor
+from database.db_manager import get_db_manager
+
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(event: str, data: dict, event_id: Optional[int] = None) -> bytes:
+    """
+    Codifica uma mensagem no formato text/event-stream
+
+    Args:
+        event: Nome do evento
+        data: Conteúdo (serializado em JSON)
+        event_id: ID do evento (o cliente o reenvia em Last-Event-ID)
+
+    Returns:
+        Bytes da mensagem
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+class FeedBroadcaster:
+    """Acompanha a versão dos dados e notifica os assinantes SSE"""
+
+    def __init__(self):
+        """Inicializa o difusor (a tarefa de acompanhamento só inicia em start())"""
+        self.config = get_api_config()
+        events_config = self.config.get_events_config()
+
+        self._poll_interval = events_config["poll_interval"]
+        self._keepalive = events_config["keepalive"]
+        self._max_clients = events_config["max_clients"]
+        self._retry_ms = events_config["retry_ms"]
+
+        self._version: Optional[int] = None
+        self._message: Optional[bytes] = None
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self._clients = 0
+        self._events_sent = 0
+        self._broadcasts = 0
+
+    @property
+    def version(self) -> Optional[int]:
+        """Última versão dos dados observada"""
+        return self._version
+
+    def has_capacity(self) -> bool:
+        """Indica se ainda cabe mais uma conexão"""
+        return self._clients < self._max_clients
+
+    async def start(self) -> None:
+        """Lê a versão inicial e inicia a tarefa de acompanhamento"""
+        if self._task is not None:
+            return
+
+        self._version = await get_db_executor().run(get_db_manager().get_data_version)
+        self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        """Encerra a tarefa de acompanhamento"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _watch(self) -> None:
+        """Consulta a versão dos dados periodicamente (uma consulta por processo)"""
+        db_manager = get_db_manager()
+
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            try:
+                version = await get_db_executor().run(db_manager.get_data_version)
+            except Exception as e:
+                logger.error(f"Erro ao verificar a versão dos dados: {e}")
+                continue
+
+            if version and version != self._version:
+                self.publish(version)
+
+    def publish(self, version: int) -> None:
+        """
+        Registra uma nova versão dos dados e acorda todas as conexões
+
+        Args:
+            version: Nova versão dos dados
+        """
+        self._version = version
+        self._message = format_event(
+            "feed-updated",
+            {"version": version, "timestamp": datetime.now().isoformat()},
+            version)
+        self._broadcasts += 1
+
+        # Troca o Event: quem acordar passa a esperar pelo próximo
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def subscribe(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        Gera as mensagens SSE de uma conexão
+
+        A primeira mensagem informa a versão atual; se o cliente reconectou
+        (Last-Event-ID) e perdeu alguma atualização, ela vem como feed-updated.
+
+        Args:
+            last_event_id: Valor do header Last-Event-ID, se houver
+
+        Yields:
+            Bytes das mensagens
+        """
+        self._clients += 1
+        try:
+            yield f"retry: {self._retry_ms}\n\n".encode("utf-8")
+
+            seen = self._version
+            missed = last_event_id is not None and last_event_id.isdigit() \
+                and seen is not None and int(last_event_id) < seen
+            yield format_event("feed-updated" if missed else "hello",
+                               {"version": seen}, seen)
+
+            while True:
+                changed = self._changed
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=self._keepalive)
+                except asyncio.TimeoutError:
+                    # Comentário SSE: mantém proxies e a conexão abertos
+                    yield b": keepalive\n\n"
+                    continue
+
+                if self._version != seen and self._message is not None:
+                    seen = self._version
+                    self._events_sent += 1
+                    yield self._message
+        finally:
+            self._clients -= 1
+
+    def get_stats(self) -> dict:
+        """
+        Retorna os contadores do difusor
+
+        Returns:
+            Dicionário com estatísticas
+        """
+        return {
+            "connected_clients": self._clients,
+            "max_clients": self._max_clients,
+            "data_version": self._version,
+            "broadcasts": self._broadcasts,
+            "events_sent": self._events_sent,
+            "poll_interval": self._poll_interval
+        }
+
+
+# Instância global do difusor de eventos
+feed_broadcaster = FeedBroadcaster()
+
+
+def get_feed_broadcaster() -> FeedBroadcaster:
+    """
+    Função de conveniência para obter o difusor de eventos do feed
+
+    Returns:
+        Instância de FeedBroadcaster
+    """
+    return feed_broadcaster
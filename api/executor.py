@@ -0,0 +1,84 @@
+# EXECUTOR DEDICADO PARA ACESSO AO BANCO
+"""
+Pool de threads limitado para executar as operações síncronas do SQLite
+fora do event loop do uvicorn.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+from .config import get_api_config
+
+
+class DatabaseExecutor:
+    """Executor com número fixo de threads para as consultas da API"""
+
+    def __init__(self):
+        """Inicializa o executor"""
+        self.config = get_api_config()
+        executor_config = self.config.get_executor_config()
+
+        self._max_workers = max(1, executor_config["max_workers"])
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Cria o pool de threads sob demanda"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="vertex-db"
+                )
+            return self._executor
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Executa uma função bloqueante no pool sem travar o event loop
+
+        Args:
+            func: Função síncrona a executar
+            *args: Argumentos posicionais da função
+            **kwargs: Argumentos nomeados da função
+
+        Returns:
+            Valor retornado pela função
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), functools.partial(func, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        """Encerra o pool aguardando as consultas em andamento"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do executor
+
+        Returns:
+            Dicionário com estatísticas
+        """
+        return {
+            "max_workers": self._max_workers,
+            "running": self._executor is not None
+        }
+
+
+# Instância global do executor
+db_executor = DatabaseExecutor()
+
+
+def get_db_executor() -> DatabaseExecutor:
+    """
+    Função de conveniência para obter a instância do executor
+
+    Returns:
+        Instância de DatabaseExecutor
+    """
+    return db_executor
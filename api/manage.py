@@ -31,7 +31,8 @@ class APIManager:
 
     # ==================== FUNCIONALIDADES DE SERVIDOR ====================
 
-    def run_server(self, host: str = None, port: int = None, debug: bool = False, reload: bool = False):
+    def run_server(self, host: str = None, port: int = None, debug: bool = False, reload: bool = False,
+                   workers: int = None):
         """Executa o servidor da API"""
         try:
             from api.config import get_api_config
@@ -44,6 +45,12 @@ class APIManager:
                 config.PORT = port
             if debug:
                 config.DEBUG = True
+            if workers:
+                config.WORKERS = workers
+
+            # reload e múltiplos workers são incompatíveis no uvicorn
+            reload = reload or config.DEBUG
+            workers = 1 if reload else max(1, config.WORKERS)
 
             print("=" * 60)
             print("VERTEX NEWS API SERVER")
@@ -52,6 +59,8 @@ class APIManager:
             print(f"Port: {config.PORT}")
             print(f"Debug: {config.DEBUG}")
             print(f"Reload: {reload}")
+            print(f"Workers: {workers} (cache: {config.CACHE_BACKEND}, "
+                  f"rate limit: {config.RATE_LIMIT_BACKEND})")
             print("=" * 60)
             print("Iniciando servidor...")
             print("Documentação disponível em: http://localhost:8000/docs")
@@ -63,7 +72,8 @@ class APIManager:
                 "api.app:app",
                 host=config.HOST,
                 port=config.PORT,
-                reload=reload or config.DEBUG,
+                reload=reload,
+                workers=workers,
                 log_level="info" if not config.DEBUG else "debug"
             )
 
@@ -234,6 +244,163 @@ class APIManager:
 
         print("=" * 60)
 
+    # ==================== FUNCIONALIDADES DE CARGA ====================
+
+    def run_load_test(self, endpoint: str = "/news", total_requests: int = 500,
+                      concurrency: int = 20, encoding: str = "identity") -> Dict[str, Any]:
+        """
+        Executa um teste de carga com requisições concorrentes
+
+        Args:
+            endpoint: Endpoint a ser testado (relativo a /api/v1)
+            total_requests: Número total de requisições
+            concurrency: Número de clientes simultâneos
+            encoding: Valor do header Accept-Encoding (ex.: identity, gzip, br)
+
+        Returns:
+            Dicionário com latências (p50/p95/p99), vazão e bytes por resposta
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        import threading
+
+        url = f"{self.api_url}{endpoint}"
+        local = threading.local()
+
+        def do_request(_):
+            # Uma sessão por thread para reaproveitar conexões HTTP
+            session = getattr(local, "session", None)
+            if session is None:
+                session = requests.Session()
+                local.session = session
+
+            start = time.perf_counter()
+            size = 0
+            try:
+                # Ler o corpo sem descomprimir para medir os bytes trafegados
+                response = session.get(
+                    url, headers={"Accept-Encoding": encoding}, stream=True)
+                size = len(response.raw.read(decode_content=False))
+                ok = response.status_code < 500
+            except requests.RequestException:
+                ok = False
+            return time.perf_counter() - start, ok, size
+
+        print("=" * 60)
+        print("TESTE DE CARGA DA API")
+        print("=" * 60)
+        print(f"Endpoint: {url}")
+        print(f"Requisições: {total_requests} - Concorrência: {concurrency}")
+        print(f"Accept-Encoding: {encoding}")
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(do_request, range(total_requests)))
+        total_time = time.perf_counter() - start_time
+
+        latencies = sorted(latency for latency, _, _ in results)
+        errors = sum(1 for _, ok, _ in results if not ok)
+        total_bytes = sum(size for _, _, size in results)
+
+        def percentile(p: float) -> float:
+            index = min(len(latencies) - 1, int(round(p * (len(latencies) - 1))))
+            return latencies[index] * 1000
+
+        stats = {
+            "requests": total_requests,
+            "concurrency": concurrency,
+            "errors": errors,
+            "rps": total_requests / total_time if total_time > 0 else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": latencies[-1] * 1000,
+            "bytes_per_response": total_bytes / total_requests if total_requests else 0.0
+        }
+
+        print(f"Vazão: {stats['rps']:.1f} req/s - Erros: {errors}")
+        print(f"Latência p50: {stats['p50_ms']:.1f}ms")
+        print(f"Latência p95: {stats['p95_ms']:.1f}ms")
+        print(f"Latência p99: {stats['p99_ms']:.1f}ms")
+        print(f"Latência máx: {stats['max_ms']:.1f}ms")
+        print(f"Bytes por resposta: {stats['bytes_per_response']:.0f}")
+        print("=" * 60)
+
+        return stats
+
+    def run_compression_benchmark(self, limit: int = 50, iterations: int = 200) -> Dict[str, Any]:
+        """
+        Compara bytes trafegados e CPU por requisição de uma página de notícias:
+        sem compressão, comprimindo a cada resposta e servindo a versão
+        pré-comprimida guardada no cache
+
+        Usa as notícias do banco principal; sem notícias, gera uma página
+        sintética com resumos do tamanho máximo.
+
+        Args:
+            limit: Notícias na página
+            iterations: Repetições por modo
+
+        Returns:
+            Dicionário com bytes e CPU (ms) por requisição de cada modo
+        """
+        from fastapi.encoders import jsonable_encoder
+        from fastapi.responses import JSONResponse
+        from api.cache import APICache
+        from api.compression import available_encodings, compress_body
+        from api.models import NewsResponse
+        from api.services import NewsService
+
+        response = NewsService().list_news(limit=limit)
+        if not response.data:
+            frase = ("A campanha da marca aposta em inovação, dados e criatividade "
+                     "para ampliar o engajamento do público nas redes sociais. ")
+            response = NewsResponse(
+                data=[{
+                    "id": i, "titulo": f"Notícia de marketing {i}",
+                    "link": f"https://exemplo.com/noticia/{i}",
+                    "resumo": (frase * 20)[:2000], "cluster": i % 5,
+                    "fonte": "Exame", "score": 10.0,
+                    "data_selecao": "2025-01-01T12:00:00", "status": "postada"
+                } for i in range(limit)],
+                total=limit, timestamp="2025-01-01T12:00:00")
+
+        value = response.dict()
+
+        def render(item) -> bytes:
+            return JSONResponse(jsonable_encoder(NewsResponse(**item))).body
+
+        def measure(func) -> tuple:
+            size = len(func())
+            start = time.process_time()
+            for _ in range(iterations):
+                func()
+            return size, (time.process_time() - start) * 1000 / iterations
+
+        modes = {"sem compressão": lambda: render(value)}
+        for encoding in available_encodings():
+            modes[f"{encoding} por resposta"] = \
+                lambda encoding=encoding: compress_body(render(value), encoding)
+
+        cache = APICache()
+        cache.set("benchmark", value)
+        for encoding in available_encodings():
+            modes[f"{encoding} pré-comprimido"] = lambda encoding=encoding: cache.get_variant(
+                "benchmark", encoding, lambda item: compress_body(render(item), encoding))
+
+        print("=" * 60)
+        print("BENCHMARK DE COMPRESSÃO")
+        print("=" * 60)
+        print(f"Notícias na página: {len(response.data)} - Repetições: {iterations}")
+
+        results = {}
+        for name, func in modes.items():
+            size, cpu_ms = measure(func)
+            results[name] = {"bytes": size, "cpu_ms": cpu_ms}
+            print(f"{name:<24} {size:>8} bytes  {cpu_ms:8.3f}ms CPU/req")
+
+        print("=" * 60)
+        return results
+
     # ==================== FUNCIONALIDADES DE VERIFICAÇÃO ====================
 
     def check_python_version(self) -> bool:
@@ -548,6 +715,8 @@ def main():
                             help="Executar em modo debug")
     run_parser.add_argument("--reload", action="store_true",
                             help="Recarregar automaticamente")
+    run_parser.add_argument(
+        "--workers", type=int, help="Processos uvicorn (use CACHE_BACKEND=sqlite)")
 
     # Comando test
     test_parser = subparsers.add_parser("test", help="Testar API")
@@ -556,6 +725,28 @@ def main():
     test_parser.add_argument(
         "--wait", type=int, default=0, help="Aguardar N segundos antes de iniciar")
 
+    # Comando load (teste de carga)
+    load_parser = subparsers.add_parser(
+        "load", help="Executar teste de carga")
+    load_parser.add_argument(
+        "--url", default="http://localhost:8000", help="URL base da API")
+    load_parser.add_argument(
+        "--endpoint", default="/news", help="Endpoint a testar")
+    load_parser.add_argument(
+        "--requests", type=int, default=500, help="Total de requisições")
+    load_parser.add_argument(
+        "--concurrency", type=int, default=20, help="Clientes simultâneos")
+    load_parser.add_argument(
+        "--encoding", default="identity", help="Header Accept-Encoding (identity, gzip, br)")
+
+    # Comando bench-compression
+    bench_parser = subparsers.add_parser(
+        "bench-compression", help="Comparar bytes e CPU com e sem compressão")
+    bench_parser.add_argument(
+        "--limit", type=int, default=50, help="Notícias na página")
+    bench_parser.add_argument(
+        "--iterations", type=int, default=200, help="Repetições por modo")
+
     # Comando setup
     subparsers.add_parser("setup", help="Verificar configuração da API")
 
@@ -578,7 +769,8 @@ def main():
             host=args.host,
             port=args.port,
             debug=args.debug,
-            reload=args.reload
+            reload=args.reload,
+            workers=args.workers
         )
 
     elif args.command == "test":
@@ -609,6 +801,21 @@ def main():
             print(f"\n[ERRO] Erro inesperado durante os testes: {e}")
             sys.exit(1)
 
+    elif args.command == "load":
+        manager.base_url = args.url
+        manager.api_url = f"{args.url}/api/v1"
+        stats = manager.run_load_test(
+            endpoint=args.endpoint,
+            total_requests=args.requests,
+            concurrency=args.concurrency,
+            encoding=args.encoding
+        )
+        sys.exit(0 if stats["errors"] == 0 else 1)
+
+    elif args.command == "bench-compression":
+        manager.run_compression_benchmark(
+            limit=args.limit, iterations=args.iterations)
+
     elif args.command == "setup":
         success = manager.setup_check()
         sys.exit(0 if success else 1)
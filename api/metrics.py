@@ -0,0 +1,304 @@
+# MÉTRICAS DA API (FORMATO PROMETHEUS)
+"""
+Coletores em memória (contadores e histogramas com labels) e exposição no
+formato texto do Prometheus. Métricas que já existem em outros componentes
+(cache, rate limiter, latência por rota) são lidas apenas na coleta.
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from .access_log import get_access_logger
+from .cache import get_api_cache
+from .events import get_feed_broadcaster
+from .rate_limit import get_rate_limiter
+
+
+# Buckets padrão, em segundos
+DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01,
+                    0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Buckets do tamanho das respostas, em bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    """Escapa o valor de um label para o formato texto"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    """Monta o bloco {label="valor",...} de uma série"""
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    """Formata um valor numérico (inteiros sem casa decimal)"""
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def format_histogram(name: str, label_names: Tuple[str, ...], label_values: Tuple,
+                     buckets: Tuple[float, ...], counts: List[int], total: float) -> List[str]:
+    """
+    Gera as linhas de uma série de histograma (buckets cumulativos, _sum e _count)
+
+    Args:
+        name: Nome da métrica
+        label_names: Nomes dos labels
+        label_values: Valores dos labels da série
+        buckets: Limites superiores dos buckets (sem o +Inf)
+        counts: Contagem por bucket, não cumulativa, com o +Inf no final
+        total: Soma dos valores observados
+
+    Returns:
+        Linhas no formato texto
+    """
+    lines = []
+    accumulated = 0
+    for limit, count in zip(tuple(buckets) + (float("inf"),), counts):
+        accumulated += count
+        le = f'le="{_format_number(limit)}"'
+        lines.append(
+            f"{name}_bucket{_format_labels(label_names, label_values, le)} {accumulated}")
+
+    labels = _format_labels(label_names, label_values)
+    lines.append(f"{name}_sum{labels} {_format_number(total)}")
+    lines.append(f"{name}_count{labels} {accumulated}")
+    return lines
+
+
+class Counter:
+    """Contador monotônico com labels"""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple, float] = {}
+        self._lock = Lock()
+
+    def inc(self, *label_values, amount: float = 1.0) -> None:
+        """Incrementa a série dos labels informados"""
+        with self._lock:
+            self._values[label_values] = self._values.get(
+                label_values, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        """Gera as linhas da métrica"""
+        with self._lock:
+            values = sorted(self._values.items())
+
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} counter"]
+        for label_values, value in values:
+            lines.append(
+                f"{self.name}{_format_labels(self.labels, label_values)} {_format_number(value)}")
+        return lines
+
+
+class Histogram:
+    """Histograma com labels e buckets fixos"""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple, list] = {}
+        self._lock = Lock()
+
+    def observe(self, value: float, *label_values) -> None:
+        """Registra um valor na série dos labels informados (custo O(log buckets))"""
+        index = bisect_left(self.buckets, value)
+
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0]
+                self._series[label_values] = series
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, *label_values) -> Iterator[None]:
+        """Mede a duração (em segundos) do bloco"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def collect(self) -> List[str]:
+        """Gera as linhas da métrica"""
+        with self._lock:
+            series = sorted((labels, list(counts), total)
+                            for labels, (counts, total) in self._series.items())
+
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} histogram"]
+        for label_values, counts, total in series:
+            lines.extend(format_histogram(
+                self.name, self.labels, label_values, self.buckets, counts, total))
+        return lines
+
+
+class MetricsRegistry:
+    """Registro das métricas e dos coletores executados a cada raspagem"""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def counter(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Counter:
+        """Cria e registra um contador"""
+        metric = Counter(name, documentation, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DURATION_BUCKETS) -> Histogram:
+        """Cria e registra um histograma"""
+        metric = Histogram(name, documentation, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Registra uma função que gera linhas a partir do estado de outro componente"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Gera a exposição completa no formato texto do Prometheus
+
+        Returns:
+            Texto da resposta de /metrics
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.collect())
+
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                print(f"[ERRO] Erro ao coletar métricas: {e}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Registro global e métricas da API
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    "vertex_http_requests_total", "Requisições HTTP atendidas",
+    ("method", "route", "status"))
+
+http_response_size_bytes = registry.histogram(
+    "vertex_http_response_size_bytes", "Tamanho do corpo das respostas (bytes)",
+    ("route",), SIZE_BUCKETS)
+
+db_query_duration_seconds = registry.histogram(
+    "vertex_db_query_duration_seconds", "Duração das consultas ao SQLite (segundos)",
+    ("query",))
+
+serialization_duration_seconds = registry.histogram(
+    "vertex_serialization_duration_seconds",
+    "Duração da conversão/serialização dos modelos Pydantic (segundos)",
+    ("model",))
+
+
+def _simple_metric(name: str, kind: str, documentation: str, value: float) -> List[str]:
+    """Gera as linhas de uma métrica sem labels"""
+    return [f"# HELP {name} {documentation}",
+            f"# TYPE {name} {kind}",
+            f"{name} {_format_number(value)}"]
+
+
+def collect_http_latency() -> List[str]:
+    """Exporta os histogramas de latência por rota mantidos pelo log de acesso"""
+    histograms = get_access_logger().histograms
+    buckets = tuple(limit / 1000 for limit in histograms.buckets_ms)
+    name = "vertex_http_request_duration_seconds"
+
+    lines = [f"# HELP {name} Duração das requisições HTTP (segundos)",
+             f"# TYPE {name} histogram"]
+    for route, data in sorted(histograms.snapshot().items()):
+        method, _, path = route.partition(" ")
+        lines.extend(format_histogram(
+            name, ("method", "route"), (method, path), buckets,
+            data["counts"], data["sum_ms"] / 1000))
+    return lines
+
+
+def collect_cache() -> List[str]:
+    """Exporta os contadores do APICache"""
+    stats = get_api_cache().get_stats()
+
+    return (
+        _simple_metric("vertex_cache_hits_total", "counter",
+                       "Leituras atendidas pelo cache", stats["hits"])
+        + _simple_metric("vertex_cache_misses_total", "counter",
+                         "Leituras não atendidas pelo cache", stats["misses"])
+        + _simple_metric("vertex_cache_evictions_total", "counter",
+                         "Itens removidos por falta de espaço", stats["evictions"])
+        + _simple_metric("vertex_cache_expirations_total", "counter",
+                         "Itens removidos por TTL", stats["expirations"])
+        + _simple_metric("vertex_cache_items", "gauge",
+                         "Itens no cache", stats["total_items"])
+        + _simple_metric("vertex_cache_encoded_bytes", "gauge",
+                         "Bytes das respostas serializadas/comprimidas no cache",
+                         stats["encoded_bytes"])
+    )
+
+
+def collect_rate_limit() -> List[str]:
+    """Exporta os contadores do rate limiter (deste processo)"""
+    stats = get_rate_limiter().get_stats()
+
+    return (
+        _simple_metric("vertex_rate_limit_allowed_total", "counter",
+                       "Requisições permitidas pelo rate limiter", stats["allowed_requests"])
+        + _simple_metric("vertex_rate_limit_limited_total", "counter",
+                         "Requisições recusadas com 429", stats["limited_requests"])
+    )
+
+
+def collect_events() -> List[str]:
+    """Exporta as conexões SSE abertas e as difusões de eventos do feed"""
+    stats = get_feed_broadcaster().get_stats()
+
+    return (
+        _simple_metric("vertex_sse_clients", "gauge",
+                       "Conexões SSE abertas", stats["connected_clients"])
+        + _simple_metric("vertex_sse_broadcasts_total", "counter",
+                         "Mudanças de versão dos dados difundidas", stats["broadcasts"])
+        + _simple_metric("vertex_sse_events_sent_total", "counter",
+                         "Eventos feed-updated entregues", stats["events_sent"])
+    )
+
+
+registry.add_collector(collect_http_latency)
+registry.add_collector(collect_cache)
+registry.add_collector(collect_rate_limit)
+registry.add_collector(collect_events)
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Função de conveniência para obter o registro de métricas
+
+    Returns:
+        Instância de MetricsRegistry
+    """
+    return registry
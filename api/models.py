@@ -20,6 +20,8 @@ class NewsItem(BaseModel):
     fonte: str = Field(..., description="Fonte da notícia", max_length=100)
     score: Optional[float] = Field(
         None, description="Score de relevância", ge=0.0)
+    score_ajustado: Optional[float] = Field(
+        None, description="Score com decaimento por recência (ordem do feed)", ge=0.0)
     cluster: int = Field(..., description="Número do cluster", ge=0)
     data_selecao: str = Field(..., description="Data de seleção da notícia")
     status: str = Field(..., description="Status da notícia")
@@ -73,6 +75,8 @@ class NewsResponse(BaseModel):
     total: int = Field(..., description="Total de notícias retornadas")
     cached: bool = Field(
         False, description="Indica se os dados vieram do cache")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor opaco para a próxima página (None na última)")
     timestamp: str = Field(..., description="Timestamp da resposta")
 
     class Config:
@@ -81,6 +85,102 @@ class NewsResponse(BaseModel):
         }
 
 
+class BatchNewsEntry(BaseModel):
+    """Modelo para um ID solicitado na busca em lote"""
+
+    id: int = Field(..., description="ID solicitado")
+    found: bool = Field(..., description="Indica se a notícia foi encontrada")
+    news: Optional[NewsItem] = Field(
+        None, description="Notícia encontrada (None se não encontrada)")
+
+
+class BatchNewsResponse(BaseModel):
+    """Modelo para resposta da busca de notícias em lote"""
+
+    success: bool = Field(
+        True, description="Indica se a requisição foi bem-sucedida")
+    data: List[BatchNewsEntry] = Field(...,
+                                       description="Resultados na ordem dos IDs solicitados")
+    total: int = Field(..., description="Total de notícias encontradas")
+    missing: List[int] = Field(
+        default_factory=list, description="IDs não encontrados")
+    timestamp: str = Field(..., description="Timestamp da resposta")
+
+    class Config:
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
+
+
+class SearchResult(NewsItem):
+    """Modelo para uma notícia encontrada na busca textual"""
+
+    bm25: float = Field(...,
+                        description="Score bm25 da busca (quanto menor, mais relevante)")
+    snippet: str = Field(...,
+                         description="Trecho do texto com os termos encontrados destacados")
+
+
+class SearchResponse(BaseModel):
+    """Modelo para resposta da busca textual"""
+
+    success: bool = Field(
+        True, description="Indica se a requisição foi bem-sucedida")
+    query: str = Field(..., description="Termo de busca recebido")
+    data: List[SearchResult] = Field(...,
+                                     description="Notícias ordenadas por relevância")
+    total: int = Field(..., description="Total de notícias retornadas")
+    cached: bool = Field(
+        False, description="Indica se os dados vieram do cache")
+    timestamp: str = Field(..., description="Timestamp da resposta")
+
+    class Config:
+        json_encoders = {
+            datetime: lambda v: v.isoformat()
+        }
+
+
+class ClusterTerm(BaseModel):
+    """Modelo para um termo de maior peso no centróide de um cluster"""
+
+    termo: str = Field(..., description="Termo (palavra ou bigrama)")
+    peso: float = Field(..., description="Peso TF-IDF do termo no centróide")
+
+
+class ClusterRepresentative(BaseModel):
+    """Modelo para uma notícia representativa de um cluster"""
+
+    titulo: str = Field(..., description="Título da notícia")
+    link: str = Field(..., description="URL da notícia")
+    distancia: float = Field(..., description="Distância ao centróide do cluster")
+
+
+class ClusterInfo(BaseModel):
+    """Modelo para a interpretação de um cluster"""
+
+    cluster: int = Field(..., description="Número do cluster", ge=0)
+    rotulo: str = Field(..., description="Rótulo do cluster")
+    termos: List[ClusterTerm] = Field(...,
+                                      description="Termos de maior peso, em ordem decrescente")
+    representativas: List[ClusterRepresentative] = Field(
+        ..., description="Notícias mais próximas do centróide")
+    tamanho: int = Field(...,
+                         description="Notícias atribuídas ao cluster na última execução")
+    atualizado_em: str = Field(..., description="Data da última interpretação")
+
+
+class ClustersResponse(BaseModel):
+    """Modelo para resposta da interpretação dos clusters"""
+
+    success: bool = Field(
+        True, description="Indica se a requisição foi bem-sucedida")
+    data: List[ClusterInfo] = Field(..., description="Clusters em ordem numérica")
+    total: int = Field(..., description="Total de clusters")
+    cached: bool = Field(
+        False, description="Indica se os dados vieram do cache")
+    timestamp: str = Field(..., description="Timestamp da resposta")
+
+
 class ErrorResponse(BaseModel):
     """Modelo para resposta de erro da API"""
 
@@ -96,6 +196,16 @@ class ErrorResponse(BaseModel):
         }
 
 
+class StatsResponse(BaseModel):
+    """Modelo para resposta das estatísticas do banco"""
+
+    success: bool = Field(
+        True, description="Indica se a requisição foi bem-sucedida")
+    data: dict = Field(...,
+                       description="Totais, janelas de 7/30 dias, por cluster e por status")
+    timestamp: str = Field(..., description="Timestamp da resposta")
+
+
 class HealthResponse(BaseModel):
     """Modelo para resposta de health check"""
 
@@ -104,4 +214,8 @@ class HealthResponse(BaseModel):
     database_connected: bool = Field(...,
                                      description="Status da conexão com banco")
     cache_stats: dict = Field(..., description="Estatísticas do cache")
+    statistics: Optional[dict] = Field(
+        None, description="Estatísticas do banco (atualizadas em segundo plano)")
+    statistics_updated_at: Optional[str] = Field(
+        None, description="Momento da última atualização das estatísticas")
     timestamp: str = Field(..., description="Timestamp da verificação")
@@ -0,0 +1,276 @@
+# RATE LIMITING DA API
+"""
+Rate limiter token bucket para proteger a API contra clientes abusivos.
+Usa as configurações RATE_LIMIT_* de APIConfig.
+"""
+
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, FrozenSet, Tuple
+from .config import get_api_config
+
+
+class TokenBucketRateLimiter:
+    """Rate limiter token bucket em memória (válido para um único processo)"""
+
+    # Indica se acquire() faz I/O e deve rodar fora do event loop
+    blocking = False
+
+    def __init__(self, capacity: int, window: int, max_clients: int = 10000):
+        """
+        Inicializa o rate limiter
+
+        Args:
+            capacity: Requisições permitidas por janela (tamanho do balde)
+            window: Janela em segundos para reabastecer o balde por completo
+            max_clients: Número máximo de clientes rastreados em memória
+        """
+        self._capacity = float(max(1, capacity))
+        self._window = max(1, window)
+        self._rate = self._capacity / self._window  # tokens por segundo
+        self._max_clients = max(1, max_clients)
+
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._allowed = 0
+        self._limited = 0
+
+    def _consume(self, tokens: float, updated: float, now: float) -> Tuple[float, bool, float]:
+        """
+        Reabastece o balde pelo tempo decorrido e tenta consumir um token
+
+        Args:
+            tokens: Tokens no balde na última atualização
+            updated: Momento da última atualização
+            now: Momento atual
+
+        Returns:
+            Tupla (tokens_restantes, permitido, segundos_até_próximo_token)
+        """
+        tokens = min(self._capacity, tokens + (now - updated) * self._rate)
+
+        if tokens >= 1.0:
+            return tokens - 1.0, True, 0.0
+
+        return tokens, False, (1.0 - tokens) / self._rate
+
+    def _record(self, allowed: bool) -> None:
+        """Atualiza os contadores de monitoramento"""
+        if allowed:
+            self._allowed += 1
+        else:
+            self._limited += 1
+
+    def acquire(self, key: str) -> Tuple[bool, float, int]:
+        """
+        Tenta consumir um token do cliente (custo O(1))
+
+        Args:
+            key: Identificador do cliente (IP ou chave de API)
+
+        Returns:
+            Tupla (permitido, retry_after_segundos, tokens_restantes)
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self._capacity, now))
+            tokens, allowed, retry_after = self._consume(tokens, updated, now)
+
+            # Reinserir no fim mantém a ordem LRU para descarte
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self._max_clients:
+                self._buckets.popitem(last=False)
+
+            self._record(allowed)
+
+        return allowed, retry_after, int(tokens)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do rate limiter
+
+        Returns:
+            Dicionário com contadores e configuração
+        """
+        with self._lock:
+            return {
+                "backend": "memory",
+                "capacity": int(self._capacity),
+                "window": self._window,
+                "tracked_clients": len(self._buckets),
+                "allowed_requests": self._allowed,
+                "limited_requests": self._limited
+            }
+
+
+class SQLiteTokenBucketRateLimiter(TokenBucketRateLimiter):
+    """Rate limiter token bucket persistido em SQLite, compartilhado entre workers"""
+
+    blocking = True
+
+    # Baldes sem uso há mais de uma janela estão cheios e podem ser removidos
+    PRUNE_EVERY = 1000
+
+    def __init__(self, db_path: str, capacity: int, window: int):
+        """
+        Inicializa o rate limiter
+
+        Args:
+            db_path: Arquivo SQLite compartilhado pelos workers
+            capacity: Requisições permitidas por janela
+            window: Janela em segundos
+        """
+        super().__init__(capacity, window)
+        self._db_path = db_path
+        self._local = threading.local()
+        self._calls = 0
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Obtém a conexão da thread atual, criando a tabela se necessário"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._db_path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    chave TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    atualizado REAL NOT NULL
+                )
+            """)
+            self._local.conn = conn
+        return conn
+
+    def acquire(self, key: str) -> Tuple[bool, float, int]:
+        """
+        Tenta consumir um token do cliente em uma transação curta
+
+        Args:
+            key: Identificador do cliente (IP ou chave de API)
+
+        Returns:
+            Tupla (permitido, retry_after_segundos, tokens_restantes)
+        """
+        # Relógio de parede: precisa ser comparável entre processos
+        now = time.time()
+
+        try:
+            conn = self._get_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT tokens, atualizado FROM rate_limit_buckets WHERE chave = ?",
+                    (key,)).fetchone()
+                tokens, updated = row if row else (self._capacity, now)
+                tokens, allowed, retry_after = self._consume(
+                    tokens, min(updated, now), now)
+
+                conn.execute("""
+                    INSERT INTO rate_limit_buckets (chave, tokens, atualizado)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(chave) DO UPDATE SET
+                        tokens = excluded.tokens, atualizado = excluded.atualizado
+                """, (key, tokens, now))
+
+                self._calls += 1
+                if self._calls % self.PRUNE_EVERY == 0:
+                    conn.execute(
+                        "DELETE FROM rate_limit_buckets WHERE atualizado < ?",
+                        (now - self._window,))
+
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        except Exception as e:
+            # Falha no backend não deve derrubar a API: permitir a requisição
+            print(f"[ERRO] Erro no rate limiter SQLite: {e}")
+            return True, 0.0, 0
+
+        with self._lock:
+            self._record(allowed)
+
+        return allowed, retry_after, int(tokens)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do rate limiter (contadores deste processo)
+
+        Returns:
+            Dicionário com contadores e configuração
+        """
+        stats = super().get_stats()
+        stats["backend"] = "sqlite"
+
+        try:
+            stats["tracked_clients"] = self._get_connection().execute(
+                "SELECT COUNT(*) FROM rate_limit_buckets").fetchone()[0]
+        except Exception as e:
+            print(f"[ERRO] Erro ao obter estatísticas do rate limiter: {e}")
+
+        return stats
+
+
+def create_rate_limiter() -> TokenBucketRateLimiter:
+    """
+    Cria o rate limiter conforme o backend configurado
+
+    Returns:
+        Instância de TokenBucketRateLimiter
+    """
+    config = get_api_config().get_rate_limit_config()
+
+    if config["backend"] == "sqlite":
+        return SQLiteTokenBucketRateLimiter(
+            config["db_path"], config["requests"], config["window"])
+
+    return TokenBucketRateLimiter(
+        config["requests"], config["window"], config["max_clients"])
+
+
+def get_client_key(api_key: str, client_host: str,
+                   api_keys: FrozenSet[str] = frozenset()) -> str:
+    """
+    Define a chave de rate limiting do cliente
+
+    Só chaves conhecidas ganham balde próprio: uma chave arbitrária no
+    header não pode servir para obter um balde novo a cada requisição.
+
+    Args:
+        api_key: Valor do header X-API-Key (pode ser vazio)
+        client_host: IP do cliente
+        api_keys: Chaves de API aceitas (API_KEYS)
+
+    Returns:
+        Chave do balde do cliente
+    """
+    if api_key and api_key in api_keys:
+        return f"key:{api_key}"
+    return f"ip:{client_host or 'desconhecido'}"
+
+
+def retry_after_header(retry_after: float) -> str:
+    """Formata o header Retry-After em segundos inteiros (mínimo 1)"""
+    return str(max(1, math.ceil(retry_after)))
+
+
+# Instância global do rate limiter
+rate_limiter = create_rate_limiter()
+
+
+def get_rate_limiter() -> TokenBucketRateLimiter:
+    """
+    Função de conveniência para obter a instância do rate limiter
+
+    Returns:
+        Instância de TokenBucketRateLimiter
+    """
+    return rate_limiter
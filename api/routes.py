@@ -3,13 +3,23 @@
 Definição das rotas e endpoints da API REST para Vertex News.
 """
 
-from fastapi import APIRouter, HTTPException, Query, Depends
-from fastapi.responses import JSONResponse
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
+from typing import Any, Dict, Optional
 from datetime import datetime
-
-from .models import NewsResponse, ErrorResponse, HealthResponse
-from .services import get_news_service, NewsService
+import os
+import re
+
+from .models import (NewsResponse, ErrorResponse, HealthResponse, SearchResponse, BatchNewsResponse,
+                     StatsResponse, ClustersResponse)
+from .services import (get_news_service, NewsService, decode_cursor, build_filters,
+                       list_cache_key, search_cache_key, CLUSTERS_CACHE_KEY)
+from .compression import cached_json_response, choose_encoding
+from .cache import get_api_cache
+from .executor import get_db_executor
+from .rate_limit import get_rate_limiter
+from .access_log import get_access_logger
+from .events import get_feed_broadcaster
 from .config import get_api_config
 
 
@@ -19,35 +29,94 @@ router = APIRouter()
 # Configuração da API
 api_config = get_api_config()
 
+# Executor para as consultas síncronas ao SQLite
+db_executor = get_db_executor()
+
+
+async def _cached_response(request: Request, cache_key: str, model,
+                           overrides: Optional[Dict[str, Any]] = None):
+    """Serve um item do cache pré-serializado (no executor se o cache faz I/O)"""
+    if get_api_cache().blocking:
+        return await db_executor.run(cached_json_response, request, cache_key, model, overrides)
+    return cached_json_response(request, cache_key, model, overrides)
+
 
 @router.get("/news", response_model=NewsResponse)
 async def get_news(
+    request: Request,
     limit: int = Query(
         default=api_config.DEFAULT_LIMIT,
         ge=1,
         le=api_config.MAX_LIMIT,
         description="Número de notícias a retornar (máximo 50)"
     ),
+    cursor: Optional[str] = Query(
+        default=None,
+        max_length=200,
+        description="Cursor da próxima página (campo next_cursor da resposta anterior)"
+    ),
+    fonte: Optional[str] = Query(
+        default=None,
+        max_length=100,
+        description="Filtrar pela fonte (ex.: Exame)"
+    ),
+    cluster: Optional[int] = Query(
+        default=None,
+        ge=0,
+        description="Filtrar pelo número do cluster"
+    ),
+    status: str = Query(
+        default="postada",
+        pattern="^(postada|arquivada)$",
+        description="Status das notícias: 'postada' (padrão) ou 'arquivada'"
+    ),
+    since: Optional[datetime] = Query(
+        default=None,
+        description="Data de seleção mínima, inclusiva (ISO 8601)"
+    ),
+    until: Optional[datetime] = Query(
+        default=None,
+        description="Data de seleção máxima, exclusiva (ISO 8601)"
+    ),
     service: NewsService = Depends(get_news_service)
 ):
     """
     Endpoint principal para obter notícias com status 'postada'.
 
     Retorna as 15 notícias mais recentes com status 'postada' do banco de dados.
-    As notícias com status 'arquivada' são ignoradas.
+    As notícias com status 'arquivada' são ignoradas, a menos que status='arquivada'
+    seja informado. Aceita filtros por fonte, cluster e intervalo de datas, todos
+    atendidos por índices. Para as páginas seguintes, envie o next_cursor da
+    resposta anterior no parâmetro cursor (mantendo os mesmos filtros).
 
     Args:
+        request: Requisição atual (usada para servir respostas pré-comprimidas)
         limit: Número de notícias a retornar (padrão: 15, máximo: 50)
+        cursor: Cursor opaco da página anterior (opcional)
+        fonte: Fonte da notícia (opcional)
+        cluster: Número do cluster (opcional)
+        status: Status das notícias (padrão: 'postada')
+        since: Data de seleção mínima, inclusiva (opcional)
+        until: Data de seleção máxima, exclusiva (opcional)
         service: Instância do serviço de notícias
 
     Returns:
         NewsResponse com lista de notícias
 
     Raises:
-        HTTPException: Em caso de erro interno do servidor
+        HTTPException: Se o cursor for inválido ou em caso de erro interno
     """
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+
     try:
-        response = service.get_posted_news(limit=limit)
+        filters = build_filters(
+            status=status, fonte=fonte, cluster=cluster, since=since, until=until)
+        response = await db_executor.run(
+            service.list_news, limit=limit, cursor=cursor, filters=filters)
 
         if not response.success:
             raise HTTPException(
@@ -55,6 +124,11 @@ async def get_news(
                 detail="Erro interno ao buscar notícias"
             )
 
+        # Respostas do cache reaproveitam o JSON já serializado e comprimido
+        if response.cached:
+            return await _cached_response(
+                request, list_cache_key(limit, cursor, filters), NewsResponse) or response
+
         return response
 
     except HTTPException:
@@ -67,6 +141,207 @@ async def get_news(
         )
 
 
+@router.get("/news/search", response_model=SearchResponse)
+async def search_news(
+    request: Request,
+    q: str = Query(
+        ...,
+        min_length=2,
+        max_length=200,
+        description="Termos de busca (título e resumo, sem diferenciar acentos)"
+    ),
+    limit: int = Query(
+        default=api_config.DEFAULT_LIMIT,
+        ge=1,
+        le=api_config.MAX_LIMIT,
+        description="Número de resultados a retornar (máximo 50)"
+    ),
+    service: NewsService = Depends(get_news_service)
+):
+    """
+    Busca textual no arquivo de notícias selecionadas.
+
+    Considera notícias postadas e arquivadas. Os resultados vêm ordenados por
+    relevância (bm25), com um trecho do texto destacando os termos encontrados.
+
+    Args:
+        request: Requisição atual (usada para servir respostas pré-comprimidas)
+        q: Termos de busca
+        limit: Número de resultados a retornar (padrão: 15, máximo: 50)
+        service: Instância do serviço de notícias
+
+    Returns:
+        SearchResponse com os resultados
+
+    Raises:
+        HTTPException: Em caso de erro interno do servidor
+    """
+    try:
+        response = await db_executor.run(service.search_news, q, limit=limit)
+
+        if not response.success:
+            raise HTTPException(
+                status_code=500,
+                detail="Erro interno ao buscar notícias"
+            )
+
+        if response.cached:
+            # A chave usa a consulta normalizada: o texto ecoado é o desta requisição
+            return await _cached_response(
+                request, search_cache_key(q, limit), SearchResponse,
+                overrides={"query": q}) or response
+
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"[ERRO] Erro inesperado no endpoint /news/search: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno do servidor"
+        )
+
+
+@router.get("/news/batch", response_model=BatchNewsResponse)
+async def get_news_batch(
+    ids: str = Query(
+        ...,
+        max_length=1000,
+        description="IDs separados por vírgula (ex.: 1,2,3; máximo 50)"
+    ),
+    service: NewsService = Depends(get_news_service)
+):
+    """
+    Obtém várias notícias por ID em uma única requisição.
+
+    Os resultados seguem a ordem dos IDs informados; IDs inexistentes ou
+    não postados aparecem com found=False e também são listados em missing.
+
+    Args:
+        ids: IDs separados por vírgula
+        service: Instância do serviço de notícias
+
+    Returns:
+        BatchNewsResponse com um resultado por ID solicitado
+
+    Raises:
+        HTTPException: Se os IDs forem inválidos ou em caso de erro interno
+    """
+    try:
+        news_ids = [int(part) for part in ids.split(',') if part.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail="IDs devem ser números inteiros separados por vírgula")
+
+    if not news_ids or len(news_ids) > api_config.MAX_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Informe entre 1 e {api_config.MAX_LIMIT} IDs"
+        )
+
+    try:
+        response = await db_executor.run(service.get_news_by_ids, news_ids)
+
+        if not response.success:
+            raise HTTPException(
+                status_code=500,
+                detail="Erro interno ao buscar notícias"
+            )
+
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"[ERRO] Erro inesperado no endpoint /news/batch: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno do servidor"
+        )
+
+
+async def _stream_batches(batches):
+    """Lê os lotes de um gerador síncrono no executor, um lote por vez"""
+    try:
+        while True:
+            chunk = await db_executor.run(next, batches, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        # Fecha a conexão da exportação mesmo se o cliente desconectar
+        await db_executor.run(batches.close)
+
+
+@router.get("/news/export")
+async def export_news(
+    format: str = Query(
+        default="ndjson",
+        pattern="^(ndjson|csv)$",
+        description="Formato: 'ndjson' (um objeto JSON por linha) ou 'csv'"
+    ),
+    fonte: Optional[str] = Query(
+        default=None,
+        max_length=100,
+        description="Filtrar pela fonte (ex.: Exame)"
+    ),
+    cluster: Optional[int] = Query(
+        default=None,
+        ge=0,
+        description="Filtrar pelo número do cluster"
+    ),
+    status: Optional[str] = Query(
+        default=None,
+        pattern="^(postada|arquivada)$",
+        description="Filtrar pelo status (padrão: todas as notícias)"
+    ),
+    since: Optional[datetime] = Query(
+        default=None,
+        description="Data de seleção mínima, inclusiva (ISO 8601)"
+    ),
+    until: Optional[datetime] = Query(
+        default=None,
+        description="Data de seleção máxima, exclusiva (ISO 8601)"
+    ),
+    service: NewsService = Depends(get_news_service)
+):
+    """
+    Exporta o acervo completo de notícias em streaming, sem limite de quantidade.
+
+    As linhas são lidas do SQLite em lotes (fetchmany) e enviadas conforme
+    são lidas, com memória constante independentemente do tamanho da tabela.
+    Com Accept-Encoding: gzip (ou br), o stream é comprimido em tempo real
+    pelo middleware de compressão.
+
+    Args:
+        format: Formato da exportação ('ndjson' ou 'csv')
+        fonte: Fonte da notícia (opcional)
+        cluster: Número do cluster (opcional)
+        status: Status das notícias (opcional)
+        since: Data de seleção mínima, inclusiva (opcional)
+        until: Data de seleção máxima, exclusiva (opcional)
+        service: Instância do serviço de notícias
+
+    Returns:
+        StreamingResponse com as notícias em ordem de ID
+    """
+    filters = build_filters(
+        status=status, fonte=fonte, cluster=cluster, since=since, until=until)
+    batches = service.export_news(
+        filters, fmt=format, batch_size=api_config.EXPORT_BATCH_SIZE)
+
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_batches(batches),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="noticias.{format}"',
+            "Cache-Control": "no-store"
+        }
+    )
+
+
 @router.get("/news/{news_id}", response_model=NewsResponse)
 async def get_news_by_id(
     news_id: int,
@@ -86,7 +361,7 @@ async def get_news_by_id(
         HTTPException: Se a notícia não for encontrada ou erro interno
     """
     try:
-        news_item = service.get_news_by_id(news_id)
+        news_item = await db_executor.run(service.get_news_by_id, news_id)
 
         if not news_item:
             raise HTTPException(
@@ -115,10 +390,10 @@ async def get_news_by_id(
         )
 
 
-@router.get("/health", response_model=HealthResponse)
-async def health_check(service: NewsService = Depends(get_news_service)):
+async def _check_health(service: NewsService) -> HealthResponse:
     """
-    Endpoint de health check para verificar status da API.
+    Monta o status da API sem consultas pesadas: um ping no banco e as
+    estatísticas já calculadas pela tarefa de segundo plano
 
     Args:
         service: Instância do serviço de notícias
@@ -127,22 +402,16 @@ async def health_check(service: NewsService = Depends(get_news_service)):
         HealthResponse com status da API e componentes
     """
     try:
-        # Verificar conexão com banco de dados
-        db_connected = True
-        try:
-            # Tentar uma operação simples no banco
-            service.db_manager.get_statistics()
-        except Exception:
-            db_connected = False
-
-        # Obter estatísticas do cache
-        cache_stats = service.get_cache_stats()
+        db_connected = await db_executor.run(service.ping_database)
+        statistics, statistics_updated_at = service.get_cached_statistics()
 
         return HealthResponse(
             status="healthy" if db_connected else "degraded",
             version="1.0.0",
             database_connected=db_connected,
-            cache_stats=cache_stats,
+            cache_stats=await db_executor.run(service.get_cache_stats),
+            statistics=statistics,
+            statistics_updated_at=statistics_updated_at,
             timestamp=datetime.now().isoformat()
         )
 
@@ -157,6 +426,229 @@ async def health_check(service: NewsService = Depends(get_news_service)):
         )
 
 
+@router.get("/health", response_model=HealthResponse)
+async def health_check(service: NewsService = Depends(get_news_service)):
+    """
+    Endpoint de health check para verificar status da API.
+
+    Args:
+        service: Instância do serviço de notícias
+
+    Returns:
+        HealthResponse com status da API e componentes
+    """
+    return await _check_health(service)
+
+
+@router.get("/health/live")
+async def liveness_check():
+    """
+    Liveness: indica apenas que o processo está respondendo, sem tocar no banco.
+
+    Returns:
+        JSON com status da API
+    """
+    return {"status": "alive", "timestamp": datetime.now().isoformat()}
+
+
+@router.get("/health/ready", response_model=HealthResponse)
+async def readiness_check(service: NewsService = Depends(get_news_service)):
+    """
+    Readiness: verifica o banco com uma consulta trivial na conexão do pool.
+    Responde 503 enquanto o banco não estiver disponível.
+
+    Args:
+        service: Instância do serviço de notícias
+
+    Returns:
+        HealthResponse com status da API e componentes
+    """
+    health = await _check_health(service)
+
+    if not health.database_connected:
+        return JSONResponse(status_code=503, content=health.dict())
+
+    return health
+
+
+@router.get("/stats", response_model=StatsResponse)
+async def get_stats(service: NewsService = Depends(get_news_service)):
+    """
+    Obtém as estatísticas do banco a partir das contagens diárias pré-calculadas.
+
+    Args:
+        service: Instância do serviço de notícias
+
+    Returns:
+        StatsResponse com as estatísticas
+    """
+    try:
+        stats = await db_executor.run(service.db_manager.get_statistics)
+
+        if not stats:
+            raise HTTPException(
+                status_code=500,
+                detail="Erro ao obter estatísticas"
+            )
+
+        return StatsResponse(
+            data=stats,
+            timestamp=datetime.now().isoformat()
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"[ERRO] Erro ao obter estatísticas: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno do servidor"
+        )
+
+
+@router.get("/clusters", response_model=ClustersResponse)
+async def get_clusters(request: Request, service: NewsService = Depends(get_news_service)):
+    """
+    Obtém a interpretação dos clusters calculada pelo pipeline.
+
+    Para cada cluster: rótulo, termos de maior peso no centróide e notícias
+    mais próximas do centróide na última execução.
+
+    Args:
+        request: Requisição atual (usada para servir respostas pré-comprimidas)
+        service: Instância do serviço de notícias
+
+    Returns:
+        ClustersResponse com os clusters em ordem numérica
+
+    Raises:
+        HTTPException: Em caso de erro interno do servidor
+    """
+    try:
+        response = await db_executor.run(service.get_clusters)
+
+        if not response.success:
+            raise HTTPException(
+                status_code=500,
+                detail="Erro interno ao buscar clusters"
+            )
+
+        if response.cached:
+            return await _cached_response(
+                request, CLUSTERS_CACHE_KEY, ClustersResponse) or response
+
+        return response
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"[ERRO] Erro inesperado no endpoint /clusters: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno do servidor"
+        )
+
+
+@router.get("/events")
+async def feed_events(request: Request):
+    """
+    Stream SSE com um evento "feed-updated" (contendo a nova versão dos dados)
+    sempre que o pipeline grava no banco principal, dispensando o polling.
+
+    Ao conectar, o cliente recebe um evento "hello" com a versão atual; ao
+    reconectar com Last-Event-ID antigo, recebe "feed-updated" de imediato.
+
+    Args:
+        request: Requisição atual (para o Last-Event-ID)
+
+    Returns:
+        StreamingResponse text/event-stream
+    """
+    broadcaster = get_feed_broadcaster()
+
+    if not broadcaster.has_capacity():
+        raise HTTPException(
+            status_code=503,
+            detail="Limite de conexões de eventos atingido"
+        )
+
+    return StreamingResponse(
+        broadcaster.subscribe(request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Desliga o buffer do nginx para os eventos chegarem na hora
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@router.get("/events/stats")
+async def get_events_stats():
+    """
+    Obtém os contadores dos eventos do feed (conexões abertas, difusões).
+
+    Returns:
+        JSON com estatísticas dos eventos
+    """
+    try:
+        return JSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "data": get_feed_broadcaster().get_stats(),
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+
+    except Exception as e:
+        print(f"[ERRO] Erro ao obter estatísticas dos eventos: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno do servidor"
+        )
+
+
+@router.get("/snapshots/{arquivo:path}")
+async def get_snapshot(arquivo: str, request: Request):
+    """
+    Serve um snapshot estático do feed gerado pelo pipeline (sem consultar o banco).
+
+    Arquivos dentro de v<versão>/ são imutáveis e podem ser guardados
+    indefinidamente pelo cliente; os demais devem ser revalidados (ETag).
+
+    Args:
+        arquivo: Caminho relativo (ex.: feed.json, clusters/2.json, v12/feed.json)
+        request: Requisição atual (para o Accept-Encoding)
+
+    Returns:
+        Conteúdo JSON do snapshot, em gzip se o cliente aceitar
+    """
+    root = os.path.realpath(api_config.SNAPSHOT_DIR)
+    path = os.path.realpath(os.path.join(root, arquivo))
+
+    if not arquivo.endswith(".json") or not path.startswith(root + os.sep) \
+            or not os.path.isfile(path):
+        raise HTTPException(
+            status_code=404,
+            detail="Snapshot não encontrado"
+        )
+
+    headers = {
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "public, max-age=31536000, immutable"
+        if re.match(r"v\d+/", arquivo) else "no-cache"
+    }
+
+    encoding = choose_encoding(
+        request.headers.get("accept-encoding", ""), ["gzip"])
+    if encoding and os.path.isfile(path + ".gz"):
+        path += ".gz"
+        headers["Content-Encoding"] = "gzip"
+
+    return FileResponse(path, media_type="application/json", headers=headers)
+
+
 @router.post("/cache/clear")
 async def clear_cache(service: NewsService = Depends(get_news_service)):
     """
@@ -169,7 +661,7 @@ async def clear_cache(service: NewsService = Depends(get_news_service)):
         JSON com resultado da operação
     """
     try:
-        success = service.clear_cache()
+        success = await db_executor.run(service.clear_cache)
 
         if success:
             return JSONResponse(
@@ -208,7 +700,7 @@ async def get_cache_stats(service: NewsService = Depends(get_news_service)):
         JSON com estatísticas do cache
     """
     try:
-        stats = service.get_cache_stats()
+        stats = await db_executor.run(service.get_cache_stats)
 
         return JSONResponse(
             status_code=200,
@@ -225,3 +717,62 @@ async def get_cache_stats(service: NewsService = Depends(get_news_service)):
             status_code=500,
             detail="Erro interno do servidor"
         )
+
+
+@router.get("/rate-limit/stats")
+async def get_rate_limit_stats():
+    """
+    Obtém contadores do rate limiter para monitoramento.
+
+    Returns:
+        JSON com estatísticas do rate limiter
+    """
+    try:
+        limiter = get_rate_limiter()
+
+        if limiter.blocking:
+            stats = await db_executor.run(limiter.get_stats)
+        else:
+            stats = limiter.get_stats()
+
+        return JSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "data": stats,
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+
+    except Exception as e:
+        print(f"[ERRO] Erro ao obter estatísticas do rate limiter: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno do servidor"
+        )
+
+
+@router.get("/latency/stats")
+async def get_latency_stats():
+    """
+    Obtém os histogramas de latência por rota e os contadores do log de acesso.
+
+    Returns:
+        JSON com estatísticas de latência
+    """
+    try:
+        return JSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "data": get_access_logger().get_stats(),
+                "timestamp": datetime.now().isoformat()
+            }
+        )
+
+    except Exception as e:
+        print(f"[ERRO] Erro ao obter estatísticas de latência: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno do servidor"
+        )
@@ -4,17 +4,133 @@ Serviços para integração com banco de dados e lógica de negócio da API.
 """
 
 from .cache import get_api_cache
-from .models import NewsItem, NewsResponse, ErrorResponse
+from .config import get_api_config
+from .metrics import db_query_duration_seconds, serialization_duration_seconds
+from .models import (NewsItem, NewsResponse, ErrorResponse, SearchResult, SearchResponse,
+                     BatchNewsEntry, BatchNewsResponse, ClusterInfo, ClustersResponse)
 from database.db_manager import get_db_manager
+from database.config import get_db_config
 import sys
 import os
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import sqlite3
+import threading
+import time
+import base64
+import csv
+import io
+import json
+import re
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from datetime import datetime, timezone
 
 # Adicionar o diretório raiz ao path para importar módulos do projeto
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+def encode_cursor(news: Dict[str, Any]) -> str:
+    """
+    Gera o cursor opaco a partir da última notícia de uma página
+
+    Args:
+        news: Dicionário da notícia com score_ajustado, data_selecao e id
+
+    Returns:
+        Cursor codificado em base64 (seguro para URL)
+    """
+    payload = json.dumps([news.get('score_ajustado'), news['data_selecao'], news['id']])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decodifica um cursor gerado por encode_cursor
+
+    Args:
+        cursor: Cursor opaco recebido do cliente
+
+    Returns:
+        Tupla (score_ajustado, data_selecao, id)
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        score, data_selecao, news_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+    if (score is not None and not isinstance(score, (int, float))) \
+            or not isinstance(data_selecao, str) or not isinstance(news_id, int):
+        raise ValueError("Cursor inválido")
+
+    return score, data_selecao, news_id
+
+
+def build_filters(status: str = 'postada', fonte: Optional[str] = None,
+                  cluster: Optional[int] = None, since: Optional[datetime] = None,
+                  until: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Normaliza os filtros da listagem para consulta e chave de cache
+
+    Args:
+        status: Status das notícias ('postada' ou 'arquivada')
+        fonte: Fonte da notícia (opcional)
+        cluster: Número do cluster (opcional)
+        since: Data de seleção mínima, inclusiva (opcional)
+        until: Data de seleção máxima, exclusiva (opcional)
+
+    Returns:
+        Dicionário de filtros com datas no formato usado pelo SQLite
+    """
+    def to_db_timestamp(value: Optional[datetime]) -> Optional[str]:
+        if value is None:
+            return None
+        # data_selecao é gravada por CURRENT_TIMESTAMP (UTC, sem fuso)
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+
+    return {
+        'status': status,
+        'fonte': fonte.strip() if fonte else None,
+        'cluster': cluster,
+        'since': to_db_timestamp(since),
+        'until': to_db_timestamp(until)
+    }
+
+
+def build_match_query(termo: str) -> str:
+    """
+    Converte o texto digitado pelo usuário em uma expressão MATCH segura
+
+    Cada palavra vira um termo entre aspas (todas obrigatórias), evitando que
+    operadores do FTS5 digitados pelo usuário quebrem a consulta.
+
+    Args:
+        termo: Texto de busca
+
+    Returns:
+        Expressão MATCH ou string vazia se não houver palavras
+    """
+    palavras = re.findall(r'\w+', termo.lower())
+    return ' '.join(f'"{palavra}"' for palavra in palavras)
+
+
+def list_cache_key(limit: int, cursor: Optional[str], filters: Dict[str, Any]) -> str:
+    """Chave de cache de uma página da listagem (inclui todos os filtros)"""
+    return f"news_list_{limit}_{cursor or ''}_{json.dumps(filters, sort_keys=True)}"
+
+
+def search_cache_key(termo: str, limit: int) -> str:
+    """Chave de cache de uma busca textual"""
+    return f"search_{limit}_{build_match_query(termo)}"
+
+
+# Chave de cache da interpretação dos clusters
+CLUSTERS_CACHE_KEY = "clusters"
+
+
 class NewsService:
     """Serviço para operações com notícias"""
 
@@ -22,28 +138,103 @@ class NewsService:
         """Inicializa o serviço"""
         self.db_manager = get_db_manager()
         self.cache = get_api_cache()
+        self._local = threading.local()
+
+        # Verificação da versão dos dados do banco (invalidação do cache)
+        self._version_check_interval = get_api_config(
+        ).get_cache_config()["version_check_interval"]
+        self._version_checked_at = 0.0
+
+        # Estatísticas do banco mantidas por refresh_statistics()
+        self._statistics: Optional[Dict[str, Any]] = None
+        self._statistics_updated_at: Optional[str] = None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """
+        Obtém a conexão de leitura da thread atual
+
+        Cada thread do executor da API mantém sua própria conexão aberta,
+        formando um pool do tamanho do executor sem reabrir o arquivo
+        do banco a cada consulta.
 
-    def get_posted_news(self, limit: int = 15) -> NewsResponse:
+        Returns:
+            Conexão SQLite da thread atual
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_manager.main_db_path)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _sync_data_version(self) -> Optional[int]:
+        """
+        Invalida o cache se o pipeline alterou o banco principal
+
+        Lê metadados.data_version no máximo uma vez por intervalo configurado
+        (CACHE_VERSION_CHECK_INTERVAL), mantendo o custo por requisição baixo.
+
+        Returns:
+            Versão dos dados conhecida antes da consulta, a ser passada para
+            cache.set (resultados de uma versão já substituída não são gravados)
+        """
+        now = time.monotonic()
+        if now - self._version_checked_at < self._version_check_interval:
+            return self.cache.data_version
+        self._version_checked_at = now
+
+        try:
+            row = self._get_connection().execute(
+                "SELECT valor FROM metadados WHERE chave = 'data_version'").fetchone()
+        except sqlite3.Error as e:
+            print(f"[AVISO] Versão dos dados indisponível: {e}")
+            return self.cache.data_version
+
+        if row and self.cache.sync_data_version(row[0]):
+            print(f"[INFO] Dados atualizados (versão {row[0]}): cache invalidado")
+        return self.cache.data_version
+
+    def get_posted_news(self, limit: int = 15, cursor: Optional[str] = None) -> NewsResponse:
         """
         Obtém notícias com status 'postada' do banco de dados
 
         Args:
             limit: Número máximo de notícias a retornar
+            cursor: Cursor opaco retornado pela página anterior (opcional)
+
+        Returns:
+            NewsResponse com as notícias encontradas e o cursor da próxima página
+        """
+        return self.list_news(limit=limit, cursor=cursor)
+
+    def list_news(self, limit: int = 15, cursor: Optional[str] = None,
+                  filters: Optional[Dict[str, Any]] = None) -> NewsResponse:
+        """
+        Obtém notícias do banco de dados aplicando filtros e paginação
+
+        Args:
+            limit: Número máximo de notícias a retornar
+            cursor: Cursor opaco retornado pela página anterior (opcional)
+            filters: Filtros gerados por build_filters (padrão: apenas postadas)
 
         Returns:
-            NewsResponse com as notícias encontradas
+            NewsResponse com as notícias encontradas e o cursor da próxima página
         """
+        filters = filters or build_filters()
+        data_version = self._sync_data_version()
+
         try:
-            # Verificar cache primeiro
-            cache_key = f"posted_news_{limit}"
+            # Verificar cache primeiro (a chave inclui todos os filtros)
+            cache_key = list_cache_key(limit, cursor, filters)
             cached_data = self.cache.get(cache_key)
 
             if cached_data:
                 cached_data["cached"] = True
                 return NewsResponse(**cached_data)
 
-            # Buscar no banco de dados
-            raw_news = self._get_posted_news_from_db(limit)
+            # Buscar no banco de dados (uma linha extra indica se há próxima página)
+            after = decode_cursor(cursor) if cursor else None
+            raw_news = self._get_news_from_db(filters, limit + 1, after)
 
             if not raw_news:
                 return NewsResponse(
@@ -54,33 +245,40 @@ class NewsService:
                     timestamp=datetime.now().isoformat()
                 )
 
-            # Converter para modelos Pydantic
-            news_items = []
-            for news in raw_news:
-                try:
-                    news_item = NewsItem(**news)
-                    news_items.append(news_item)
-                except Exception as e:
-                    print(
-                        f"[AVISO] Erro ao converter notícia {news.get('id', 'unknown')}: {e}")
-                    continue
-
-            # Preparar resposta
-            response_data = {
-                "success": True,
-                "data": [item.dict() for item in news_items],
-                "total": len(news_items),
-                "cached": False,
-                "timestamp": datetime.now().isoformat()
-            }
+            next_cursor = None
+            if len(raw_news) > limit:
+                raw_news = raw_news[:limit]
+                next_cursor = encode_cursor(raw_news[-1])
+
+            with serialization_duration_seconds.time("NewsResponse"):
+                # Converter para modelos Pydantic
+                news_items = []
+                for news in raw_news:
+                    try:
+                        news_item = NewsItem(**news)
+                        news_items.append(news_item)
+                    except Exception as e:
+                        print(
+                            f"[AVISO] Erro ao converter notícia {news.get('id', 'unknown')}: {e}")
+                        continue
+
+                # Preparar resposta
+                response_data = {
+                    "success": True,
+                    "data": [item.dict() for item in news_items],
+                    "total": len(news_items),
+                    "cached": False,
+                    "next_cursor": next_cursor,
+                    "timestamp": datetime.now().isoformat()
+                }
 
             # Armazenar no cache
-            self.cache.set(cache_key, response_data)
+            self.cache.set(cache_key, response_data, data_version)
 
             return NewsResponse(**response_data)
 
         except Exception as e:
-            print(f"[ERRO] Erro ao obter notícias postadas: {e}")
+            print(f"[ERRO] Erro ao obter notícias: {e}")
             return NewsResponse(
                 success=False,
                 data=[],
@@ -89,29 +287,40 @@ class NewsService:
                 timestamp=datetime.now().isoformat()
             )
 
-    def _get_posted_news_from_db(self, limit: int) -> List[Dict[str, Any]]:
+    def _get_news_from_db(self, filters: Dict[str, Any], limit: int,
+                          after: Optional[tuple] = None) -> List[Dict[str, Any]]:
         """
-        Busca notícias com status 'postada' diretamente do banco
+        Busca notícias filtradas diretamente do banco
+
+        Usa paginação por keyset sobre (score_ajustado, data_selecao, id),
+        servida pelos índices *_feed: páginas profundas custam o mesmo que a
+        primeira. Notícias sem score ficam no fim da listagem, como no ORDER BY
+        do SQLite.
 
         Args:
+            filters: Filtros gerados por build_filters
             limit: Número máximo de notícias
+            after: Tupla (score_ajustado, data_selecao, id) da última notícia já entregue
 
         Returns:
             Lista de dicionários com dados das notícias
         """
         try:
-            # Usar a função existente do db_manager que já filtra por status
-            all_news = self.db_manager.get_api_data(
-                limit=limit * 2)  # Buscar mais para filtrar
-
-            # Filtrar apenas notícias com status 'postada'
-            posted_news = [
-                news for news in all_news
-                if news.get('status') == 'postada'
-            ]
+            conn = self._get_connection()
+
+            with db_query_duration_seconds.time("listing"):
+                sql, params = self.db_manager.build_listing_query(
+                    filters, after, limit,
+                    only_null_score=after is not None and after[0] is None)
+                rows = conn.execute(sql, params).fetchall()
 
-            # Limitar ao número solicitado
-            return posted_news[:limit]
+                # Completar a página com as notícias sem score, se houver espaço
+                if after is not None and after[0] is not None and len(rows) < limit:
+                    sql, params = self.db_manager.build_listing_query(
+                        filters, None, limit - len(rows), only_null_score=True)
+                    rows += conn.execute(sql, params).fetchall()
+
+            return [dict(row) for row in rows]
 
         except Exception as e:
             print(f"[ERRO] Erro ao buscar notícias do banco: {e}")
@@ -127,6 +336,8 @@ class NewsService:
         Returns:
             NewsItem ou None se não encontrada
         """
+        data_version = self._sync_data_version()
+
         try:
             # Verificar cache
             cache_key = f"news_{news_id}"
@@ -145,7 +356,7 @@ class NewsService:
             news_item = NewsItem(**news)
 
             # Armazenar no cache
-            self.cache.set(cache_key, news_item.dict())
+            self.cache.set(cache_key, news_item.dict(), data_version)
 
             return news_item
 
@@ -164,31 +375,331 @@ class NewsService:
             Dicionário com dados da notícia ou None
         """
         try:
-            import sqlite3
-
-            main_db_path = self.db_manager.main_db_path
-
-            with sqlite3.connect(main_db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-
-                cursor.execute("""
-                    SELECT id, titulo, link, imagem, resumo, cluster, fonte, 
-                           data_selecao, score, status
+            with db_query_duration_seconds.time("by_id"):
+                row = self._get_connection().execute("""
+                    SELECT id, titulo, link, imagem, resumo, cluster, fonte,
+                           data_selecao, score, score_ajustado, status
                     FROM noticias
                     WHERE id = ? AND status = 'postada'
-                """, (news_id,))
-
-                row = cursor.fetchone()
+                """, (news_id,)).fetchone()
 
-                if row:
-                    return dict(row)
-                return None
+            if row:
+                return dict(row)
+            return None
 
         except Exception as e:
             print(f"[ERRO] Erro ao buscar notícia no banco: {e}")
             return None
 
+    def get_news_by_ids(self, news_ids: List[int]) -> BatchNewsResponse:
+        """
+        Obtém várias notícias por ID com uma única consulta ao banco
+
+        Os IDs já presentes no cache não são consultados; os encontrados no
+        banco preenchem as mesmas entradas de cache usadas por get_news_by_id.
+
+        Args:
+            news_ids: IDs solicitados (a ordem da resposta segue esta lista)
+
+        Returns:
+            BatchNewsResponse com um resultado por ID solicitado
+        """
+        data_version = self._sync_data_version()
+
+        try:
+            found: Dict[int, NewsItem] = {}
+            missing_ids = []
+
+            # Verificar cache primeiro
+            for news_id in dict.fromkeys(news_ids):
+                cached_data = self.cache.get(f"news_{news_id}")
+                if cached_data:
+                    found[news_id] = NewsItem(**cached_data)
+                else:
+                    missing_ids.append(news_id)
+
+            # Buscar os restantes no banco de uma só vez
+            for news in self._get_news_by_ids_from_db(missing_ids):
+                try:
+                    news_item = NewsItem(**news)
+                except Exception as e:
+                    print(
+                        f"[AVISO] Erro ao converter notícia {news.get('id', 'unknown')}: {e}")
+                    continue
+
+                found[news_item.id] = news_item
+                self.cache.set(f"news_{news_item.id}", news_item.dict(), data_version)
+
+            entries = [
+                BatchNewsEntry(id=news_id, found=news_id in found,
+                               news=found.get(news_id))
+                for news_id in news_ids
+            ]
+
+            return BatchNewsResponse(
+                success=True,
+                data=entries,
+                total=sum(1 for entry in entries if entry.found),
+                missing=[entry.id for entry in entries if not entry.found],
+                timestamp=datetime.now().isoformat()
+            )
+
+        except Exception as e:
+            print(f"[ERRO] Erro ao obter notícias em lote: {e}")
+            return BatchNewsResponse(
+                success=False,
+                data=[],
+                total=0,
+                timestamp=datetime.now().isoformat()
+            )
+
+    def _get_news_by_ids_from_db(self, news_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Busca várias notícias no banco de dados com uma consulta IN
+
+        Args:
+            news_ids: IDs sem repetição
+
+        Returns:
+            Lista de dicionários com dados das notícias encontradas
+        """
+        if not news_ids:
+            return []
+
+        placeholders = ','.join(['?' for _ in news_ids])
+
+        with db_query_duration_seconds.time("batch"):
+            rows = self._get_connection().execute(f"""
+                SELECT id, titulo, link, imagem, resumo, cluster, fonte,
+                       data_selecao, score, score_ajustado, status
+                FROM noticias
+                WHERE id IN ({placeholders}) AND status = 'postada'
+            """, news_ids).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def search_news(self, termo: str, limit: int = 15) -> SearchResponse:
+        """
+        Busca notícias (postadas e arquivadas) pelo título e resumo
+
+        Args:
+            termo: Texto de busca
+            limit: Número máximo de resultados
+
+        Returns:
+            SearchResponse com os resultados ordenados por bm25
+        """
+        data_version = self._sync_data_version()
+
+        try:
+            match_query = build_match_query(termo)
+
+            cache_key = search_cache_key(termo, limit)
+            cached_data = self.cache.get(cache_key)
+
+            if cached_data:
+                # A chave vem da consulta normalizada; o item pode ter sido
+                # gravado por outra grafia da mesma busca
+                return SearchResponse(**dict(cached_data, query=termo, cached=True))
+
+            rows = self._search_news_in_db(match_query, limit) if match_query else []
+
+            with serialization_duration_seconds.time("SearchResponse"):
+                results = []
+                for row in rows:
+                    try:
+                        results.append(SearchResult(**row))
+                    except Exception as e:
+                        print(
+                            f"[AVISO] Erro ao converter resultado {row.get('id', 'unknown')}: {e}")
+
+                response_data = {
+                    "success": True,
+                    "query": termo,
+                    "data": [item.dict() for item in results],
+                    "total": len(results),
+                    "cached": False,
+                    "timestamp": datetime.now().isoformat()
+                }
+
+            self.cache.set(cache_key, response_data, data_version)
+
+            return SearchResponse(**response_data)
+
+        except Exception as e:
+            print(f"[ERRO] Erro na busca textual: {e}")
+            return SearchResponse(
+                success=False,
+                query=termo,
+                data=[],
+                total=0,
+                cached=False,
+                timestamp=datetime.now().isoformat()
+            )
+
+    def _search_news_in_db(self, match_query: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Executa a busca no índice FTS5 do banco principal
+
+        Args:
+            match_query: Expressão MATCH já sanitizada
+            limit: Número máximo de resultados
+
+        Returns:
+            Lista de dicionários com dados das notícias, bm25 e snippet
+        """
+        fts_config = get_db_config().get_fts_config()
+        table = fts_config['table']
+        peso_titulo, peso_resumo = fts_config['weights']
+
+        with db_query_duration_seconds.time("search"):
+            rows = self._get_connection().execute(f"""
+                SELECT n.id, n.titulo, n.link, n.imagem, n.resumo, n.cluster, n.fonte,
+                       n.data_selecao, n.score, n.score_ajustado, n.status,
+                       bm25({table}, ?, ?) AS bm25,
+                       snippet({table}, -1, '<mark>', '</mark>', '…', 16) AS snippet
+                FROM {table}
+                JOIN noticias n ON n.id = {table}.rowid
+                WHERE {table} MATCH ?
+                ORDER BY bm25
+                LIMIT ?
+            """, (peso_titulo, peso_resumo, match_query, limit)).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def export_news(self, filters: Dict[str, Any], fmt: str = "ndjson",
+                    batch_size: int = 500) -> Iterator[bytes]:
+        """
+        Gera a exportação das notícias em lotes, lidos do cursor com fetchmany
+
+        Usa uma conexão própria (a exportação pode durar mais que uma
+        consulta comum e cada lote pode ser lido por uma thread diferente
+        do executor), fechada ao fim ou quando o gerador é descartado.
+
+        Args:
+            filters: Filtros normalizados por build_filters (status opcional)
+            fmt: "ndjson" (um objeto JSON por linha) ou "csv" (com cabeçalho)
+            batch_size: Linhas lidas do cursor por lote
+
+        Yields:
+            Bytes de cada lote já formatado
+        """
+        sql, params = self.db_manager.build_export_query(filters)
+
+        conn = sqlite3.connect(self.db_manager.main_db_path,
+                               check_same_thread=False)
+        try:
+            cursor = conn.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+
+            if fmt == "csv":
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(columns)
+                yield buffer.getvalue().encode("utf-8")
+
+            while True:
+                with db_query_duration_seconds.time("export"):
+                    rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+
+                if fmt == "csv":
+                    buffer = io.StringIO()
+                    csv.writer(buffer).writerows(rows)
+                    yield buffer.getvalue().encode("utf-8")
+                else:
+                    yield "".join(
+                        json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+                        for row in rows).encode("utf-8")
+        finally:
+            conn.close()
+
+    def get_clusters(self) -> ClustersResponse:
+        """
+        Obtém a interpretação dos clusters gravada pelo pipeline
+
+        Returns:
+            ClustersResponse com rótulo, termos e notícias representativas
+            de cada cluster
+        """
+        data_version = self._sync_data_version()
+
+        try:
+            cached_data = self.cache.get(CLUSTERS_CACHE_KEY)
+            if cached_data:
+                cached_data["cached"] = True
+                return ClustersResponse(**cached_data)
+
+            with db_query_duration_seconds.time("clusters"):
+                rows = self.db_manager.get_cluster_interpretations()
+
+            with serialization_duration_seconds.time("ClustersResponse"):
+                clusters = [ClusterInfo(**row) for row in rows]
+                response_data = {
+                    "success": True,
+                    "data": [item.dict() for item in clusters],
+                    "total": len(clusters),
+                    "cached": False,
+                    "timestamp": datetime.now().isoformat()
+                }
+
+            self.cache.set(CLUSTERS_CACHE_KEY, response_data, data_version)
+
+            return ClustersResponse(**response_data)
+
+        except Exception as e:
+            print(f"[ERRO] Erro ao obter clusters: {e}")
+            return ClustersResponse(
+                success=False,
+                data=[],
+                total=0,
+                cached=False,
+                timestamp=datetime.now().isoformat()
+            )
+
+    def ping_database(self) -> bool:
+        """
+        Verificação barata do banco para readiness: uma consulta ao catálogo
+        na conexão já aberta da thread, sem varrer a tabela de notícias
+
+        Returns:
+            True se o banco responde e a tabela de notícias existe
+        """
+        try:
+            with db_query_duration_seconds.time("ping"):
+                row = self._get_connection().execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'noticias'"
+                ).fetchone()
+            return row is not None
+        except Exception as e:
+            print(f"[ERRO] Banco de dados indisponível: {e}")
+            return False
+
+    def refresh_statistics(self) -> bool:
+        """
+        Recalcula as estatísticas do banco (executado em segundo plano)
+
+        Returns:
+            True se atualizado com sucesso
+        """
+        stats = self.db_manager.get_statistics()
+        if not stats:
+            return False
+
+        self._statistics = stats
+        self._statistics_updated_at = datetime.now().isoformat()
+        return True
+
+    def get_cached_statistics(self) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Obtém as últimas estatísticas calculadas, sem acessar o banco
+
+        Returns:
+            Tupla (estatísticas, momento_da_atualização)
+        """
+        return self._statistics, self._statistics_updated_at
+
     def clear_cache(self) -> bool:
         """
         Limpa o cache da API
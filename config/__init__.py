@@ -4,11 +4,19 @@ Configurações globais do pipeline de notícias de marketing
 """
 
 from .config import *
+from .stopwords import STOPWORDS_PT, STOPWORDS_VERSAO, get_stopwords_lista
 
 __all__ = [
     'HEADERS',
     'MODEL_CONFIG',
     'CLUSTERING_CONFIG',
     'RELEVANCE_KEYWORDS',
-    'MAPA_ROTULOS'
+    'SELECTION_CONFIG',
+    'RECENCY_CONFIG',
+    'DEDUP_CONFIG',
+    'MAPA_ROTULOS',
+    'SNAPSHOT_CONFIG',
+    'STOPWORDS_PT',
+    'STOPWORDS_VERSAO',
+    'get_stopwords_lista'
 ]
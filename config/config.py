@@ -3,6 +3,8 @@
 Configurações globais do pipeline de notícias de marketing
 """
 
+import os
+
 # Headers para requisições HTTP
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.36'
@@ -20,10 +22,28 @@ MODEL_CONFIG = {
 
 # Configurações de clusterização
 CLUSTERING_CONFIG = {
-    'n_clusters': 5,
+    'n_clusters': 'auto',     # Número fixo de clusters ou 'auto'
     'random_state': 42,
     'n_init': 10,
-    'max_features': 1000
+    'max_features': 1000,
+    # 'tfidf': vocabulário ajustado em memória; 'hashing': leitura em lotes do
+    # SQLite com HashingVectorizer + IDF incremental (cargas retroativas grandes)
+    'vetorizador': 'tfidf',
+    'n_features_hash': 2 ** 18,  # Colunas do vetorizador por hashing
+    'tamanho_lote': 5000,     # Resumos por lote no modo 'hashing'
+    'amostra_termos': 20000,  # Resumos usados para nomear as colunas no modo 'hashing'
+    # Modo 'auto': k avaliado em paralelo sobre uma amostra dos resumos
+    'k_range': (3, 10),       # Intervalo de k (o validador aceita clusters 0 a 10)
+    'k_metrica': 'silhouette',  # 'silhouette' ou 'davies_bouldin'
+    'k_amostra': 1000,        # Resumos usados no cálculo da métrica
+    'k_orcamento_segundos': 60,
+    'k_workers': None,        # Processos do pool (None: número de CPUs)
+    'k_padrao': 5,            # k usado se nenhum valor for avaliado a tempo
+    # Interpretação dos clusters (tabela clusters do banco principal)
+    'top_termos': 10,         # Termos de maior peso por centróide
+    'representativas': 3,     # Notícias mais próximas do centróide por cluster
+    # Vetorizador e centróides persistidos entre execuções (joblib)
+    'model_path': 'models/clustering.joblib'
 }
 
 # Configurações de relevância
@@ -55,11 +75,48 @@ RELEVANCE_KEYWORDS = {
     }
 }
 
-# Mapeamento de rótulos para clusters
-MAPA_ROTULOS = {
-    0: "Tema A (Ex: IA e Automação)",
-    1: "Tema B (Ex: SEO e Buscas)",
-    2: "Tema C (Ex: Marketing de Influência)",
-    3: "Tema D (Ex: E-commerce e Varejo)",
-    4: "Tema E (Ex: Branding e Campanhas)"
+# Configurações da seleção estratégica (diversidade do top N)
+SELECTION_CONFIG = {
+    'estrategia': 'mmr',      # 'mmr', 'cotas' ou 'score' (apenas relevância)
+    'lambda_mmr': 0.7,        # Peso da relevância no MMR (0 a 1)
+    'cota_por_cluster': 4     # Máximo de notícias por cluster (None: sem limite)
+}
+
+# Detecção de notícias quase duplicadas (MinHash + LSH) antes da sumarização.
+# Com 32 bandas de 4 linhas, pares com Jaccard a partir de ~0,42 viram
+# candidatos; o limiar confirma a duplicata pela similaridade estimada.
+DEDUP_CONFIG = {
+    'shingle': 3,             # Palavras por shingle
+    'permutacoes': 128,       # Tamanho da assinatura MinHash
+    'bandas': 32,             # Bandas do LSH (permutacoes / bandas linhas cada)
+    'limiar': 0.5,            # Similaridade de Jaccard estimada mínima
+    'seed': 42
+}
+
+# Decaimento por recência do score de relevância na seleção:
+# score_ajustado = score * ((1 - peso) + peso * 0.5 ** (idade_horas / meia_vida))
+RECENCY_CONFIG = {
+    'peso': 0.5,              # Fração do score sujeita ao decaimento (0: desligado)
+    'meia_vida_horas': {      # Horas até a parcela decaída cair pela metade
+        'padrao': 48,
+        'Exame': 24,
+        'Meio e Mensagem': 48,
+        'Mundo do Marketing': 72,
+        'GKPB': 72
+    }
+}
+
+# Rótulos manuais por número de cluster. Clusters sem entrada aqui são
+# rotulados pelos três termos de maior peso do centróide, ex.:
+# MAPA_ROTULOS = {0: "IA e Automação", 3: "E-commerce e Varejo"}
+MAPA_ROTULOS = {}
+
+# Configurações dos snapshots estáticos do feed (gerados ao fim do pipeline).
+# O diretório é o mesmo servido pela API em /api/v1/snapshots/ (api/config.py
+# lê este valor); SNAPSHOT_DIR altera os dois lados.
+SNAPSHOT_CONFIG = {
+    'output_dir': os.getenv('SNAPSHOT_DIR', 'snapshots'),
+    'top_n': 50,
+    'gzip_level': 9,
+    'keep_versions': 3
 }
@@ -0,0 +1,57 @@
+# STOPWORDS EM PORTUGUÊS
+"""
+Stopwords do português distribuídas com o projeto (config/stopwords_pt.txt).
+
+O arquivo é lido uma única vez, na importação, para um frozenset
+compartilhado pelos vetorizadores; nenhum download é necessário em tempo
+de execução.
+"""
+
+import os
+import re
+from typing import FrozenSet, List, Tuple
+
+# Arquivo distribuído junto com este módulo
+ARQUIVO_STOPWORDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stopwords_pt.txt')
+
+
+def carregar_stopwords(caminho: str = ARQUIVO_STOPWORDS) -> Tuple[int, FrozenSet[str]]:
+    """
+    Lê um arquivo de stopwords (uma por linha, # inicia comentário)
+
+    Args:
+        caminho: Caminho do arquivo
+
+    Returns:
+        Tupla (versão declarada no cabeçalho, conjunto de stopwords)
+    """
+    versao = 0
+    palavras = set()
+
+    with open(caminho, encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            linha = linha.strip()
+            if linha.startswith('#'):
+                encontrada = re.match(r'#\s*versao:\s*(\d+)', linha)
+                if encontrada:
+                    versao = int(encontrada.group(1))
+            elif linha:
+                palavras.add(linha.lower())
+
+    return versao, frozenset(palavras)
+
+
+STOPWORDS_VERSAO, STOPWORDS_PT = carregar_stopwords()
+
+# Lista ordenada para o scikit-learn (o parâmetro stop_words exige lista)
+_STOPWORDS_LISTA = sorted(STOPWORDS_PT)
+
+
+def get_stopwords_lista() -> List[str]:
+    """
+    Obtém as stopwords como lista ordenada (formato aceito pelo scikit-learn)
+
+    Returns:
+        Cópia da lista de stopwords
+    """
+    return list(_STOPWORDS_LISTA)
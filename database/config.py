@@ -52,11 +52,24 @@ class DatabaseConfig:
                     'idx_noticias_data_selecao',
                     'idx_noticias_cluster',
                     'idx_noticias_fonte',
-                    'idx_noticias_score'
+                    'idx_noticias_score',
+                    'idx_noticias_feed',
+                    'idx_noticias_fonte_feed',
+                    'idx_noticias_cluster_feed',
+                    'idx_noticias_fonte_cluster_feed'
                 ]
             }
         }
 
+        # Configurações da busca textual (SQLite FTS5)
+        self.FTS_CONFIG = {
+            'table': 'noticias_fts',
+            # remove_diacritics 2: "inovação" e "inovacao" geram o mesmo token
+            'tokenize': 'unicode61 remove_diacritics 2',
+            # Peso das colunas no bm25 (titulo, resumo)
+            'weights': (2.0, 1.0)
+        }
+
     def get_aux_db_path(self) -> str:
         """
         Retorna o caminho do banco de dados auxiliar
@@ -102,6 +115,15 @@ class DatabaseConfig:
         """
         return self.INDEX_CONFIG.copy()
 
+    def get_fts_config(self) -> Dict[str, Any]:
+        """
+        Retorna as configurações da busca textual
+
+        Returns:
+            Dicionário com as configurações do FTS5
+        """
+        return self.FTS_CONFIG.copy()
+
     def set_custom_paths(self, aux_path: str = None, main_path: str = None):
         """
         Define caminhos customizados para os bancos de dados
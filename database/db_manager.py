@@ -6,7 +6,8 @@ Unifica operações auxiliares e principais em uma única interface simplificada
 
 import sqlite3
 import os
-from typing import List, Dict, Optional, Tuple
+import json
+from typing import Any, Iterator, List, Dict, Optional, Tuple
 from datetime import datetime
 from urllib.parse import urlparse
 from .config import get_db_config
@@ -72,9 +73,25 @@ class DatabaseManager:
                         cluster INTEGER,
                         data_coleta TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                         data_processamento TIMESTAMP,
-                        status TEXT DEFAULT 'coletada'
+                        status TEXT DEFAULT 'coletada',
+                        data_publicacao TIMESTAMP
                     )
                 """)
+                self._add_column_if_missing(
+                    cursor, 'noticias_aux', 'data_publicacao', 'TIMESTAMP')
+
+                # Grupos de notícias quase duplicadas (mantidos entre execuções)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS grupos_duplicatas (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        link TEXT NOT NULL,
+                        canonica TEXT NOT NULL,
+                        similaridade REAL NOT NULL,
+                        data_deteccao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_grupos_duplicatas_canonica ON grupos_duplicatas(canonica)")
 
                 # Criar índices para performance
                 cursor.execute(
@@ -111,10 +128,17 @@ class DatabaseManager:
                         fonte TEXT NOT NULL,
                         score REAL,
                         status TEXT DEFAULT 'arquivada',
-                        data_selecao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        data_selecao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        score_ajustado REAL
                     )
                 """)
 
+                # Score com decaimento por recência (ordem do feed); em bancos
+                # anteriores, parte do score de relevância
+                if self._add_column_if_missing(cursor, 'noticias', 'score_ajustado', 'REAL'):
+                    cursor.execute(
+                        "UPDATE noticias SET score_ajustado = score WHERE score_ajustado IS NULL")
+
                 # Criar índices para performance
                 cursor.execute(
                     "CREATE INDEX IF NOT EXISTS idx_noticias_link ON noticias(link)")
@@ -127,6 +151,56 @@ class DatabaseManager:
                 cursor.execute(
                     "CREATE INDEX IF NOT EXISTS idx_noticias_score ON noticias(score)")
 
+                # Índices da listagem paginada (keyset por score ajustado, data
+                # e id), um por combinação de filtros de igualdade aceita pela API
+                feed_indexes = {
+                    'idx_noticias_feed': "status",
+                    'idx_noticias_fonte_feed': "status, fonte",
+                    'idx_noticias_cluster_feed': "status, cluster",
+                    'idx_noticias_fonte_cluster_feed': "status, fonte, cluster"
+                }
+                for name, prefix in feed_indexes.items():
+                    # Versões anteriores ordenavam pelo score bruto
+                    row = cursor.execute(
+                        "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?",
+                        (name,)).fetchone()
+                    if row and 'score_ajustado' not in row[0]:
+                        cursor.execute(f"DROP INDEX {name}")
+                    cursor.execute(f"""
+                        CREATE INDEX IF NOT EXISTS {name}
+                        ON noticias({prefix}, score_ajustado, data_selecao, id)
+                    """)
+
+                # Índice de busca textual (opcional: depende do FTS5 no SQLite)
+                self._init_fulltext_index(cursor)
+
+                # Contagens diárias pré-calculadas para as estatísticas
+                self._init_stats_rollup(cursor)
+
+                # Interpretação dos clusters (rótulo, termos e notícias
+                # representativas), gravada pela etapa de análise de clusters
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS clusters (
+                        cluster INTEGER PRIMARY KEY,
+                        rotulo TEXT NOT NULL,
+                        termos TEXT NOT NULL,
+                        representativas TEXT NOT NULL,
+                        tamanho INTEGER NOT NULL DEFAULT 0,
+                        atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+
+                # Versão dos dados, incrementada a cada escrita do pipeline
+                # (usada pela API para invalidar o cache)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS metadados (
+                        chave TEXT PRIMARY KEY,
+                        valor INTEGER NOT NULL
+                    )
+                """)
+                cursor.execute(
+                    "INSERT OR IGNORE INTO metadados (chave, valor) VALUES ('data_version', 0)")
+
                 conn.commit()
                 return True
 
@@ -134,6 +208,171 @@ class DatabaseManager:
             print(f"[ERRO] Erro ao inicializar banco principal: {e}")
             return False
 
+    def _add_column_if_missing(self, cursor: sqlite3.Cursor, table: str,
+                               column: str, declaration: str) -> bool:
+        """
+        Adiciona uma coluna a uma tabela criada por versões anteriores
+
+        Args:
+            cursor: Cursor da transação de inicialização
+            table: Nome da tabela
+            column: Nome da coluna
+            declaration: Tipo/definição da coluna
+
+        Returns:
+            True se a coluna foi adicionada agora
+        """
+        columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        if column in columns:
+            return False
+
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+        return True
+
+    def _init_fulltext_index(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        Cria a tabela FTS5 sobre titulo e resumo e os triggers que a mantêm
+        sincronizada com a tabela noticias
+
+        Args:
+            cursor: Cursor aberto no banco principal
+
+        Returns:
+            True se o índice está disponível, False caso contrário
+        """
+        fts_config = self.config.get_fts_config()
+        table = fts_config['table']
+
+        try:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+            already_exists = cursor.fetchone() is not None
+
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5(
+                    titulo, resumo,
+                    content='noticias', content_rowid='id',
+                    tokenize='{fts_config['tokenize']}'
+                )
+            """)
+
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON noticias BEGIN
+                    INSERT INTO {table}(rowid, titulo, resumo)
+                    VALUES (new.id, new.titulo, new.resumo);
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON noticias BEGIN
+                    INSERT INTO {table}({table}, rowid, titulo, resumo)
+                    VALUES ('delete', old.id, old.titulo, old.resumo);
+                END
+            """)
+            # Apenas mudanças de texto reindexam (status e data_selecao não)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE OF titulo, resumo ON noticias BEGIN
+                    INSERT INTO {table}({table}, rowid, titulo, resumo)
+                    VALUES ('delete', old.id, old.titulo, old.resumo);
+                    INSERT INTO {table}(rowid, titulo, resumo)
+                    VALUES (new.id, new.titulo, new.resumo);
+                END
+            """)
+
+            # Indexar notícias gravadas antes da criação do índice
+            if not already_exists:
+                cursor.execute(
+                    f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
+            return True
+
+        except sqlite3.OperationalError as e:
+            print(f"[AVISO] Busca textual indisponível (FTS5): {e}")
+            return False
+
+    def _init_stats_rollup(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        Cria a tabela de contagens diárias (dia, cluster, status) e os
+        triggers que a atualizam na mesma transação de cada escrita em noticias
+
+        Args:
+            cursor: Cursor aberto no banco principal
+
+        Returns:
+            True se a tabela está disponível
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'noticias_resumo_diario'")
+        already_exists = cursor.fetchone() is not None
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS noticias_resumo_diario (
+                dia TEXT NOT NULL,
+                cluster INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                quantidade INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (dia, cluster, status)
+            ) WITHOUT ROWID
+        """)
+
+        # Notícias sem data_selecao (ou com data inválida) ficam fora das
+        # contagens diárias: dia é obrigatório na tabela
+        increment = """
+            INSERT INTO noticias_resumo_diario (dia, cluster, status, quantidade)
+            SELECT date(new.data_selecao), new.cluster, IFNULL(new.status, 'arquivada'), 1
+            WHERE date(new.data_selecao) IS NOT NULL
+            ON CONFLICT(dia, cluster, status) DO UPDATE SET quantidade = quantidade + 1;
+        """
+        decrement = """
+            UPDATE noticias_resumo_diario SET quantidade = quantidade - 1
+            WHERE dia = date(old.data_selecao) AND cluster = old.cluster
+            AND status = IFNULL(old.status, 'arquivada');
+        """
+
+        # Recriados a cada inicialização para atualizar bancos com a versão
+        # anterior dos triggers
+        for trigger in ('noticias_resumo_ai', 'noticias_resumo_ad', 'noticias_resumo_au'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS noticias_resumo_ai AFTER INSERT ON noticias BEGIN
+                {increment}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS noticias_resumo_ad AFTER DELETE ON noticias BEGIN
+                {decrement}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS noticias_resumo_au
+            AFTER UPDATE OF data_selecao, cluster, status ON noticias BEGIN
+                {decrement}
+                {increment}
+            END
+        """)
+
+        # Contabilizar notícias gravadas antes da criação da tabela
+        if not already_exists:
+            cursor.execute("""
+                INSERT INTO noticias_resumo_diario (dia, cluster, status, quantidade)
+                SELECT date(data_selecao), cluster, IFNULL(status, 'arquivada'), COUNT(*)
+                FROM noticias
+                WHERE date(data_selecao) IS NOT NULL
+                GROUP BY 1, 2, 3
+            """)
+
+        return True
+
+    def initialize_main_database(self) -> bool:
+        """
+        Garante tabelas e índices do banco principal sem tocar no auxiliar.
+        Seguro para bancos já existentes (apenas cria o que estiver faltando)
+
+        Returns:
+            True se inicializado com sucesso, False caso contrário
+        """
+        return self._init_main_database()
+
     def detect_fonte_from_url(self, url: str) -> str:
         """
         Detecta a fonte baseada na URL da notícia
@@ -149,7 +388,8 @@ class DatabaseManager:
 
     # OPERAÇÕES NO BANCO AUXILIAR
 
-    def insert_news_basic(self, titulo: str, link: str, imagem: Optional[str] = None, fonte: str = None) -> bool:
+    def insert_news_basic(self, titulo: str, link: str, imagem: Optional[str] = None, fonte: str = None,
+                          data_publicacao: Optional[str] = None) -> bool:
         """
         Insere notícia básica (após scraping) no banco auxiliar
 
@@ -158,6 +398,7 @@ class DatabaseManager:
             link: Link da notícia (deve ser único)
             imagem: URL da imagem (opcional)
             fonte: Fonte da notícia (se None, detecta automaticamente)
+            data_publicacao: Data de publicação em UTC no formato do SQLite (opcional)
 
         Returns:
             True se inserido com sucesso, False caso contrário
@@ -186,9 +427,10 @@ class DatabaseManager:
                 cursor = conn.cursor()
 
                 cursor.execute("""
-                    INSERT INTO noticias_aux (titulo, link, imagem, fonte)
-                    VALUES (?, ?, ?, ?)
-                """, (news_data['titulo'], news_data['link'], news_data['imagem'], news_data['fonte']))
+                    INSERT INTO noticias_aux (titulo, link, imagem, fonte, data_publicacao)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (news_data['titulo'], news_data['link'], news_data['imagem'], news_data['fonte'],
+                      data_publicacao))
 
                 conn.commit()
                 return True
@@ -319,6 +561,91 @@ class DatabaseManager:
             print(f"[ERRO] Erro ao obter notícias para clustering: {e}")
             return []
 
+    def iter_news_for_clustering(self, batch_size: int = 5000) -> Iterator[List[Tuple[int, str]]]:
+        """
+        Percorre em lotes as notícias que precisam de clustering
+
+        Paginação por id (keyset): cada lote é uma consulta curta, sem
+        cursor aberto entre lotes, então as notícias podem ser atualizadas
+        durante a leitura. Apenas id e resumo são lidos.
+
+        Args:
+            batch_size: Notícias por lote
+
+        Yields:
+            Listas de tuplas (id, resumo)
+        """
+        last_id = 0
+        while True:
+            with sqlite3.connect(self.aux_db_path) as conn:
+                rows = conn.execute("""
+                    SELECT id, resumo
+                    FROM noticias_aux
+                    WHERE resumo IS NOT NULL AND cluster IS NULL AND status = 'processada'
+                      AND id > ?
+                    ORDER BY id
+                    LIMIT ?
+                """, (last_id, batch_size)).fetchall()
+
+            if not rows:
+                return
+
+            yield rows
+            last_id = rows[-1][0]
+
+    def iter_clustered_news(self, batch_size: int = 5000) -> Iterator[List[Tuple]]:
+        """
+        Percorre em lotes as notícias já clusterizadas (paginação por id)
+
+        Args:
+            batch_size: Notícias por lote
+
+        Yields:
+            Listas de tuplas (id, titulo, link, resumo, cluster)
+        """
+        last_id = 0
+        while True:
+            with sqlite3.connect(self.aux_db_path) as conn:
+                rows = conn.execute("""
+                    SELECT id, titulo, link, resumo, cluster
+                    FROM noticias_aux
+                    WHERE resumo IS NOT NULL AND cluster IS NOT NULL AND status = 'clusterizada'
+                      AND id > ?
+                    ORDER BY id
+                    LIMIT ?
+                """, (last_id, batch_size)).fetchall()
+
+            if not rows:
+                return
+
+            yield rows
+            last_id = rows[-1][0]
+
+    def update_clusters_batch(self, assignments: List[Tuple[int, int]]) -> int:
+        """
+        Atribui clusters a várias notícias do banco auxiliar em uma transação
+
+        Args:
+            assignments: Lista de tuplas (cluster, id)
+
+        Returns:
+            Número de notícias atualizadas
+        """
+        try:
+            with sqlite3.connect(self.aux_db_path) as conn:
+                cursor = conn.cursor()
+                cursor.executemany("""
+                    UPDATE noticias_aux
+                    SET cluster = ?, status = 'clusterizada'
+                    WHERE id = ?
+                """, assignments)
+                conn.commit()
+                return cursor.rowcount
+
+        except Exception as e:
+            print(f"[ERRO] Erro ao atualizar clusters em lote: {e}")
+            return 0
+
     def get_news_for_selection(self) -> List[Dict]:
         """
         Obtém notícias prontas para seleção (com resumo e cluster)
@@ -332,7 +659,8 @@ class DatabaseManager:
                 cursor = conn.cursor()
 
                 cursor.execute("""
-                    SELECT id, titulo, link, imagem, resumo, cluster, fonte
+                    SELECT id, titulo, link, imagem, resumo, cluster, fonte,
+                           COALESCE(data_publicacao, data_coleta) AS data_referencia
                     FROM noticias_aux
                     WHERE resumo IS NOT NULL AND cluster IS NOT NULL AND status = 'clusterizada'
                     ORDER BY data_processamento DESC
@@ -345,6 +673,35 @@ class DatabaseManager:
             print(f"[ERRO] Erro ao obter notícias para seleção: {e}")
             return []
 
+    def save_duplicate_groups(self, registros: List[Tuple[str, str, float]]) -> int:
+        """
+        Registra notícias quase duplicadas e as retira do fluxo do pipeline
+
+        Args:
+            registros: Lista de tuplas (link, link da canônica, similaridade)
+
+        Returns:
+            Número de notícias marcadas como duplicadas
+        """
+        try:
+            with sqlite3.connect(self.aux_db_path) as conn:
+                cursor = conn.cursor()
+
+                cursor.executemany("""
+                    INSERT INTO grupos_duplicatas (link, canonica, similaridade)
+                    VALUES (?, ?, ?)
+                """, registros)
+                cursor.executemany("""
+                    UPDATE noticias_aux SET status = 'duplicada' WHERE link = ?
+                """, [(link,) for link, _, _ in registros])
+
+                conn.commit()
+                return cursor.rowcount
+
+        except Exception as e:
+            print(f"[ERRO] Erro ao registrar duplicatas: {e}")
+            return 0
+
     def clear_auxiliary_database(self) -> bool:
         """
         Limpa todos os dados do banco auxiliar
@@ -404,7 +761,7 @@ class DatabaseManager:
 
     def insert_selected_news(self, titulo: str, link: str, imagem: Optional[str], resumo: str,
                              cluster: int, fonte: str, score: Optional[float] = None,
-                             status: str = "arquivada") -> bool:
+                             status: str = "arquivada", score_ajustado: Optional[float] = None) -> bool:
         """
         Insere uma nova notícia selecionada no banco principal
 
@@ -417,6 +774,7 @@ class DatabaseManager:
             fonte: Fonte da notícia
             score: Score de relevância (opcional)
             status: Status da notícia (postada/arquivada)
+            score_ajustado: Score com decaimento por recência (padrão: score)
 
         Returns:
             True se inserido com sucesso, False caso contrário
@@ -446,11 +804,13 @@ class DatabaseManager:
                 cursor = conn.cursor()
 
                 cursor.execute("""
-                    INSERT INTO noticias (titulo, link, imagem, resumo, cluster, fonte, score, status)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT INTO noticias (titulo, link, imagem, resumo, cluster, fonte, score, status,
+                                          score_ajustado)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (news_data['titulo'], news_data['link'], news_data['imagem'],
                       news_data['resumo'], news_data['cluster'], news_data['fonte'],
-                      news_data['score'], news_data['status']))
+                      news_data['score'], news_data['status'],
+                      score_ajustado if score_ajustado is not None else news_data['score']))
 
                 conn.commit()
                 print(
@@ -465,12 +825,18 @@ class DatabaseManager:
             print(f"[ERRO] Erro ao inserir notícia selecionada: {e}")
             return False
 
-    def update_selection_timestamp_and_status(self, link: str) -> bool:
+    def update_selection_timestamp_and_status(self, link: str, score: Optional[float] = None,
+                                              score_ajustado: Optional[float] = None) -> bool:
         """
         Atualiza o timestamp de seleção e garante que o status seja "postada"
 
+        Os scores, quando informados, substituem os da seleção anterior (o
+        decaimento por recência muda a cada execução).
+
         Args:
             link: Link da notícia
+            score: Score de relevância recalculado (opcional)
+            score_ajustado: Score com decaimento recalculado (opcional)
 
         Returns:
             True se atualizado com sucesso, False caso contrário
@@ -481,9 +847,11 @@ class DatabaseManager:
 
                 cursor.execute("""
                     UPDATE noticias 
-                    SET data_selecao = CURRENT_TIMESTAMP, status = 'postada'
+                    SET data_selecao = CURRENT_TIMESTAMP, status = 'postada',
+                        score = COALESCE(?, score),
+                        score_ajustado = COALESCE(?, score_ajustado)
                     WHERE link = ?
-                """, (link,))
+                """, (score, score_ajustado, link))
 
                 if cursor.rowcount > 0:
                     conn.commit()
@@ -549,7 +917,8 @@ class DatabaseManager:
 
             if self.check_link_exists_main(link):
                 # Notícia já existe - atualizar timestamp e manter status postada
-                if self.update_selection_timestamp_and_status(link):
+                if self.update_selection_timestamp_and_status(
+                        link, news.get('score'), news.get('score_ajustado')):
                     stats['atualizadas'] += 1
                 else:
                     stats['falhas'] += 1
@@ -563,14 +932,167 @@ class DatabaseManager:
                     news['cluster'],
                     news['fonte'],
                     news.get('score'),
-                    'postada'  # Sempre inserir como postada
+                    'postada',  # Sempre inserir como postada
+                    news.get('score_ajustado')
                 ):
                     stats['novas'] += 1
                 else:
                     stats['falhas'] += 1
 
+        if stats['novas'] or stats['atualizadas']:
+            self.bump_data_version()
+
         return stats
 
+    def _bump_data_version(self, cursor: sqlite3.Cursor) -> None:
+        """Incrementa a versão dos dados na transação do cursor informado"""
+        cursor.execute(
+            "UPDATE metadados SET valor = valor + 1 WHERE chave = 'data_version'")
+
+    def bump_data_version(self) -> bool:
+        """
+        Registra que os dados do banco principal mudaram
+
+        Returns:
+            True se registrado com sucesso
+        """
+        try:
+            with sqlite3.connect(self.main_db_path) as conn:
+                self._bump_data_version(conn.cursor())
+                conn.commit()
+                return True
+
+        except Exception as e:
+            print(f"[ERRO] Erro ao atualizar a versão dos dados: {e}")
+            return False
+
+    def get_data_version(self) -> int:
+        """
+        Obtém a versão atual dos dados do banco principal
+
+        Returns:
+            Versão dos dados (0 se indisponível)
+        """
+        try:
+            with sqlite3.connect(self.main_db_path) as conn:
+                row = conn.execute(
+                    "SELECT valor FROM metadados WHERE chave = 'data_version'").fetchone()
+                return row[0] if row else 0
+
+        except Exception as e:
+            print(f"[ERRO] Erro ao obter a versão dos dados: {e}")
+            return 0
+
+    def build_listing_query(self, filters: Dict, after: Optional[Tuple] = None,
+                            limit: int = 15, only_null_score: bool = False) -> Tuple[str, List]:
+        """
+        Monta a consulta paginada da listagem de notícias do banco principal
+
+        As igualdades (status, fonte, cluster) casam com o prefixo de um dos
+        índices *_feed e a ordenação segue as colunas seguintes do mesmo
+        índice; o intervalo de datas é avaliado sobre as entradas do índice.
+
+        Args:
+            filters: Dicionário com status e, opcionalmente, fonte, cluster,
+                since e until (timestamps no formato do SQLite)
+            after: Tupla (score_ajustado, data_selecao, id) da última notícia já entregue
+            limit: Número máximo de notícias
+            only_null_score: Se True, busca apenas notícias sem score ajustado
+
+        Returns:
+            Tupla (sql, parâmetros)
+        """
+        conditions = ["status = ?"]
+        params = [filters.get('status', 'postada')]
+
+        if filters.get('fonte'):
+            conditions.append("fonte = ?")
+            params.append(filters['fonte'])
+
+        if filters.get('cluster') is not None:
+            conditions.append("cluster = ?")
+            params.append(filters['cluster'])
+
+        if filters.get('since'):
+            conditions.append("data_selecao >= ?")
+            params.append(filters['since'])
+
+        if filters.get('until'):
+            conditions.append("data_selecao < ?")
+            params.append(filters['until'])
+
+        if only_null_score:
+            conditions.append("score_ajustado IS NULL")
+            if after is not None:
+                conditions.append("(data_selecao, id) < (?, ?)")
+                params.extend([after[1], after[2]])
+        elif after is not None:
+            conditions.append("(score_ajustado, data_selecao, id) < (?, ?, ?)")
+            params.extend([after[0], after[1], after[2]])
+
+        sql = f"""
+            SELECT id, titulo, link, imagem, resumo, cluster, fonte,
+                   data_selecao, score, score_ajustado, status
+            FROM noticias
+            WHERE {' AND '.join(conditions)}
+            ORDER BY score_ajustado DESC, data_selecao DESC, id DESC
+            LIMIT ?
+        """
+        params.append(limit)
+
+        return sql, params
+
+    def build_export_query(self, filters: Dict) -> Tuple[str, List]:
+        """
+        Monta a consulta da exportação completa de notícias do banco principal
+
+        NOT INDEXED força a varredura da tabela na ordem do rowid: com os
+        filtros, o planejador escolheria um índice de status/fonte e
+        ordenaria todo o resultado (TEMP B-TREE) antes da primeira linha.
+        Assim as linhas saem já em ordem de id e podem ser lidas em lotes
+        com memória constante; os filtros são avaliados linha a linha.
+
+        Args:
+            filters: Dicionário com status, fonte, cluster, since e until,
+                todos opcionais (sem status: todas as notícias)
+
+        Returns:
+            Tupla (sql, parâmetros)
+        """
+        conditions = []
+        params = []
+
+        if filters.get('status'):
+            conditions.append("status = ?")
+            params.append(filters['status'])
+
+        if filters.get('fonte'):
+            conditions.append("fonte = ?")
+            params.append(filters['fonte'])
+
+        if filters.get('cluster') is not None:
+            conditions.append("cluster = ?")
+            params.append(filters['cluster'])
+
+        if filters.get('since'):
+            conditions.append("data_selecao >= ?")
+            params.append(filters['since'])
+
+        if filters.get('until'):
+            conditions.append("data_selecao < ?")
+            params.append(filters['until'])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"""
+            SELECT id, titulo, link, imagem, resumo, cluster, fonte,
+                   data_selecao, score, score_ajustado, status
+            FROM noticias NOT INDEXED
+            {where}
+            ORDER BY id
+        """
+
+        return sql, params
+
     def get_latest_news(self, limit: int = 15) -> List[Dict]:
         """
         Obtém as notícias mais recentes ordenadas por data_selecao
@@ -587,9 +1109,10 @@ class DatabaseManager:
                 cursor = conn.cursor()
 
                 cursor.execute("""
-                    SELECT id, titulo, link, imagem, resumo, cluster, fonte, data_selecao, score, status
+                    SELECT id, titulo, link, imagem, resumo, cluster, fonte, data_selecao, score,
+                           score_ajustado, status
                     FROM noticias
-                    ORDER BY score DESC, data_selecao DESC
+                    ORDER BY score_ajustado DESC, data_selecao DESC
                     LIMIT ?
                 """, (limit,))
 
@@ -626,6 +1149,7 @@ class DatabaseManager:
                     'fonte': item['fonte'],
                     'data_selecao': item['data_selecao'],
                     'score': item.get('score'),
+                    'score_ajustado': item.get('score_ajustado'),
                     'status': item.get('status')
                 }
                 api_data.append(api_item)
@@ -636,10 +1160,60 @@ class DatabaseManager:
             print(f"[ERRO] Erro ao obter dados da API: {e}")
             return []
 
-    def get_statistics(self) -> Dict[str, int]:
+    def get_feed(self, filters: Dict, limit: int = 15) -> List[Dict]:
+        """
+        Obtém a primeira página da listagem (mesma ordem da API)
+
+        Args:
+            filters: Dicionário de filtros aceito por build_listing_query
+            limit: Número máximo de notícias
+
+        Returns:
+            Lista de dicionários com as notícias
+        """
+        try:
+            sql, params = self.build_listing_query(filters, limit=limit)
+
+            with sqlite3.connect(self.main_db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                return [dict(row) for row in conn.execute(sql, params)]
+
+        except Exception as e:
+            print(f"[ERRO] Erro ao obter feed: {e}")
+            return []
+
+    def get_feed_groups(self, status: str = 'postada') -> Dict[str, List]:
+        """
+        Obtém os clusters e as fontes que têm notícias com o status informado
+
+        Args:
+            status: Status das notícias
+
+        Returns:
+            Dicionário com as listas 'clusters' e 'fontes'
+        """
+        try:
+            with sqlite3.connect(self.main_db_path) as conn:
+                clusters = [row[0] for row in conn.execute(
+                    "SELECT DISTINCT cluster FROM noticias WHERE status = ? ORDER BY cluster",
+                    (status,))]
+                fontes = [row[0] for row in conn.execute(
+                    "SELECT DISTINCT fonte FROM noticias WHERE status = ? ORDER BY fonte",
+                    (status,))]
+                return {'clusters': clusters, 'fontes': fontes}
+
+        except Exception as e:
+            print(f"[ERRO] Erro ao obter grupos do feed: {e}")
+            return {'clusters': [], 'fontes': []}
+
+    def get_statistics(self) -> Dict[str, Any]:
         """
         Obtém estatísticas do banco principal
 
+        Lê a tabela noticias_resumo_diario (uma linha por dia, cluster e
+        status), cujo tamanho não depende do número de notícias. As janelas
+        de 7 e 30 dias são contadas por dia de seleção.
+
         Returns:
             Dicionário com estatísticas
         """
@@ -647,45 +1221,116 @@ class DatabaseManager:
             with sqlite3.connect(self.main_db_path) as conn:
                 cursor = conn.cursor()
 
-                # Total de notícias
-                cursor.execute("SELECT COUNT(*) FROM noticias")
-                total = cursor.fetchone()[0]
+                cursor.execute("""
+                    SELECT
+                        SUM(quantidade),
+                        SUM(CASE WHEN dia >= date('now', '-7 days') THEN quantidade ELSE 0 END),
+                        SUM(CASE WHEN dia >= date('now', '-30 days') THEN quantidade ELSE 0 END)
+                    FROM noticias_resumo_diario
+                """)
+                total, ultimos_7_dias, ultimos_30_dias = cursor.fetchone()
 
                 # Notícias por cluster
                 cursor.execute("""
-                    SELECT cluster, COUNT(*) 
-                    FROM noticias 
-                    WHERE cluster IS NOT NULL
+                    SELECT cluster, SUM(quantidade)
+                    FROM noticias_resumo_diario
                     GROUP BY cluster
+                    HAVING SUM(quantidade) > 0
                     ORDER BY cluster
                 """)
                 clusters = dict(cursor.fetchall())
 
-                # Notícias dos últimos 7 dias
-                cursor.execute("""
-                    SELECT COUNT(*) FROM noticias 
-                    WHERE data_selecao >= datetime('now', '-7 days')
-                """)
-                ultimos_7_dias = cursor.fetchone()[0]
-
-                # Notícias dos últimos 30 dias
+                # Notícias por status
                 cursor.execute("""
-                    SELECT COUNT(*) FROM noticias 
-                    WHERE data_selecao >= datetime('now', '-30 days')
+                    SELECT status, SUM(quantidade)
+                    FROM noticias_resumo_diario
+                    GROUP BY status
+                    HAVING SUM(quantidade) > 0
+                    ORDER BY status
                 """)
-                ultimos_30_dias = cursor.fetchone()[0]
+                status = dict(cursor.fetchall())
 
                 return {
-                    'total': total,
-                    'ultimos_7_dias': ultimos_7_dias,
-                    'ultimos_30_dias': ultimos_30_dias,
-                    'por_cluster': clusters
+                    'total': total or 0,
+                    'ultimos_7_dias': ultimos_7_dias or 0,
+                    'ultimos_30_dias': ultimos_30_dias or 0,
+                    'por_cluster': clusters,
+                    'por_status': status
                 }
 
         except Exception as e:
             print(f"[ERRO] Erro ao obter estatísticas: {e}")
             return {}
 
+    def save_cluster_interpretations(self, interpretacoes: List[Dict]) -> bool:
+        """
+        Grava a interpretação dos clusters no banco principal
+
+        Clusters sem notícias nesta execução mantêm as representativas
+        anteriores; clusters que deixaram de existir (modelo recriado com
+        menos clusters) são removidos.
+
+        Args:
+            interpretacoes: Um dicionário por cluster com cluster, rotulo,
+                termos, representativas e tamanho
+
+        Returns:
+            True se gravado com sucesso
+        """
+        try:
+            with sqlite3.connect(self.main_db_path) as conn:
+                cursor = conn.cursor()
+
+                cursor.executemany("""
+                    INSERT INTO clusters (cluster, rotulo, termos, representativas, tamanho, atualizado_em)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(cluster) DO UPDATE SET
+                        rotulo = excluded.rotulo,
+                        termos = excluded.termos,
+                        representativas = CASE WHEN excluded.tamanho > 0
+                            THEN excluded.representativas ELSE clusters.representativas END,
+                        tamanho = excluded.tamanho,
+                        atualizado_em = excluded.atualizado_em
+                """, [(item['cluster'], item['rotulo'],
+                       json.dumps(item['termos'], ensure_ascii=False),
+                       json.dumps(item['representativas'], ensure_ascii=False),
+                       item['tamanho']) for item in interpretacoes])
+
+                cursor.execute("DELETE FROM clusters WHERE cluster >= ?",
+                               (len(interpretacoes),))
+
+                self._bump_data_version(cursor)
+                conn.commit()
+                return True
+
+        except Exception as e:
+            print(f"[ERRO] Erro ao gravar interpretação dos clusters: {e}")
+            return False
+
+    def get_cluster_interpretations(self) -> List[Dict]:
+        """
+        Obtém a interpretação gravada de todos os clusters
+
+        Returns:
+            Lista de dicionários (termos e representativas já decodificados)
+        """
+        try:
+            with sqlite3.connect(self.main_db_path) as conn:
+                conn.row_factory = sqlite3.Row
+                rows = conn.execute("""
+                    SELECT cluster, rotulo, termos, representativas, tamanho, atualizado_em
+                    FROM clusters
+                    ORDER BY cluster
+                """).fetchall()
+
+            return [dict(row, termos=json.loads(row['termos']),
+                         representativas=json.loads(row['representativas']))
+                    for row in rows]
+
+        except Exception as e:
+            print(f"[ERRO] Erro ao obter interpretação dos clusters: {e}")
+            return []
+
     def archive_posted_news(self, keep_selected_links: List[str] = None) -> int:
         """
         Arquivar notícias postadas, mas manter como postadas as que foram re-selecionadas
@@ -719,6 +1364,8 @@ class DatabaseManager:
                     """)
 
                 archived_count = cursor.rowcount
+                if archived_count > 0:
+                    self._bump_data_version(cursor)
                 conn.commit()
 
                 if archived_count > 0:
@@ -4,7 +4,7 @@ import Header from './components/Header';
 import Footer from './components/Footer';
 import NewsGrid from './components/NewsGrid';
 import NewsModal from './components/NewsModal';
-import { getNews, getApiStatus } from './services/api';
+import { getNews, getApiStatus, subscribeToFeedUpdates } from './services/api';
 
 function App() {
   const [news, setNews] = useState([]);
@@ -49,6 +49,9 @@ function App() {
     checkApiStatus();
   }, [loadNews, checkApiStatus]);
 
+  // Recarregar as notícias quando o pipeline publicar uma nova seleção
+  useEffect(() => subscribeToFeedUpdates(() => loadNews()), [loadNews]);
+
   const handleNewsClick = useCallback((newsItem) => {
     setSelectedNews(newsItem);
     setIsModalOpen(true);
@@ -141,6 +141,25 @@ export const getNewsById = async (id) => {
   }
 };
 
+// Função para receber avisos de atualização do feed (SSE), sem polling
+export const subscribeToFeedUpdates = (onUpdate) => {
+  if (typeof EventSource === 'undefined') {
+    return () => {};
+  }
+
+  // O EventSource reconecta sozinho e reenvia o último ID (versão dos dados)
+  const source = new EventSource(`${API_BASE_URL}/events`);
+  source.addEventListener('feed-updated', (event) => {
+    try {
+      onUpdate(JSON.parse(event.data));
+    } catch (error) {
+      console.error('Erro ao processar evento do feed:', error);
+    }
+  });
+
+  return () => source.close();
+};
+
 // Função para verificar status da API
 export const getApiStatus = async () => {
   try {
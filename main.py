@@ -6,8 +6,9 @@ Refatorado para usar banco de dados SQLite e cache em memória
 """
 
 from pipeline.selector import selecionar_noticias_estrategicas
-from pipeline.clustering import clusterizar_noticias, interpretar_clusters
-from pipeline.summarizer import sumarizar_textos
+from pipeline.publisher import publicar_snapshots
+from pipeline.clustering import clusterizar_noticias, interpretar_clusters, relatorio_clusterizacao
+from pipeline.deduplicacao import colapsar_duplicatas
 from pipeline.extractor import extrair_textos_noticias
 from pipeline.collectors import coletar_noticias
 from database import initialize_databases, cleanup_auxiliary_database, get_db_manager
@@ -60,10 +61,12 @@ def main(skip_integrity_test: bool = False):
     pipeline_steps = [
         ("Coleta de notícias", _execute_data_collection),
         ("Extração de conteúdo", _execute_text_extraction),
+        ("Detecção de duplicatas", _execute_deduplication),
         ("Sumarização de textos", _execute_summarization),
         ("Clusterização de notícias", _execute_clustering),
         ("Análise de clusters", _execute_cluster_interpretation),
         ("Seleção de 15 notícias", _execute_strategic_selection),
+        ("Publicação de snapshots", _execute_snapshot_publishing),
         ("Limpeza de dados temporários", _execute_cleanup),
     ]
 
@@ -82,6 +85,7 @@ def main(skip_integrity_test: bool = False):
     # Retornar dados finais
     try:
         stats_finais = db_manager.get_statistics()
+        stats_finais['clusterizacao'] = relatorio_clusterizacao()
         api_data = db_manager.get_api_data(limit=15)
 
         # Calcular tempo total
@@ -92,6 +96,10 @@ def main(skip_integrity_test: bool = False):
         print(f"\nPipeline concluído com sucesso!")
         print(f"Tempo total de execução: {minutes}m {seconds}s")
 
+        relatorio = stats_finais['clusterizacao']
+        if relatorio:
+            print(f"Clusters: {relatorio['n_clusters']} ({relatorio['modo']})")
+
         return api_data, stats_finais
     except Exception as e:
         error_handler.handle_error(e, "Relatório final")
@@ -102,10 +110,12 @@ def _initialize_system() -> bool:
     """Inicializa o sistema verificando bancos de dados"""
     if not os.path.exists("noticias.db") or not os.path.exists("noticias_aux.db"):
         print("[INICIANDO] Inicializando bancos de dados...")
-        if not initialize_databases():
-            print("ERRO: Falha na inicialização dos bancos de dados.")
-            return False
-        print("Bancos de dados inicializados")
+
+    # Sempre executado: cria tabelas e índices novos em bancos já existentes
+    if not initialize_databases():
+        print("ERRO: Falha na inicialização dos bancos de dados.")
+        return False
+    print("Bancos de dados inicializados")
     return True
 
 
@@ -136,9 +146,23 @@ def _execute_text_extraction(db_manager, text_cache) -> bool:
         return False
 
 
+def _execute_deduplication(db_manager, text_cache) -> bool:
+    """Executa a detecção de notícias quase duplicadas"""
+    try:
+        colapsar_duplicatas()
+        return True
+    except Exception as e:
+        error_handler.handle_error(e, "Detecção de duplicatas")
+        return True  # Não é crítico: sem ela, todas as notícias são sumarizadas
+
+
 def _execute_summarization(db_manager, text_cache) -> bool:
     """Executa sumarização"""
     try:
+        # Importado só nesta etapa: torch/transformers são pesados e os
+        # processos do pool da escolha de k (spawn) reimportam este módulo
+        from pipeline.summarizer import sumarizar_textos
+
         textos_sumarizados = sumarizar_textos()
         if textos_sumarizados == 0:
             print("ERRO: Falha na sumarização dos textos.")
@@ -185,13 +209,25 @@ def _execute_cluster_interpretation(db_manager, text_cache) -> bool:
 def _execute_strategic_selection(db_manager, text_cache) -> bool:
     """Executa seleção estratégica"""
     try:
-        selecionar_noticias_estrategicas(top_n=15)
+        # Vetorizador da clusterização: usado para diversificar a seleção (MMR)
+        kmeans, vectorizer = text_cache.get_models()
+        selecionar_noticias_estrategicas(top_n=15, vectorizer=vectorizer)
         return True
     except Exception as e:
         error_handler.handle_error(e, "Seleção estratégica")
         return True  # Não é crítico
 
 
+def _execute_snapshot_publishing(db_manager, text_cache) -> bool:
+    """Executa publicação dos snapshots estáticos do feed"""
+    try:
+        publicar_snapshots()
+        return True
+    except Exception as e:
+        error_handler.handle_error(e, "Publicação de snapshots")
+        return True  # Não é crítico
+
+
 def _execute_cleanup(db_manager, text_cache) -> bool:
     """Executa limpeza do banco auxiliar"""
     try:
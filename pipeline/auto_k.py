@@ -0,0 +1,183 @@
+# ESCOLHA AUTOMÁTICA DO NÚMERO DE CLUSTERS
+"""
+Módulo responsável por escolher o número de clusters (k) a partir dos
+próprios resumos, em vez de um valor fixo.
+
+Cada k do intervalo configurado é ajustado com MiniBatchKMeans e avaliado
+por silhouette (maior é melhor) ou Davies-Bouldin (menor é melhor) sobre
+uma amostra da matriz TF-IDF. Os valores de k são avaliados em paralelo,
+em um pool de processos, dentro de um orçamento de tempo: o que não
+terminar no prazo é descartado e o pool é encerrado.
+"""
+
+import multiprocessing
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.metrics import pairwise_distances, silhouette_score
+
+
+METRICAS = ('silhouette', 'davies_bouldin')
+
+
+def _avaliar_k(X: sparse.csr_matrix, k: int, metrica: str, tamanho_amostra: int,
+               n_init: int, random_state: int) -> Tuple[int, float]:
+    """
+    Ajusta o K-Means com k clusters e calcula a métrica sobre uma amostra
+
+    Função de módulo para poder ser executada nos processos do pool.
+
+    Returns:
+        Tupla (k, valor da métrica)
+    """
+    rotulos = MiniBatchKMeans(n_clusters=k, n_init=n_init,
+                              random_state=random_state).fit_predict(X)
+
+    rng = np.random.RandomState(random_state)
+    if X.shape[0] > tamanho_amostra:
+        amostra = rng.choice(X.shape[0], tamanho_amostra, replace=False)
+        X, rotulos = X[amostra], rotulos[amostra]
+
+    if len(np.unique(rotulos)) < 2:
+        # Amostra degenerada: pior valor possível
+        return k, (-1.0 if metrica == 'silhouette' else float('inf'))
+
+    if metrica == 'silhouette':
+        return k, float(silhouette_score(X, rotulos, random_state=random_state))
+
+    return k, davies_bouldin_esparso(X, rotulos)
+
+
+def davies_bouldin_esparso(X: sparse.csr_matrix, rotulos: np.ndarray) -> float:
+    """
+    Índice de Davies-Bouldin sem densificar a matriz de documentos
+
+    Mesmo resultado de sklearn.metrics.davies_bouldin_score, que exige uma
+    matriz densa (inviável com as colunas do vetorizador por hashing).
+    Apenas os centróides (n_clusters x n_termos) são densos.
+
+    Args:
+        X: Matriz TF-IDF esparsa
+        rotulos: Cluster de cada linha
+
+    Returns:
+        Valor do índice (menor é melhor)
+    """
+    _, grupos = np.unique(rotulos, return_inverse=True)
+    n_grupos = grupos.max() + 1
+    contagens = np.bincount(grupos)
+
+    # Centróides: média das linhas de cada grupo (matriz indicadora x X)
+    indicadora = sparse.csr_matrix(
+        (1.0 / contagens[grupos], (grupos, np.arange(X.shape[0]))),
+        shape=(n_grupos, X.shape[0]))
+    centros = np.asarray((indicadora @ X).todense())
+
+    # Distância média ao centróide: ||x - c||² = ||x||² - 2 x·c + ||c||²
+    normas = np.asarray(X.multiply(X).sum(axis=1)).ravel()
+    produtos = np.asarray(X @ centros.T)[np.arange(X.shape[0]), grupos]
+    distancias = np.sqrt(np.maximum(
+        normas - 2 * produtos + (centros ** 2).sum(axis=1)[grupos], 0.0))
+    dispersao = np.bincount(grupos, weights=distancias) / contagens
+
+    distancias_centros = pairwise_distances(centros)
+    if np.allclose(dispersao, 0) or np.allclose(distancias_centros, 0):
+        return 0.0
+
+    distancias_centros[distancias_centros == 0] = np.inf
+    razoes = (dispersao[:, None] + dispersao[None, :]) / distancias_centros
+    return float(np.mean(np.max(razoes, axis=1)))
+
+
+def escolher_k(X: sparse.spmatrix, k_min: int, k_max: int, metrica: str = 'silhouette',
+               tamanho_amostra: int = 1000, orcamento_segundos: float = 60.0,
+               workers: Optional[int] = None, n_init: int = 3,
+               random_state: int = 42, k_padrao: int = 5) -> Dict:
+    """
+    Escolhe o número de clusters avaliando um intervalo de k
+
+    Args:
+        X: Matriz TF-IDF (n_documentos, n_termos)
+        k_min: Menor k avaliado
+        k_max: Maior k avaliado (limitado a n_documentos - 1)
+        metrica: 'silhouette' ou 'davies_bouldin'
+        tamanho_amostra: Documentos usados no cálculo da métrica
+        orcamento_segundos: Tempo máximo da avaliação
+        workers: Processos do pool (None: número de CPUs; 1: sem pool)
+        n_init: Inicializações do K-Means por k
+        random_state: Semente dos ajustes e da amostragem
+        k_padrao: k usado quando nenhum valor pôde ser avaliado
+
+    Returns:
+        Dicionário com k escolhido, métrica, scores por k, ks não avaliados
+        no prazo e duração
+    """
+    if metrica not in METRICAS:
+        raise ValueError(f"Métrica desconhecida: {metrica}")
+
+    X = sparse.csr_matrix(X)
+    k_max = min(k_max, X.shape[0] - 1)
+    candidatos = list(range(max(k_min, 2), k_max + 1))
+
+    inicio = time.monotonic()
+    scores: Dict[int, float] = {}
+    if candidatos:
+        argumentos = [(X, k, metrica, tamanho_amostra, n_init, random_state)
+                      for k in candidatos]
+        workers = min(workers or os.cpu_count() or 1, len(candidatos))
+        if workers > 1:
+            scores = _avaliar_em_pool(argumentos, workers, inicio + orcamento_segundos)
+        else:
+            scores = _avaliar_em_serie(argumentos, inicio + orcamento_segundos)
+
+    if scores:
+        melhor = max if metrica == 'silhouette' else min
+        k = melhor(scores, key=lambda k: (scores[k], -k))
+    else:
+        k = max(2, min(k_padrao, X.shape[0]))
+
+    return {
+        'k': int(k),
+        'metrica': metrica,
+        'scores': {int(k): round(v, 4) for k, v in sorted(scores.items())},
+        'nao_avaliados': [k for k in candidatos if k not in scores],
+        'automatico': bool(scores),
+        'duracao_segundos': round(time.monotonic() - inicio, 2)
+    }
+
+
+def _avaliar_em_serie(argumentos: List[tuple], prazo: float) -> Dict[int, float]:
+    """Avalia os k em ordem no próprio processo até o prazo"""
+    scores = {}
+    for args in argumentos:
+        if time.monotonic() >= prazo:
+            break
+        k, valor = _avaliar_k(*args)
+        scores[k] = valor
+    return scores
+
+
+def _avaliar_em_pool(argumentos: List[tuple], workers: int, prazo: float) -> Dict[int, float]:
+    """Avalia os k em paralelo e descarta o que não terminar até o prazo"""
+    scores = {}
+
+    # spawn: o processo do pipeline já carregou torch/BLAS com threads, e
+    # fork nesse estado pode travar os filhos
+    contexto = multiprocessing.get_context('spawn')
+    with contexto.Pool(processes=workers) as pool:
+        pendentes = [pool.apply_async(_avaliar_k, args) for args in argumentos]
+
+        for resultado in pendentes:
+            restante = prazo - time.monotonic()
+            try:
+                k, valor = resultado.get(timeout=max(restante, 0.01))
+            except multiprocessing.TimeoutError:
+                continue
+            scores[k] = valor
+        # Sair do with encerra (terminate) os processos ainda em execução
+
+    return scores
@@ -2,36 +2,240 @@
 """
 Módulo responsável pela vetorização e clusterização das notícias
 Refatorado para usar banco auxiliar
+
+O vetorizador e os centróides são persistidos em disco entre execuções
+(CLUSTERING_CONFIG['model_path']). A primeira execução ajusta o vocabulário
+e o MiniBatchKMeans; as seguintes apenas vetorizam os resumos novos e
+atualizam os centróides com partial_fit, de modo que o cluster N continua
+sendo o mesmo assunto de uma execução para a outra.
+
+Com CLUSTERING_CONFIG['n_clusters'] = 'auto', o número de clusters é
+escolhido (pipeline.auto_k) quando o modelo é criado e mantido nas
+execuções seguintes.
+
+Com CLUSTERING_CONFIG['vetorizador'] = 'hashing' (cargas retroativas com
+centenas de milhares de resumos), os resumos são lidos do SQLite em lotes e
+vetorizados por hashing com IDF incremental: a memória usada na
+clusterização e na interpretação dos clusters depende do tamanho do lote,
+não do corpus. A seleção (pipeline.selector) continua carregando todas as
+notícias candidatas em memória.
 """
 
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import joblib
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
-import nltk
-from nltk.corpus import stopwords
+from sklearn.cluster import MiniBatchKMeans
 import numpy as np
-from config.config import CLUSTERING_CONFIG
+from config.config import CLUSTERING_CONFIG, MAPA_ROTULOS
+from config.stopwords import STOPWORDS_VERSAO, get_stopwords_lista
 from database import get_db_manager
+from pipeline.auto_k import escolher_k
+from pipeline.vetorizador_hashing import VetorizadorHashing
 
 
 def preparar_stopwords():
-    """Baixa e prepara as stopwords em português"""
+    """Obtém as stopwords em português distribuídas com o projeto (sem download)"""
+    return get_stopwords_lista()
+
+
+def _assinatura_modelo() -> Dict:
+    """Parâmetros que, se alterados, invalidam o modelo persistido"""
+    assinatura = {
+        'n_clusters': CLUSTERING_CONFIG['n_clusters'],
+        'max_features': CLUSTERING_CONFIG['max_features'],
+        'ngram_range': (1, 2),
+        # Os vetorizadores guardam a lista de stopwords com que foram criados
+        'stopwords_versao': STOPWORDS_VERSAO
+    }
+    if CLUSTERING_CONFIG['vetorizador'] == 'hashing':
+        assinatura['vetorizador'] = 'hashing'
+        assinatura['max_features'] = CLUSTERING_CONFIG['n_features_hash']
+    return assinatura
+
+
+def carregar_modelo(caminho: Optional[str] = None) -> Optional[Dict]:
+    """
+    Carrega o modelo de clusterização persistido
+
+    Os arrays (idf, centróides) são mapeados em memória em modo
+    copy-on-write: a carga não copia os dados e as atualizações do
+    partial_fit não alteram o arquivo até o modelo ser salvo.
+
+    Args:
+        caminho: Arquivo do modelo (padrão: CLUSTERING_CONFIG['model_path'])
+
+    Returns:
+        Dicionário com vectorizer, kmeans e metadados, ou None se não houver
+        modelo compatível com a configuração atual
+    """
+    caminho = caminho or CLUSTERING_CONFIG['model_path']
+    if not os.path.exists(caminho):
+        return None
+
     try:
-        nltk.data.find('corpora/stopwords')
-    except LookupError:
-        nltk.download('stopwords')
+        modelo = joblib.load(caminho, mmap_mode='c')
+    except Exception as e:
+        print(f"[AVISO] Modelo de clusterização ilegível, será recriado: {e}")
+        return None
+
+    if modelo.get('assinatura') != _assinatura_modelo():
+        print("[AVISO] Configuração de clusterização alterada: o modelo será recriado "
+              "e os números de cluster podem mudar")
+        return None
+
+    return modelo
+
+
+def salvar_modelo(modelo: Dict, caminho: Optional[str] = None) -> bool:
+    """
+    Grava o modelo de clusterização de forma atômica
+
+    O dump é feito sem compressão, para que possa ser mapeado em memória
+    na próxima carga.
+
+    Args:
+        modelo: Dicionário com vectorizer, kmeans e metadados
+        caminho: Arquivo do modelo (padrão: CLUSTERING_CONFIG['model_path'])
+
+    Returns:
+        True se gravado com sucesso
+    """
+    caminho = caminho or CLUSTERING_CONFIG['model_path']
+    diretorio = os.path.dirname(caminho) or '.'
+
+    try:
+        os.makedirs(diretorio, exist_ok=True)
+        fd, temporario = tempfile.mkstemp(dir=diretorio, suffix='.tmp')
+        os.close(fd)
+        try:
+            joblib.dump(modelo, temporario)
+            os.replace(temporario, caminho)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+        return True
+
+    except Exception as e:
+        print(f"[ERRO] Falha ao salvar o modelo de clusterização: {e}")
+        return False
 
-    return stopwords.words('portuguese')
+
+def _criar_modelo(resumos, portuguese_stopwords) -> Dict:
+    """Ajusta vetorizador e centróides iniciais a partir dos resumos"""
+    vectorizer = TfidfVectorizer(
+        max_features=CLUSTERING_CONFIG['max_features'],
+        stop_words=portuguese_stopwords,
+        ngram_range=(1, 2)  # Adicionar bigramas para melhor clustering
+    )
+    X = vectorizer.fit_transform(resumos)
+
+    kmeans, selecao_k = _novo_kmeans(X)
+    kmeans.fit(X)
+
+    return _novo_modelo(vectorizer, kmeans, selecao_k, X.shape[0])
+
+
+def _novo_kmeans(X) -> Tuple[MiniBatchKMeans, Optional[Dict]]:
+    """
+    Cria o MiniBatchKMeans (ainda não ajustado) de um modelo novo
+
+    Args:
+        X: Matriz TF-IDF usada na escolha automática de k
+
+    Returns:
+        Tupla (kmeans, avaliação de k ou None se n_clusters é fixo)
+    """
+    selecao_k = None
+    n_clusters = CLUSTERING_CONFIG['n_clusters']
+    if n_clusters == 'auto':
+        k_min, k_max = CLUSTERING_CONFIG['k_range']
+        selecao_k = escolher_k(
+            X, k_min, k_max,
+            metrica=CLUSTERING_CONFIG['k_metrica'],
+            tamanho_amostra=CLUSTERING_CONFIG['k_amostra'],
+            orcamento_segundos=CLUSTERING_CONFIG['k_orcamento_segundos'],
+            workers=CLUSTERING_CONFIG['k_workers'],
+            random_state=CLUSTERING_CONFIG['random_state'],
+            k_padrao=CLUSTERING_CONFIG['k_padrao'])
+        n_clusters = selecao_k['k']
+
+        scores = ', '.join(f"k={k}: {v}" for k, v in selecao_k['scores'].items())
+        print(f"[INFO] k escolhido: {selecao_k['k']} ({selecao_k['metrica']}; "
+              f"{scores or 'nenhum k avaliado a tempo'}) "
+              f"em {selecao_k['duracao_segundos']}s")
+        if not selecao_k['automatico']:
+            print(f"[AVISO] Nenhum k avaliado em {CLUSTERING_CONFIG['k_orcamento_segundos']}s: "
+                  f"usando k_padrao={n_clusters} (aumente k_orcamento_segundos "
+                  f"ou reduza k_workers)")
+
+    kmeans = MiniBatchKMeans(
+        n_clusters=n_clusters,
+        random_state=CLUSTERING_CONFIG['random_state'],
+        n_init=CLUSTERING_CONFIG['n_init']
+    )
+    return kmeans, selecao_k
+
+
+def _novo_modelo(vectorizer, kmeans, selecao_k: Optional[Dict], documentos: int) -> Dict:
+    """Monta o dicionário persistido do modelo de clusterização"""
+    return {
+        'assinatura': _assinatura_modelo(),
+        'vectorizer': vectorizer,
+        'kmeans': kmeans,
+        'selecao_k': selecao_k,
+        'documentos': documentos,
+        'criado_em': datetime.now().isoformat(),
+        'atualizado_em': datetime.now().isoformat()
+    }
+
+
+# Resumo da última clusterização (para o relatório da execução)
+_relatorio: Optional[Dict] = None
+
+
+def relatorio_clusterizacao() -> Optional[Dict]:
+    """
+    Obtém o resumo da última clusterização desta execução
+
+    Returns:
+        Dicionário com número de clusters, modo (auto/fixo), avaliação de k
+        que o definiu e documentos acumulados no modelo, ou None
+    """
+    return _relatorio
+
+
+def _registrar_relatorio(modelo: Dict) -> None:
+    """Guarda o resumo do modelo usado nesta execução"""
+    global _relatorio
+    _relatorio = {
+        'n_clusters': int(modelo['kmeans'].n_clusters),
+        'modo': 'auto' if CLUSTERING_CONFIG['n_clusters'] == 'auto' else 'fixo',
+        'vetorizador': CLUSTERING_CONFIG['vetorizador'],
+        'selecao_k': modelo.get('selecao_k'),
+        'documentos': modelo['documentos'],
+        'modelo_criado_em': modelo['criado_em']
+    }
 
 
 def clusterizar_noticias():
     """
     Realiza a vetorização e clusterização das notícias do banco auxiliar
-    Versão otimizada com melhor tratamento de erros
+
+    Sem modelo persistido, ajusta vocabulário e centróides do zero; com
+    ele, usa o vocabulário existente e atualiza os centróides apenas com
+    os resumos desta execução (partial_fit), mantendo os números de cluster.
 
     Returns:
         tuple: (kmeans, vectorizer, noticias_processadas)
     """
+    if CLUSTERING_CONFIG['vetorizador'] == 'hashing':
+        return clusterizar_em_lotes()
+
     db_manager = get_db_manager()
     noticias = db_manager.get_news_for_clustering()
 
@@ -41,26 +245,27 @@ def clusterizar_noticias():
 
     try:
         # Preparar dados
-        portuguese_stopwords = preparar_stopwords()
         resumos = [noticia['resumo'] for noticia in noticias]
+        modelo = carregar_modelo()
 
-        # Vetorização TF-IDF otimizada
-        vectorizer = TfidfVectorizer(
-            max_features=CLUSTERING_CONFIG['max_features'],
-            stop_words=portuguese_stopwords,
-            ngram_range=(1, 2)  # Adicionar bigramas para melhor clustering
-        )
-        X = vectorizer.fit_transform(resumos)
-
-        # Clusterização K-Means otimizada
-        kmeans = KMeans(
-            n_clusters=CLUSTERING_CONFIG['n_clusters'],
-            random_state=CLUSTERING_CONFIG['random_state'],
-            n_init=CLUSTERING_CONFIG['n_init'],
-            max_iter=300  # Aumentar iterações para melhor convergência
-        )
+        if modelo is None:
+            # Primeira execução (ou configuração alterada): ajustar do zero
+            modelo = _criar_modelo(resumos, preparar_stopwords())
+            X = modelo['vectorizer'].transform(resumos)
+            print(f"[INFO] Modelo de clusterização criado com {X.shape[0]} resumos")
+        else:
+            # Vocabulário fixo: só os centróides se movem com os resumos novos
+            X = modelo['vectorizer'].transform(resumos)
+            modelo['kmeans'].partial_fit(X)
+            modelo['documentos'] += X.shape[0]
+            modelo['atualizado_em'] = datetime.now().isoformat()
+            print(f"[INFO] Modelo de clusterização atualizado com {X.shape[0]} resumos "
+                  f"({modelo['documentos']} no total)")
 
-        clusters = kmeans.fit_predict(X)
+        kmeans, vectorizer = modelo['kmeans'], modelo['vectorizer']
+        clusters = kmeans.predict(X)
+        salvar_modelo(modelo)
+        _registrar_relatorio(modelo)
 
         # Atualizar clusters em batch para melhor performance
         clusters_salvos = _update_clusters_batch(
@@ -73,25 +278,163 @@ def clusterizar_noticias():
         return None, None, []
 
 
+def clusterizar_em_lotes(tamanho_lote: Optional[int] = None):
+    """
+    Clusteriza as notícias do banco auxiliar em lotes, com memória limitada
+
+    Primeira passada: cada lote atualiza o IDF do vetorizador por hashing
+    e os centróides (partial_fit). Segunda passada: cada lote é vetorizado
+    com o modelo final e seus clusters são gravados em uma transação. Em
+    nenhum momento há mais de um lote de resumos em memória.
+
+    Args:
+        tamanho_lote: Resumos por lote (padrão: CLUSTERING_CONFIG['tamanho_lote'])
+
+    Returns:
+        tuple: (kmeans, vectorizer, []) — as notícias não são mantidas em memória
+    """
+    db_manager = get_db_manager()
+    tamanho_lote = tamanho_lote or CLUSTERING_CONFIG['tamanho_lote']
+
+    try:
+        modelo = carregar_modelo()
+        novos = 0
+
+        # Passada 1: IDF incremental e centróides
+        for lote in db_manager.iter_news_for_clustering(tamanho_lote):
+            resumos = [resumo for _, resumo in lote]
+
+            if modelo is None:
+                vectorizer = VetorizadorHashing(
+                    n_features=CLUSTERING_CONFIG['n_features_hash'],
+                    stop_words=preparar_stopwords(),
+                    ngram_range=(1, 2))
+                X = vectorizer.partial_fit_transform(resumos)
+                kmeans, selecao_k = _novo_kmeans(X)
+                modelo = _novo_modelo(vectorizer, kmeans, selecao_k, 0)
+            else:
+                X = modelo['vectorizer'].partial_fit_transform(resumos)
+
+            modelo['kmeans'].partial_fit(X)
+            modelo['documentos'] += len(lote)
+            novos += len(lote)
+
+        if not novos:
+            print("ERRO: Nenhuma notícia com resumo válido encontrada.")
+            return None, None, []
+
+        modelo['atualizado_em'] = datetime.now().isoformat()
+        salvar_modelo(modelo)
+        kmeans, vectorizer = modelo['kmeans'], modelo['vectorizer']
+
+        # Passada 2: atribuição dos clusters com o modelo final
+        clusters_salvos = 0
+        for lote in db_manager.iter_news_for_clustering(tamanho_lote):
+            clusters = kmeans.predict(vectorizer.transform([resumo for _, resumo in lote]))
+            clusters_salvos += db_manager.update_clusters_batch(
+                [(int(cluster), news_id) for cluster, (news_id, _) in zip(clusters, lote)])
+
+        print(f"[INFO] {clusters_salvos} de {novos} resumos clusterizados em lotes de "
+              f"{tamanho_lote} ({modelo['documentos']} no modelo)")
+        _registrar_relatorio(modelo)
+
+        return kmeans, vectorizer, []
+
+    except Exception as e:
+        print(f"[ERRO] Falha na clusterização em lotes: {e}")
+        return None, None, []
+
+
 def _update_clusters_batch(db_manager, noticias, clusters):
     """Atualiza clusters em batch para melhor performance"""
-    clusters_salvos = 0
-    for i, noticia in enumerate(noticias):
-        if db_manager.update_news_with_cluster(noticia['link'], int(clusters[i])):
-            clusters_salvos += 1
-    return clusters_salvos
+    return db_manager.update_clusters_batch(
+        [(int(cluster), noticia['id']) for noticia, cluster in zip(noticias, clusters)])
+
+
+def termos_principais(centros: np.ndarray, termos: np.ndarray, quantidade: int) -> List[List[Dict]]:
+    """
+    Obtém os termos de maior peso de cada centróide
+
+    Usa argpartition em todas as linhas de uma vez (seleção parcial, sem
+    ordenar o vocabulário inteiro) e ordena apenas os termos escolhidos.
+
+    Args:
+        centros: Centróides (n_clusters, n_termos)
+        termos: Termos do vocabulário, na ordem das colunas
+        quantidade: Termos por cluster
+
+    Returns:
+        Para cada cluster, lista de {'termo', 'peso'} em ordem decrescente
+    """
+    quantidade = min(quantidade, centros.shape[1])
+    if quantidade <= 0:
+        return [[] for _ in range(centros.shape[0])]
+
+    indices = np.argpartition(centros, -quantidade, axis=1)[:, -quantidade:]
+    pesos = np.take_along_axis(centros, indices, axis=1)
+    ordem = np.argsort(-pesos, axis=1)
+    indices = np.take_along_axis(indices, ordem, axis=1)
+    pesos = np.take_along_axis(pesos, ordem, axis=1)
+
+    return [
+        [{'termo': str(termos[j]), 'peso': round(float(peso), 4)}
+         for j, peso in zip(linha_indices, linha_pesos) if peso > 0 and termos[j]]
+        for linha_indices, linha_pesos in zip(indices, pesos)
+    ]
+
+
+def noticias_representativas(X, rotulos: np.ndarray, centros: np.ndarray,
+                             quantidade: int) -> List[List[Tuple[int, float]]]:
+    """
+    Obtém as notícias mais próximas do centróide de seu cluster
+
+    A distância ||x - c||² = ||x||² - 2 x·c + ||c||² é calculada para
+    todas as notícias com um único produto X @ centros.T.
+
+    Args:
+        X: Matriz TF-IDF das notícias (n_noticias, n_termos)
+        rotulos: Cluster de cada notícia
+        centros: Centróides (n_clusters, n_termos)
+        quantidade: Notícias por cluster
+
+    Returns:
+        Para cada cluster, lista de (índice da notícia, distância) em ordem
+        crescente de distância
+    """
+    rotulos = np.asarray(rotulos, dtype=np.int64)
+    n_clusters = centros.shape[0]
+    if X.shape[0] == 0:
+        return [[] for _ in range(n_clusters)]
+
+    normas = np.asarray(X.multiply(X).sum(axis=1)).ravel()
+    produtos = np.asarray(X @ centros.T)[np.arange(X.shape[0]), rotulos]
+    distancias = np.sqrt(np.maximum(
+        normas - 2 * produtos + (centros ** 2).sum(axis=1)[rotulos], 0.0))
+
+    # Ordenar por cluster e, dentro dele, por distância
+    ordem = np.lexsort((distancias, rotulos))
+    inicios = np.searchsorted(rotulos[ordem], np.arange(n_clusters + 1))
+
+    return [
+        [(int(i), float(distancias[i])) for i in ordem[inicios[c]:inicios[c + 1]][:quantidade]]
+        for c in range(n_clusters)
+    ]
 
 
 def interpretar_clusters(kmeans, vectorizer):
     """
-    Interpreta e analisa os clusters formados
+    Interpreta os clusters formados e grava o resultado no banco principal
+
+    Para cada cluster: termos de maior peso no centróide, notícias desta
+    execução mais próximas do centróide e rótulo (MAPA_ROTULOS, se houver,
+    ou os três primeiros termos). A API lê a tabela clusters sem recalcular.
 
     Args:
         kmeans: Modelo K-Means treinado
         vectorizer: Vetorizador TF-IDF treinado
 
     Returns:
-        Lista de notícias com interpretação dos clusters
+        Lista com a interpretação de cada cluster
     """
     if kmeans is None or vectorizer is None:
         print("ERRO: Modelos de clusterização não encontrados.")
@@ -99,5 +442,88 @@ def interpretar_clusters(kmeans, vectorizer):
 
     # Obter instância do gerenciador unificado
     db_manager = get_db_manager()
+    centros = np.asarray(kmeans.cluster_centers_, dtype=np.float64)
+
+    if isinstance(vectorizer, VetorizadorHashing):
+        termos, representativas, tamanhos = _interpretar_em_lotes(
+            db_manager, vectorizer, centros)
+    else:
+        noticias = db_manager.get_news_for_selection()
+        resumos = [noticia['resumo'] for noticia in noticias]
+        termos = termos_principais(
+            centros, vectorizer.get_feature_names_out(), CLUSTERING_CONFIG['top_termos'])
+
+        rotulos = np.array([noticia['cluster'] for noticia in noticias], dtype=np.int64)
+        proximas = noticias_representativas(
+            vectorizer.transform(resumos), rotulos, centros, CLUSTERING_CONFIG['representativas'])
+        representativas = [
+            [{'titulo': noticias[i]['titulo'], 'link': noticias[i]['link'],
+              'distancia': round(distancia, 4)} for i, distancia in cluster]
+            for cluster in proximas
+        ]
+        tamanhos = np.bincount(rotulos, minlength=len(centros))
+
+    interpretacoes = []
+    for cluster in range(len(centros)):
+        rotulo = MAPA_ROTULOS.get(cluster) or \
+            ', '.join(item['termo'] for item in termos[cluster][:3]) or f"Cluster {cluster}"
+        interpretacoes.append({
+            'cluster': cluster,
+            'rotulo': rotulo,
+            'termos': termos[cluster],
+            'representativas': representativas[cluster],
+            'tamanho': int(tamanhos[cluster])
+        })
+        print(f"  Cluster {cluster} ({tamanhos[cluster]} notícias): {rotulo}")
+
+    db_manager.save_cluster_interpretations(interpretacoes)
+    return interpretacoes
+
+
+def _interpretar_em_lotes(db_manager, vectorizer: VetorizadorHashing, centros: np.ndarray,
+                          tamanho_lote: Optional[int] = None) -> Tuple[List, List, np.ndarray]:
+    """
+    Interpreta os clusters percorrendo as notícias em lotes (modo 'hashing')
+
+    Mantém apenas as N notícias mais próximas de cada centróide entre os
+    lotes e os resumos da amostra usada para nomear as colunas
+    (CLUSTERING_CONFIG['amostra_termos']).
+
+    Returns:
+        Tupla (termos por cluster, representativas por cluster, tamanhos)
+    """
+    tamanho_lote = tamanho_lote or CLUSTERING_CONFIG['tamanho_lote']
+    quantidade = CLUSTERING_CONFIG['representativas']
+    limite_amostra = CLUSTERING_CONFIG['amostra_termos']
+
+    n_clusters = centros.shape[0]
+    tamanhos = np.zeros(n_clusters, dtype=np.int64)
+    melhores: List[List[Tuple[float, str, str]]] = [[] for _ in range(n_clusters)]
+    amostra: List[str] = []
+
+    for lote in db_manager.iter_clustered_news(tamanho_lote):
+        resumos = [resumo for _, _, _, resumo, _ in lote]
+        rotulos = np.array([cluster for *_, cluster in lote], dtype=np.int64)
+        tamanhos += np.bincount(rotulos, minlength=n_clusters)[:n_clusters]
+
+        if len(amostra) < limite_amostra:
+            amostra.extend(resumos[:limite_amostra - len(amostra)])
+
+        proximas = noticias_representativas(
+            vectorizer.transform(resumos), rotulos, centros, quantidade)
+        for cluster, candidatas in enumerate(proximas):
+            # Top-N acumulado: as N melhores do lote disputam com as anteriores
+            melhores[cluster] = sorted(
+                melhores[cluster] + [(distancia, lote[i][1], lote[i][2])
+                                     for i, distancia in candidatas])[:quantidade]
+
+    # Sem vocabulário: nomes das colunas vêm da amostra de resumos
+    termos = termos_principais(
+        centros, vectorizer.nomes_termos(amostra), CLUSTERING_CONFIG['top_termos'])
+    representativas = [
+        [{'titulo': titulo, 'link': link, 'distancia': round(distancia, 4)}
+         for distancia, titulo, link in cluster]
+        for cluster in melhores
+    ]
 
-    return db_manager.get_news_for_selection()
+    return termos, representativas, tamanhos
@@ -5,6 +5,7 @@ Refatorado para usar banco de dados SQLite e cache em memória
 """
 
 from .scrapers import scrape_mundo_do_marketing, scrape_meio_e_mensagem, scrape_exame, scrape_gkpb
+from .scraper_utils import parse_publication_date
 from database import get_db_manager
 from database.text_cache import get_text_cache
 
@@ -36,7 +37,8 @@ def coletar_noticias():
             titulo=noticia['titulo'],
             link=noticia['link'],
             imagem=noticia.get('foto'),
-            fonte=noticia.get('fonte', 'Desconhecida')
+            fonte=noticia.get('fonte', 'Desconhecida'),
+            data_publicacao=parse_publication_date(noticia.get('data'))
         )
 
         if success:
@@ -0,0 +1,202 @@
+# DETECÇÃO DE NOTÍCIAS QUASE DUPLICADAS (MINHASH + LSH)
+"""
+Módulo responsável por encontrar notícias que cobrem o mesmo fato em mais
+de uma fonte, antes da sumarização.
+
+Cada texto extraído vira um conjunto de shingles (sequências de palavras)
+resumido por uma assinatura MinHash: a fração de posições iguais entre
+duas assinaturas estima a similaridade de Jaccard dos textos. O LSH por
+bandas agrupa as assinaturas em buckets, de modo que só os pares que
+caem no mesmo bucket em alguma banda são comparados (sem percorrer todos
+os pares). Os pares confirmados ligam os textos em componentes
+(union-find); cada componente é dividido em grupos em torno de notícias
+canônicas, e só saem do cache de textos (sem sumarização) as notícias
+semelhantes à canônica do seu grupo.
+"""
+
+import re
+import zlib
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from config.config import DEDUP_CONFIG
+from database import get_db_manager
+from database.text_cache import get_text_cache
+
+
+# Primo maior que 2^32 para as permutações (a * x + b) mod p
+_PRIMO = np.uint64(4294967311)
+_PALAVRA = re.compile(r'\w+')
+
+
+def shingles(texto: str, tamanho: int = 3) -> np.ndarray:
+    """
+    Obtém os shingles de palavras de um texto, como hashes de 32 bits
+
+    Args:
+        texto: Texto da notícia
+        tamanho: Palavras por shingle
+
+    Returns:
+        Array (uint64) com os hashes distintos dos shingles
+    """
+    palavras = _PALAVRA.findall(texto.lower())
+    if not palavras:
+        return np.empty(0, dtype=np.uint64)
+
+    sequencias = [' '.join(palavras[i:i + tamanho])
+                  for i in range(max(len(palavras) - tamanho + 1, 1))]
+    return np.unique(np.fromiter(
+        (zlib.crc32(sequencia.encode('utf-8')) for sequencia in sequencias),
+        dtype=np.uint64, count=len(sequencias)))
+
+
+def assinaturas_minhash(conjuntos: Sequence[np.ndarray], permutacoes: int = 128,
+                        seed: int = 42) -> np.ndarray:
+    """
+    Calcula a assinatura MinHash de cada conjunto de shingles
+
+    Args:
+        conjuntos: Hashes dos shingles de cada texto
+        permutacoes: Tamanho da assinatura
+        seed: Semente das permutações (fixa: assinaturas comparáveis entre execuções)
+
+    Returns:
+        Matriz (n_textos, permutacoes); conjuntos vazios ficam com o valor máximo
+    """
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, 2 ** 32, size=permutacoes, dtype=np.uint64)[:, None]
+    b = rng.randint(0, 2 ** 32, size=permutacoes, dtype=np.uint64)[:, None]
+
+    assinaturas = np.full((len(conjuntos), permutacoes), _PRIMO, dtype=np.uint64)
+    for i, conjunto in enumerate(conjuntos):
+        if len(conjunto):
+            # a < 2^32 e x < 2^32: a * x + b não estoura 64 bits
+            assinaturas[i] = ((a * conjunto[None, :] + b) % _PRIMO).min(axis=1)
+
+    return assinaturas
+
+
+def pares_candidatos(assinaturas: np.ndarray, bandas: int) -> Set[Tuple[int, int]]:
+    """
+    Encontra pares candidatos por LSH: assinaturas iguais em alguma banda
+
+    Args:
+        assinaturas: Matriz (n_textos, permutacoes)
+        bandas: Número de bandas (permutacoes deve ser múltiplo)
+
+    Returns:
+        Conjunto de pares (i, j) com i < j
+    """
+    linhas = assinaturas.shape[1] // bandas
+    pares: Set[Tuple[int, int]] = set()
+
+    for banda in range(bandas):
+        trecho = assinaturas[:, banda * linhas:(banda + 1) * linhas]
+        _, buckets = np.unique(trecho, axis=0, return_inverse=True)
+        buckets = buckets.ravel()
+
+        ordem = np.argsort(buckets, kind='stable')
+        limites = np.flatnonzero(np.diff(buckets[ordem])) + 1
+        for grupo in np.split(ordem, limites):
+            if len(grupo) > 1:
+                pares.update(combinations(sorted(grupo.tolist()), 2))
+
+    return pares
+
+
+def _raiz(pais: List[int], i: int) -> int:
+    """Raiz do conjunto de i no union-find (com compressão de caminho)"""
+    while pais[i] != i:
+        pais[i] = pais[pais[i]]
+        i = pais[i]
+    return i
+
+
+def detectar_duplicatas(textos: Sequence[str], config: Optional[Dict] = None) -> List[Dict]:
+    """
+    Agrupa textos quase duplicados e escolhe a notícia canônica de cada grupo
+
+    A canônica é o texto mais longo do componente (extração mais completa)
+    e só entram no seu grupo os textos com similaridade estimada a ela de
+    pelo menos config['limiar']. A ligação entre pares é transitiva (A~B~C~D),
+    então os demais voltam a disputar entre si uma nova canônica.
+
+    Args:
+        textos: Textos extraídos
+        config: Configuração da detecção (padrão: DEDUP_CONFIG)
+
+    Returns:
+        Lista de grupos {'canonica': índice, 'duplicatas': [(índice, similaridade)]}
+    """
+    config = config or DEDUP_CONFIG
+    conjuntos = [shingles(texto, config['shingle']) for texto in textos]
+    assinaturas = assinaturas_minhash(conjuntos, config['permutacoes'], config['seed'])
+
+    pais = list(range(len(textos)))
+    for i, j in pares_candidatos(assinaturas, config['bandas']):
+        if not len(conjuntos[i]) or not len(conjuntos[j]):
+            continue
+        if np.mean(assinaturas[i] == assinaturas[j]) >= config['limiar']:
+            pais[_raiz(pais, i)] = _raiz(pais, j)
+
+    membros: Dict[int, List[int]] = {}
+    for i in range(len(textos)):
+        membros.setdefault(_raiz(pais, i), []).append(i)
+
+    grupos = []
+    for restantes in membros.values():
+        while len(restantes) > 1:
+            canonica = max(restantes, key=lambda i: (len(textos[i]), -i))
+            similaridades = np.mean(
+                assinaturas[restantes] == assinaturas[canonica], axis=1)
+
+            duplicatas = [(i, float(similaridade))
+                          for i, similaridade in zip(restantes, similaridades)
+                          if i != canonica and similaridade >= config['limiar']]
+            if duplicatas:
+                grupos.append({'canonica': canonica, 'duplicatas': duplicatas})
+
+            agrupados = {canonica, *(i for i, _ in duplicatas)}
+            restantes = [i for i in restantes if i not in agrupados]
+
+    return grupos
+
+
+def colapsar_duplicatas() -> int:
+    """
+    Remove do cache de textos as notícias quase duplicadas antes da sumarização
+
+    Cada grupo mantém apenas a notícia canônica; as duplicatas ficam com
+    status 'duplicada' no banco auxiliar e os grupos são registrados em
+    grupos_duplicatas.
+
+    Returns:
+        Número de notícias removidas por serem duplicatas
+    """
+    db_manager = get_db_manager()
+    text_cache = get_text_cache()
+
+    itens = text_cache.get_texts_for_summarization()
+    if len(itens) < 2:
+        return 0
+
+    grupos = detectar_duplicatas([texto for _, texto in itens])
+
+    registros = []
+    for grupo in grupos:
+        canonica = itens[grupo['canonica']][0]
+        for i, similaridade in grupo['duplicatas']:
+            link = itens[i][0]
+            text_cache.remove_text(link)
+            registros.append((link, canonica, round(similaridade, 4)))
+            print(f"  Duplicata ({similaridade:.0%}): {link} -> {canonica}")
+
+    if registros:
+        db_manager.save_duplicate_groups(registros)
+
+    print(f"[INFO] {len(registros)} duplicatas em {len(grupos)} grupos "
+          f"({len(itens)} textos analisados)")
+    return len(registros)
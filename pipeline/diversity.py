@@ -0,0 +1,135 @@
+# DIVERSIFICAÇÃO DA SELEÇÃO (MMR E COTAS POR CLUSTER)
+"""
+Módulo responsável por escolher as top N notícias equilibrando relevância
+e diversidade, para que o feed não seja dominado por um único assunto.
+
+- MMR (Maximal Marginal Relevance): a cada passo escolhe a notícia com maior
+  lambda * relevância - (1 - lambda) * similaridade máxima com as já
+  escolhidas, usando os vetores TF-IDF (normalizados, similaridade = produto
+  escalar).
+- Cotas: percorre as notícias por score e limita quantas vêm de cada cluster.
+
+As duas estratégias usam heaps. No MMR o valor de uma candidata só diminui
+à medida que a seleção cresce, então o valor guardado no heap é um limite
+superior: ao sair do topo, a candidata só é comparada com as notícias
+escolhidas desde sua última avaliação e volta ao heap se o valor caiu
+(avaliação preguiçosa). Nenhuma matriz de similaridade n x n é montada.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+
+def selecionar_por_cotas(scores: Sequence[float], clusters: Sequence[int], top_n: int,
+                         cota: Optional[int] = None) -> List[int]:
+    """
+    Seleciona as top N por score com no máximo `cota` notícias por cluster
+
+    Se as cotas impedirem completar N notícias, as vagas restantes são
+    preenchidas pelas melhores notícias que ficaram de fora.
+
+    Args:
+        scores: Score de cada notícia
+        clusters: Cluster de cada notícia
+        top_n: Número de notícias a selecionar
+        cota: Máximo por cluster (None: sem limite)
+
+    Returns:
+        Índices das notícias selecionadas, na ordem de seleção
+    """
+    # Empates mantêm a ordem original (índice menor primeiro)
+    heap = [(-float(score), i) for i, score in enumerate(scores)]
+    heapq.heapify(heap)
+
+    selecionadas: List[int] = []
+    excedentes: List[int] = []
+    por_cluster: Dict[int, int] = {}
+
+    while heap and len(selecionadas) < top_n:
+        _, i = heapq.heappop(heap)
+        cluster = clusters[i]
+        if cota is not None and por_cluster.get(cluster, 0) >= cota:
+            excedentes.append(i)
+            continue
+        por_cluster[cluster] = por_cluster.get(cluster, 0) + 1
+        selecionadas.append(i)
+
+    # Excedentes já estão em ordem de score
+    selecionadas.extend(excedentes[:top_n - len(selecionadas)])
+    return selecionadas
+
+
+def selecionar_mmr(scores: Sequence[float], vetores: sparse.spmatrix, top_n: int,
+                   lambda_mmr: float = 0.7, clusters: Optional[Sequence[int]] = None,
+                   cota: Optional[int] = None) -> List[int]:
+    """
+    Seleciona as top N por Maximal Marginal Relevance com avaliação preguiçosa
+
+    Args:
+        scores: Score de relevância de cada notícia
+        vetores: Matriz TF-IDF (n_noticias, n_termos) com linhas normalizadas (L2)
+        top_n: Número de notícias a selecionar
+        lambda_mmr: Peso da relevância (1.0: apenas score; 0.0: apenas diversidade)
+        clusters: Cluster de cada notícia (necessário para a cota)
+        cota: Máximo por cluster (None: sem limite)
+
+    Returns:
+        Índices das notícias selecionadas, na ordem de seleção
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    n = len(scores)
+    if n == 0 or top_n <= 0:
+        return []
+
+    vetores = sparse.csr_matrix(vetores)
+    maximo = scores.max()
+    relevancia = scores / maximo if maximo > 0 else np.zeros(n)
+
+    # Linhas das selecionadas em formato denso (top_n x n_termos, pequeno)
+    escolhidos = np.zeros((min(top_n, n), vetores.shape[1]), dtype=np.float64)
+    similaridade_maxima = np.zeros(n)
+
+    # Entrada do heap: (-valor, índice, quantas selecionadas já foram comparadas)
+    heap = [(-lambda_mmr * relevancia[i], i, 0) for i in range(n)]
+    heapq.heapify(heap)
+
+    selecionadas: List[int] = []
+    excedentes: List[int] = []
+    por_cluster: Dict[int, int] = {}
+
+    while heap and len(selecionadas) < top_n:
+        _, i, comparadas = heapq.heappop(heap)
+
+        if comparadas < len(selecionadas):
+            # Comparar só com as escolhidas desde a última avaliação
+            inicio, fim = vetores.indptr[i], vetores.indptr[i + 1]
+            colunas, valores = vetores.indices[inicio:fim], vetores.data[inicio:fim]
+            if len(colunas):
+                similaridades = escolhidos[comparadas:len(selecionadas)][:, colunas] @ valores
+                similaridade_maxima[i] = max(similaridade_maxima[i], similaridades.max())
+
+            valor = lambda_mmr * relevancia[i] - \
+                (1 - lambda_mmr) * similaridade_maxima[i]
+            heapq.heappush(heap, (-valor, i, len(selecionadas)))
+            continue
+
+        if cota is not None and clusters is not None:
+            cluster = clusters[i]
+            if por_cluster.get(cluster, 0) >= cota:
+                excedentes.append(i)
+                continue
+            por_cluster[cluster] = por_cluster.get(cluster, 0) + 1
+
+        linha = vetores.getrow(i)
+        escolhidos[len(selecionadas), linha.indices] = linha.data
+        selecionadas.append(i)
+
+    if len(selecionadas) < top_n and excedentes:
+        # Preencher com as melhores por score entre as barradas pela cota
+        excedentes.sort(key=lambda i: -scores[i])
+        selecionadas.extend(excedentes[:top_n - len(selecionadas)])
+
+    return selecionadas
@@ -0,0 +1,203 @@
+# ETAPA 7: PUBLICAÇÃO DE SNAPSHOTS ESTÁTICOS
+"""
+Módulo responsável por gerar snapshots JSON (e gzip) pré-renderizados do
+feed de notícias postadas, servidos pela API ou diretamente pelo nginx.
+
+Estrutura gerada em SNAPSHOT_CONFIG['output_dir']:
+
+    v<versão>/feed.json              Top-N geral (imutável)
+    v<versão>/clusters/<n>.json      Top-N de cada cluster
+    v<versão>/fontes/<slug>.json     Top-N de cada fonte
+    feed.json, clusters/, fontes/    Cópia da última versão (caminhos estáveis)
+    manifest.json                    Versão atual e lista de arquivos
+
+Cada arquivo tem uma cópia .gz ao lado. Todas as escritas são feitas em um
+arquivo temporário no mesmo diretório seguido de os.replace, de modo que um
+leitor nunca vê um arquivo parcial; o manifest é escrito por último.
+"""
+
+import gzip
+import json
+import os
+import re
+import shutil
+import tempfile
+import unicodedata
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config.config import SNAPSHOT_CONFIG
+from database import get_db_manager
+
+
+MANIFEST_NAME = "manifest.json"
+
+
+def slugify(texto: str) -> str:
+    """
+    Converte o nome de uma fonte em um nome de arquivo seguro
+
+    Args:
+        texto: Nome da fonte (ex.: "Meio e Mensagem")
+
+    Returns:
+        Slug em minúsculas (ex.: "meio-e-mensagem")
+    """
+    texto = unicodedata.normalize('NFKD', texto).encode(
+        'ascii', 'ignore').decode('ascii')
+    slug = re.sub(r'[^a-z0-9]+', '-', texto.lower()).strip('-')
+    return slug or 'desconhecida'
+
+
+def escrever_atomico(caminho: str, conteudo: bytes) -> None:
+    """
+    Escreve um arquivo de forma atômica (temporário + rename)
+
+    Args:
+        caminho: Caminho final do arquivo
+        conteudo: Bytes a gravar
+    """
+    diretorio = os.path.dirname(caminho) or "."
+    os.makedirs(diretorio, exist_ok=True)
+
+    fd, temporario = tempfile.mkstemp(dir=diretorio, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as arquivo:
+            arquivo.write(conteudo)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.chmod(temporario, 0o644)
+        os.replace(temporario, caminho)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+
+def _renderizar(noticias: List[Dict], versao: int, gerado_em: str) -> bytes:
+    """Serializa um feed no mesmo formato da resposta de /api/v1/news"""
+    payload = {
+        "success": True,
+        "data": noticias,
+        "total": len(noticias),
+        "cached": False,
+        "next_cursor": None,
+        "timestamp": gerado_em,
+        "version": versao
+    }
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _publicar_arquivo(raiz: str, relativo: str, corpo: bytes, nivel_gzip: int) -> None:
+    """Grava o JSON e a cópia gzip (mtime=0: mesma saída para o mesmo conteúdo)"""
+    caminho = os.path.join(raiz, relativo)
+    escrever_atomico(caminho, corpo)
+    escrever_atomico(caminho + ".gz",
+                     gzip.compress(corpo, compresslevel=nivel_gzip, mtime=0))
+
+
+def _ler_manifest(raiz: str) -> Optional[Dict]:
+    """Lê o manifest atual, se existir"""
+    try:
+        with open(os.path.join(raiz, MANIFEST_NAME), encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+
+
+def _remover_obsoletos(raiz: str, arquivos: List[str]) -> None:
+    """Remove dos caminhos estáveis os feeds de clusters/fontes que deixaram de existir"""
+    atuais = set(arquivos)
+    for subdiretorio in ("clusters", "fontes"):
+        diretorio = os.path.join(raiz, subdiretorio)
+        if not os.path.isdir(diretorio):
+            continue
+        for nome in os.listdir(diretorio):
+            relativo = f"{subdiretorio}/{nome}"
+            if relativo.endswith(".gz"):
+                relativo = relativo[:-3]
+            if relativo not in atuais:
+                os.remove(os.path.join(diretorio, nome))
+
+
+def _remover_versoes_antigas(raiz: str, manter: int) -> None:
+    """Mantém apenas os diretórios das últimas versões"""
+    versoes = sorted(
+        (int(nome[1:]) for nome in os.listdir(raiz)
+         if nome.startswith("v") and nome[1:].isdigit()),
+        reverse=True)
+    for versao in versoes[max(1, manter):]:
+        shutil.rmtree(os.path.join(raiz, f"v{versao}"), ignore_errors=True)
+
+
+def publicar_snapshots(top_n: Optional[int] = None, output_dir: Optional[str] = None,
+                       force: bool = False) -> Optional[Dict]:
+    """
+    Gera os snapshots do feed de notícias postadas
+
+    Nada é regravado se a versão dos dados (metadados.data_version) não
+    mudou desde a última publicação, a menos que force seja True.
+
+    Args:
+        top_n: Número de notícias por feed (padrão: SNAPSHOT_CONFIG['top_n'])
+        output_dir: Diretório de saída (padrão: SNAPSHOT_CONFIG['output_dir'])
+        force: Se True, publica mesmo sem mudança na versão dos dados
+
+    Returns:
+        Manifest publicado ou None em caso de falha
+    """
+    db_manager = get_db_manager()
+    top_n = top_n or SNAPSHOT_CONFIG['top_n']
+    raiz = output_dir or SNAPSHOT_CONFIG['output_dir']
+    nivel_gzip = SNAPSHOT_CONFIG['gzip_level']
+
+    versao = db_manager.get_data_version()
+    manifest_atual = _ler_manifest(raiz)
+    if (not force and manifest_atual and manifest_atual.get("version") == versao
+            and os.path.isdir(os.path.join(raiz, f"v{versao}"))):
+        print(f"Snapshots já estão na versão {versao}. Nada a publicar.")
+        return manifest_atual
+
+    gerado_em = datetime.now().isoformat()
+    grupos = db_manager.get_feed_groups()
+
+    # Arquivo relativo -> filtros da listagem
+    feeds = {"feed.json": {'status': 'postada'}}
+    for cluster in grupos['clusters']:
+        feeds[f"clusters/{cluster}.json"] = {'status': 'postada', 'cluster': cluster}
+    for fonte in grupos['fontes']:
+        feeds[f"fontes/{slugify(fonte)}.json"] = {'status': 'postada', 'fonte': fonte}
+
+    corpos = {}
+    totais = {}
+    for relativo, filtros in feeds.items():
+        noticias = db_manager.get_feed(filtros, limit=top_n)
+        corpos[relativo] = _renderizar(noticias, versao, gerado_em)
+        totais[relativo] = len(noticias)
+
+    # 1) Diretório imutável da versão
+    diretorio_versao = os.path.join(raiz, f"v{versao}")
+    for relativo, corpo in corpos.items():
+        _publicar_arquivo(diretorio_versao, relativo, corpo, nivel_gzip)
+
+    # 2) Caminhos estáveis (cada arquivo é trocado atomicamente)
+    for relativo, corpo in corpos.items():
+        _publicar_arquivo(raiz, relativo, corpo, nivel_gzip)
+    _remover_obsoletos(raiz, list(corpos))
+
+    # 3) Manifest por último: aponta para a versão completa
+    manifest = {
+        "version": versao,
+        "generated_at": gerado_em,
+        "top_n": top_n,
+        "path": f"v{versao}/",
+        "files": totais,
+        "fontes": {slugify(fonte): fonte for fonte in grupos['fontes']}
+    }
+    escrever_atomico(os.path.join(raiz, MANIFEST_NAME),
+                     json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+
+    _remover_versoes_antigas(raiz, SNAPSHOT_CONFIG['keep_versions'])
+
+    print(f"Snapshots publicados: versão {versao}, {len(corpos)} feeds em '{raiz}'")
+    return manifest
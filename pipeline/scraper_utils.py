@@ -5,10 +5,22 @@ Substitui os arquivos utils/ criados anteriormente
 """
 
 import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 from urllib.parse import urlparse, urljoin
 from bs4 import BeautifulSoup
 
 
+# Meses por extenso/abreviados usados pelas fontes
+MESES = {
+    'jan': 1, 'fev': 2, 'mar': 3, 'abr': 4, 'mai': 5, 'jun': 6,
+    'jul': 7, 'ago': 8, 'set': 9, 'out': 10, 'nov': 11, 'dez': 12
+}
+
+# Horário das datas exibidas pelas fontes (Brasília, UTC-3)
+FUSO_FONTES = timedelta(hours=-3)
+
+
 def detect_source_from_url(url: str) -> str:
     """
     Detecta a fonte baseada na URL da notícia
@@ -80,6 +92,73 @@ def extract_image_url(article_element, base_url: str = "") -> str:
     return ""
 
 
+def parse_publication_date(texto: Optional[str], agora: Optional[datetime] = None) -> Optional[str]:
+    """
+    Converte a data exibida na listagem da fonte para o formato do SQLite
+
+    Aceita ISO 8601 (ex.: atributo datetime), "dd/mm/aaaa [hh:mm]",
+    "dd de <mês> de aaaa", "hoje", "ontem" e "há N minutos/horas/dias".
+    Datas sem fuso são consideradas no horário de Brasília.
+
+    Args:
+        texto: Texto ou atributo da data extraído do HTML
+        agora: Instante atual em UTC, sem fuso (padrão: agora)
+
+    Returns:
+        Data em UTC no formato 'AAAA-MM-DD HH:MM:SS' ou None se não reconhecida
+    """
+    if not texto or not isinstance(texto, str):
+        return None
+
+    agora = agora or datetime.now(timezone.utc).replace(tzinfo=None)
+    texto = texto.strip().lower()
+
+    def formatar(data_local: datetime) -> str:
+        return (data_local - FUSO_FONTES).strftime('%Y-%m-%d %H:%M:%S')
+
+    # ISO 8601 (com ou sem fuso)
+    try:
+        data = datetime.fromisoformat(texto.replace('z', '+00:00'))
+        if data.tzinfo is not None:
+            return (data - data.utcoffset()).replace(tzinfo=None).strftime('%Y-%m-%d %H:%M:%S')
+        return formatar(data)
+    except ValueError:
+        pass
+
+    # Datas relativas
+    relativo = re.search(r'há\s+(\d+)\s*(min|h|dia)', texto)
+    if relativo:
+        quantidade, unidade = int(relativo.group(1)), relativo.group(2)
+        delta = {'min': timedelta(minutes=quantidade), 'h': timedelta(hours=quantidade),
+                 'dia': timedelta(days=quantidade)}[unidade]
+        return (agora - delta).strftime('%Y-%m-%d %H:%M:%S')
+
+    hora = re.search(r'(\d{1,2})[:h](\d{2})', texto)
+    horas, minutos = (int(hora.group(1)), int(hora.group(2))) if hora else (0, 0)
+
+    if texto.startswith(('hoje', 'ontem')):
+        dia = (agora + FUSO_FONTES).date()
+        if texto.startswith('ontem'):
+            dia -= timedelta(days=1)
+        return formatar(datetime(dia.year, dia.month, dia.day, horas, minutos))
+
+    try:
+        numerica = re.search(r'(\d{1,2})/(\d{1,2})/(\d{2,4})', texto)
+        if numerica:
+            dia, mes, ano = (int(parte) for parte in numerica.groups())
+            ano += 2000 if ano < 100 else 0
+            return formatar(datetime(ano, mes, dia, horas, minutos))
+
+        extenso = re.search(r'(\d{1,2})\s+(?:de\s+)?([a-zç]{3})[a-zç]*\.?\s+(?:de\s+)?(\d{4})', texto)
+        if extenso and extenso.group(2) in MESES:
+            return formatar(datetime(int(extenso.group(3)), MESES[extenso.group(2)],
+                                     int(extenso.group(1)), horas, minutos))
+    except ValueError:
+        return None
+
+    return None
+
+
 def validate_url(url: str) -> bool:
     """
     Valida se uma string é uma URL válida
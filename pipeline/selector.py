@@ -4,10 +4,272 @@ Módulo responsável pela seleção das notícias mais estratégicas para conte
 Refatorado para usar banco auxiliar e principal
 """
 
+import numpy as np
 import pandas as pd
 import re
-from config.config import RELEVANCE_KEYWORDS
+from scipy import sparse
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from config.config import RELEVANCE_KEYWORDS, SELECTION_CONFIG, RECENCY_CONFIG
 from database import get_db_manager
+from pipeline.diversity import selecionar_mmr, selecionar_por_cotas
+
+
+def _regex_trie(termos: Iterable[str]) -> str:
+    """
+    Monta uma alternativa regex fatorada por prefixos comuns (trie)
+
+    Em cada posição o motor de regex testa apenas os ramos cujo primeiro
+    caractere confere, em vez de tentar todos os termos um a um. Os ramos
+    opcionais são gulosos: o termo mais longo é tentado primeiro.
+
+    Args:
+        termos: Termos literais
+
+    Returns:
+        Expressão regular equivalente a termo1|termo2|...
+    """
+    trie: Dict = {}
+    for termo in termos:
+        no = trie
+        for caractere in termo:
+            no = no.setdefault(caractere, {})
+        no[''] = True
+
+    def montar(no: Dict) -> str:
+        ramos = [re.escape(caractere) + montar(filho)
+                 for caractere, filho in sorted(no.items()) if caractere != '']
+        if not ramos:
+            return ''
+        alternativa = ramos[0] if len(ramos) == 1 else '(?:' + '|'.join(ramos) + ')'
+        return '(?:' + alternativa + ')?' if '' in no else alternativa
+
+    return montar(trie)
+
+
+class KeywordMatcher:
+    """
+    Casamento de todas as palavras-chave de relevância em uma única passada
+
+    Os termos são reunidos em uma só expressão regular (fatorada por
+    prefixos), compilada uma vez, com a alternativa dentro de um lookahead: em cada fronteira de palavra o
+    termo mais longo que casa é registrado sem consumir o texto, de modo que
+    termos sobrepostos continuam sendo encontrados. Termos contidos em outros
+    termos (ex.: "banco" em "banco do brasil") só são verificados à parte
+    quando o termo maior foi encontrado.
+    """
+
+    def __init__(self, keywords: Dict[str, Dict]):
+        """
+        Constrói o casador a partir da configuração de palavras-chave
+
+        Args:
+            keywords: Dicionário categoria -> {'termos': [...], 'peso': n}
+        """
+        self.pesos = {categoria: dados['peso']
+                      for categoria, dados in keywords.items()}
+
+        # Termo -> categorias em que aparece (um termo pode repetir)
+        self.categorias_do_termo: Dict[str, List[str]] = {}
+        for categoria, dados in keywords.items():
+            for termo in dados['termos']:
+                categorias = self.categorias_do_termo.setdefault(termo, [])
+                if categoria not in categorias:
+                    categorias.append(categoria)
+
+        # Vocabulário (coluna de cada termo na matriz de ocorrências) e peso
+        # de cada termo (soma dos pesos das categorias em que aparece)
+        self.termos = list(self.categorias_do_termo)
+        self._indice_termo = {termo: i for i, termo in enumerate(self.termos)}
+        self.pesos_termos = np.array(
+            [sum(self.pesos[c] for c in self.categorias_do_termo[termo])
+             for termo in self.termos], dtype=np.float64)
+
+        termos = sorted(self.categorias_do_termo, key=len, reverse=True)
+        self._padrao = re.compile(r'\b(?=(' + _regex_trie(termos) + r')\b)')
+
+        # Termo contido -> (padrão próprio, termos que o contêm)
+        self._contidos: Dict[str, Tuple[re.Pattern, List[str]]] = {}
+        for termo in termos:
+            padrao = re.compile(r'\b' + re.escape(termo) + r'\b')
+            maiores = [outro for outro in termos
+                       if outro != termo and padrao.search(outro)]
+            if maiores:
+                self._contidos[termo] = (padrao, maiores)
+
+    def encontrar_termos(self, texto: str) -> Set[str]:
+        """
+        Retorna os termos distintos presentes no texto
+
+        Args:
+            texto: Texto para análise
+
+        Returns:
+            Conjunto de termos encontrados
+        """
+        texto_lower = texto.lower()
+        encontrados = set(self._padrao.findall(texto_lower))
+
+        for termo, (padrao, maiores) in self._contidos.items():
+            if termo not in encontrados and any(maior in encontrados for maior in maiores) \
+                    and padrao.search(texto_lower):
+                encontrados.add(termo)
+
+        return encontrados
+
+    def contar_por_categoria(self, texto: str) -> Dict[str, int]:
+        """
+        Conta os termos distintos encontrados por categoria
+
+        Args:
+            texto: Texto para análise
+
+        Returns:
+            Dicionário categoria -> número de termos encontrados
+        """
+        contagens = dict.fromkeys(self.pesos, 0)
+        if not isinstance(texto, str):
+            return contagens
+
+        for termo in self.encontrar_termos(texto):
+            for categoria in self.categorias_do_termo[termo]:
+                contagens[categoria] += 1
+
+        return contagens
+
+    def calcular_score(self, texto: str) -> int:
+        """
+        Calcula o score (soma dos pesos dos termos encontrados)
+
+        Args:
+            texto: Texto para análise
+
+        Returns:
+            Score de relevância
+        """
+        return sum(self.pesos[categoria] * quantidade
+                   for categoria, quantidade in self.contar_por_categoria(texto).items())
+
+    def matriz_ocorrencias(self, textos: Iterable[str]) -> sparse.csr_matrix:
+        """
+        Monta a matriz esparsa binária textos x termos
+
+        Args:
+            textos: Textos para análise (valores que não são str ficam zerados)
+
+        Returns:
+            Matriz CSR (n_textos, n_termos) com 1 onde o termo aparece
+        """
+        indices: List[int] = []
+        indptr = [0]
+        for texto in textos:
+            if isinstance(texto, str):
+                indices.extend(self._indice_termo[termo]
+                               for termo in self.encontrar_termos(texto))
+            indptr.append(len(indices))
+
+        dados = np.ones(len(indices), dtype=np.float64)
+        return sparse.csr_matrix(
+            (dados, np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(self.termos)))
+
+    def calcular_scores(self, textos: Iterable[str]) -> np.ndarray:
+        """
+        Calcula o score de vários textos com um único produto matriz-vetor
+
+        Args:
+            textos: Textos para análise
+
+        Returns:
+            Vetor de scores, na ordem dos textos
+        """
+        return self.matriz_ocorrencias(textos) @ self.pesos_termos
+
+
+def agregar_por_cluster(clusters: np.ndarray, scores: np.ndarray) -> Dict[int, Dict]:
+    """
+    Calcula quantidade, média e máximo do score de cada cluster com
+    reduções agrupadas (sem listas por cluster)
+
+    Args:
+        clusters: Cluster de cada notícia
+        scores: Score de cada notícia
+
+    Returns:
+        Dicionário cluster -> {'quantidade', 'score_medio', 'score_maximo'}
+    """
+    if len(scores) == 0:
+        return {}
+
+    rotulos, grupos = np.unique(clusters, return_inverse=True)
+    quantidades = np.bincount(grupos)
+    somas = np.bincount(grupos, weights=scores)
+    maximos = np.full(len(rotulos), -np.inf)
+    np.maximum.at(maximos, grupos, scores)
+
+    return {
+        int(rotulo): {
+            'quantidade': int(quantidade),
+            'score_medio': float(soma / quantidade),
+            'score_maximo': float(maximo)
+        }
+        for rotulo, quantidade, soma, maximo in zip(rotulos, quantidades, somas, maximos)
+    }
+
+
+def aplicar_decaimento(scores: np.ndarray, datas: Sequence[Optional[str]],
+                       fontes: Sequence[str], agora: Optional[pd.Timestamp] = None,
+                       config: Optional[Dict] = None) -> np.ndarray:
+    """
+    Aplica o decaimento por recência aos scores de relevância
+
+    score_ajustado = score * ((1 - peso) + peso * 0.5 ** (idade / meia_vida)),
+    com a meia-vida da fonte da notícia (ou a padrão). Notícias sem data
+    válida não sofrem decaimento.
+
+    Args:
+        scores: Score de relevância de cada notícia
+        datas: Data de referência de cada notícia (UTC, formato do SQLite)
+        fontes: Fonte de cada notícia
+        agora: Instante de referência em UTC (padrão: agora)
+        config: Configuração do decaimento (padrão: RECENCY_CONFIG)
+
+    Returns:
+        Vetor com os scores ajustados
+    """
+    config = config or RECENCY_CONFIG
+    scores = np.asarray(scores, dtype=np.float64)
+    peso = config['peso']
+    if len(scores) == 0 or not peso:
+        return scores.copy()
+
+    agora = agora if agora is not None else pd.Timestamp.now(tz='UTC').tz_localize(None)
+    idades = (agora - pd.to_datetime(pd.Series(datas, dtype=object), errors='coerce')) \
+        / pd.Timedelta(hours=1)
+    idades = np.clip(idades.fillna(0.0).to_numpy(dtype=np.float64), 0.0, None)
+
+    meias_vidas = config['meia_vida_horas']
+    padrao = meias_vidas['padrao']
+    meia_vida = np.array([meias_vidas.get(fonte, padrao) for fonte in fontes],
+                         dtype=np.float64)
+
+    return scores * ((1 - peso) + peso * np.exp2(-idades / meia_vida))
+
+
+# Casador construído uma única vez a partir de RELEVANCE_KEYWORDS
+_keyword_matcher: Optional[KeywordMatcher] = None
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """
+    Obtém o casador de palavras-chave (criado no primeiro uso)
+
+    Returns:
+        Instância de KeywordMatcher
+    """
+    global _keyword_matcher
+    if _keyword_matcher is None:
+        _keyword_matcher = KeywordMatcher(RELEVANCE_KEYWORDS)
+    return _keyword_matcher
 
 
 def calcular_score(texto):
@@ -23,25 +285,60 @@ def calcular_score(texto):
     if not isinstance(texto, str):
         return 0
 
-    score = 0
-    texto_lower = texto.lower()
+    return get_keyword_matcher().calcular_score(texto)
 
-    for categoria in RELEVANCE_KEYWORDS.values():
-        peso = categoria['peso']
-        for termo in categoria['termos']:
-            if re.search(r'\b' + re.escape(termo) + r'\b', texto_lower):
-                score += peso
 
-    return score
+def _escolher_top_n(noticias: List[Dict], scores: np.ndarray, clusters: np.ndarray,
+                    top_n: int, vectorizer=None) -> List[int]:
+    """
+    Escolhe os índices das top N notícias conforme a estratégia configurada
 
+    Args:
+        noticias: Notícias candidatas
+        scores: Score (com decaimento por recência) de cada notícia
+        clusters: Cluster de cada notícia
+        top_n: Número de notícias a selecionar
+        vectorizer: Vetorizador TF-IDF treinado (opcional)
+
+    Returns:
+        Índices das notícias selecionadas
+    """
+    estrategia = SELECTION_CONFIG['estrategia']
+    cota = SELECTION_CONFIG['cota_por_cluster']
+
+    if estrategia == 'mmr' and vectorizer is not None:
+        try:
+            vetores = vectorizer.transform(
+                [noticia['resumo'] for noticia in noticias])
+            return selecionar_mmr(scores, vetores, top_n,
+                                  lambda_mmr=SELECTION_CONFIG['lambda_mmr'],
+                                  clusters=clusters, cota=cota)
+        except Exception as e:
+            print(f"[AVISO] MMR indisponível, usando cotas por cluster: {e}")
+        return selecionar_por_cotas(scores, clusters, top_n, cota)
 
-def selecionar_noticias_estrategicas(top_n=15):
+    if estrategia in ('mmr', 'cotas'):
+        return selecionar_por_cotas(scores, clusters, top_n, cota)
+
+    # Apenas relevância (ordenação estável: empates mantêm a ordem)
+    return list(np.argsort(-scores, kind='stable')[:top_n])
+
+
+def selecionar_noticias_estrategicas(top_n=15, vectorizer=None):
     """
     Seleciona as notícias mais estratégicas para conteúdo de Instagram
     e transfere para o banco principal com controle de postagem
 
+    O score de relevância é combinado com o decaimento por recência
+    (RECENCY_CONFIG) e a escolha das top N usa o score ajustado, segundo
+    SELECTION_CONFIG['estrategia']: 'mmr' (relevância x similaridade TF-IDF,
+    com cota por cluster), 'cotas' (por score, com cota por cluster) ou
+    'score' (apenas relevância).
+
     Args:
         top_n: Número de notícias a selecionar
+        vectorizer: Vetorizador TF-IDF da clusterização (necessário para o
+            MMR; sem ele, a seleção usa apenas as cotas por cluster)
 
     Returns:
         Lista de notícias selecionadas
@@ -56,31 +353,32 @@ def selecionar_noticias_estrategicas(top_n=15):
         print("ERRO: Nenhuma notícia pronta para seleção encontrada.")
         return []
 
-    # Calcular scores de relevância
-    for noticia in noticias_prontas:
-        texto_completo = noticia['titulo'] + ' ' + noticia['resumo']
-        score = calcular_score(texto_completo)
-        noticia['relevance_score'] = score
-        noticia['score'] = score  # Adicionar score para transferência
+    # Calcular scores de relevância de todas as notícias de uma vez
+    textos = [noticia['titulo'] + ' ' + noticia['resumo']
+              for noticia in noticias_prontas]
+    scores = get_keyword_matcher().calcular_scores(textos)
+
+    # Decaimento por recência (data de publicação ou, sem ela, de coleta)
+    scores_ajustados = aplicar_decaimento(
+        scores,
+        [noticia.get('data_referencia') for noticia in noticias_prontas],
+        [noticia['fonte'] for noticia in noticias_prontas])
 
-    # Ordenar por score de relevância
-    noticias_prontas.sort(key=lambda x: x['relevance_score'], reverse=True)
+    for noticia, score, ajustado in zip(noticias_prontas, scores, scores_ajustados):
+        noticia['relevance_score'] = int(score)
+        noticia['score'] = int(score)  # Adicionar score para transferência
+        noticia['score_ajustado'] = round(float(ajustado), 4)
 
     # Análise de relevância por cluster
-    cluster_scores = {}
-    for noticia in noticias_prontas:
-        cluster = noticia['cluster']
-        if cluster not in cluster_scores:
-            cluster_scores[cluster] = []
-        cluster_scores[cluster].append(noticia['relevance_score'])
-
-    # Calcular média por cluster
-    cluster_avg_scores = {}
-    for cluster, scores in cluster_scores.items():
-        cluster_avg_scores[cluster] = sum(scores) / len(scores)
+    clusters = np.array([noticia['cluster'] for noticia in noticias_prontas])
+    for cluster, resumo in agregar_por_cluster(clusters, scores).items():
+        print(f"  Cluster {cluster}: {resumo['quantidade']} notícias, "
+              f"score médio {resumo['score_medio']:.2f}, máximo {resumo['score_maximo']:.0f}")
 
     # Selecionar as top N notícias
-    noticias_selecionadas = noticias_prontas[:top_n]
+    ordem = _escolher_top_n(noticias_prontas, scores_ajustados, clusters, top_n, vectorizer)
+    noticias_selecionadas = [noticias_prontas[i] for i in ordem]
+    print(f"  Clusters na seleção: {sorted(set(int(clusters[i]) for i in ordem))}")
 
     # ETAPA 2: Arquivar notícias postadas que NÃO foram re-selecionadas
     # Obter links das notícias selecionadas
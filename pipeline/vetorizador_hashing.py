@@ -0,0 +1,152 @@
+# VETORIZAÇÃO TF-IDF POR HASHING (STREAMING)
+"""
+Módulo responsável pela vetorização TF-IDF sem vocabulário em memória,
+usada na clusterização em lotes de grandes volumes de resumos.
+
+Os termos são mapeados para colunas por hashing (HashingVectorizer), então
+o tamanho do modelo não depende do corpus. O IDF é mantido de forma
+incremental: cada lote soma suas frequências de documento a um vetor de
+contagens de tamanho fixo (n_features).
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.preprocessing import normalize
+from sklearn.utils import murmurhash3_32
+
+
+def _tokens_prontos(tokens):
+    """Analisador identidade: os documentos já chegam tokenizados"""
+    return tokens
+
+
+class VetorizadorHashing:
+    """TF-IDF por hashing com IDF incremental (interface compatível com transform)"""
+
+    def __init__(self, n_features: int = 2 ** 18, stop_words: Optional[Sequence[str]] = None,
+                 ngram_range: tuple = (1, 2)):
+        """
+        Inicializa o vetorizador
+
+        Args:
+            n_features: Número de colunas (buckets de hashing)
+            stop_words: Stopwords removidas antes dos n-gramas
+            ngram_range: Intervalo de n-gramas
+        """
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.stop_words = list(stop_words) if stop_words else None
+
+        # O HashingVectorizer recebe os tokens prontos (análise feita uma vez)
+        self._hashing = HashingVectorizer(
+            n_features=n_features, analyzer=_tokens_prontos,
+            alternate_sign=False, norm=None)
+
+        self.df_ = np.zeros(n_features, dtype=np.int64)
+        self.n_documentos_ = 0
+        self._analisador = None
+
+    def __getstate__(self) -> Dict:
+        """Estado persistido (o analisador é recriado no primeiro uso)"""
+        estado = self.__dict__.copy()
+        estado['_analisador'] = None
+        return estado
+
+    def __setstate__(self, estado: Dict) -> None:
+        """Restaura o estado persistido"""
+        self.__dict__.update(estado)
+        self._analisador = None
+
+    def _analisar(self, textos: Iterable[str]) -> List[List[str]]:
+        """Tokeniza os textos (minúsculas, stopwords e n-gramas)"""
+        if self._analisador is None:
+            # Montado uma vez: valida as stopwords e compila o padrão de tokens
+            self._analisador = CountVectorizer(
+                stop_words=self.stop_words, ngram_range=self.ngram_range).build_analyzer()
+        return [self._analisador(texto) for texto in textos]
+
+    @property
+    def idf_(self) -> np.ndarray:
+        """IDF suavizado, como no TfidfVectorizer: ln((1 + n) / (1 + df)) + 1"""
+        return np.log((1 + self.n_documentos_) / (1 + self.df_)) + 1
+
+    def partial_fit(self, textos: Sequence[str]) -> 'VetorizadorHashing':
+        """
+        Acrescenta as frequências de documento de um lote ao IDF
+
+        Args:
+            textos: Resumos do lote
+
+        Returns:
+            O próprio vetorizador
+        """
+        self._acumular(self._hashing.transform(self._analisar(textos)))
+        return self
+
+    def _acumular(self, contagens: sparse.csr_matrix) -> None:
+        """Soma ao df as colunas presentes em cada documento"""
+        contagens = sparse.csr_matrix(contagens)
+        contagens.sum_duplicates()
+        self.df_ += np.bincount(contagens.indices, minlength=self.n_features)
+        self.n_documentos_ += contagens.shape[0]
+
+    def _ponderar(self, contagens: sparse.csr_matrix) -> sparse.csr_matrix:
+        """Aplica o IDF atual e normaliza as linhas (L2)"""
+        return normalize(sparse.csr_matrix(contagens.multiply(self.idf_), dtype=np.float64))
+
+    def partial_fit_transform(self, textos: Sequence[str]) -> sparse.csr_matrix:
+        """
+        Atualiza o IDF com o lote e devolve sua matriz TF-IDF
+
+        Equivale a partial_fit seguido de transform, tokenizando uma só vez.
+
+        Args:
+            textos: Resumos do lote
+
+        Returns:
+            Matriz TF-IDF (n_textos, n_features) com linhas normalizadas
+        """
+        contagens = self._hashing.transform(self._analisar(textos))
+        self._acumular(contagens)
+        return self._ponderar(contagens)
+
+    def transform(self, textos: Sequence[str]) -> sparse.csr_matrix:
+        """
+        Vetoriza textos com o IDF atual
+
+        Args:
+            textos: Resumos
+
+        Returns:
+            Matriz TF-IDF (n_textos, n_features) com linhas normalizadas
+        """
+        return self._ponderar(self._hashing.transform(self._analisar(textos)))
+
+    def nomes_termos(self, textos: Iterable[str]) -> np.ndarray:
+        """
+        Reconstrói os nomes das colunas a partir de textos conhecidos
+
+        O hashing não guarda o vocabulário; as colunas recebem os termos
+        desses textos que caem nelas (colunas sem termo ficam vazias).
+
+        Args:
+            textos: Textos de referência (ex.: os resumos da execução)
+
+        Returns:
+            Array com um nome por coluna, como get_feature_names_out()
+        """
+        nomes = np.full(self.n_features, '', dtype=object)
+        vistos: Dict[str, None] = {}
+        for tokens in self._analisar(textos):
+            vistos.update(dict.fromkeys(tokens))
+
+        for termo in vistos:
+            # Mesmo mapeamento do HashingVectorizer (murmurhash3 com sinal)
+            coluna = abs(murmurhash3_32(termo, seed=0)) % self.n_features
+            if not nomes[coluna]:
+                nomes[coluna] = termo
+
+        return nomes
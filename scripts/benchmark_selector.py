@@ -0,0 +1,178 @@
+# BENCHMARK DA SELEÇÃO ESTRATÉGICA
+"""
+Benchmark do cálculo de relevância da seleção estratégica sobre resumos
+sintéticos: casador de palavras-chave x busca termo a termo, e pontuação em
+lote (matriz esparsa + agregação por cluster) x laço por notícia.
+"""
+
+import sys
+import os
+import re
+import time
+import random
+import argparse
+from typing import List
+
+# Adicionar o diretório raiz ao path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from config.config import RELEVANCE_KEYWORDS
+from pipeline.selector import KeywordMatcher, agregar_por_cluster
+
+
+# Palavras neutras usadas para compor os resumos sintéticos
+VOCABULARIO = (
+    "o a de que para com uma marca empresa mercado digital consumidores "
+    "brasil estratégia dados clientes vendas produto loja rede social "
+    "conteúdo setor varejo público pesquisa resultado trimestre equipe"
+).split()
+
+
+def gerar_resumos(quantidade: int, palavras: int = 60, seed: int = 42) -> List[str]:
+    """
+    Gera resumos sintéticos com algumas palavras-chave espalhadas
+
+    Args:
+        quantidade: Número de resumos
+        palavras: Palavras neutras por resumo
+        seed: Semente do gerador aleatório
+
+    Returns:
+        Lista de resumos
+    """
+    rng = random.Random(seed)
+    termos = [termo for dados in RELEVANCE_KEYWORDS.values()
+              for termo in dados['termos']]
+
+    resumos = []
+    for _ in range(quantidade):
+        texto = [rng.choice(VOCABULARIO) for _ in range(palavras)]
+        for _ in range(rng.randint(0, 5)):
+            termo = rng.choice(termos)
+            texto.insert(rng.randrange(len(texto) + 1),
+                         termo.title() if rng.random() < 0.3 else termo)
+        resumos.append(" ".join(texto))
+
+    return resumos
+
+
+def calcular_score_por_termo(texto: str) -> int:
+    """Implementação anterior (uma busca por termo), usada como referência"""
+    score = 0
+    texto_lower = texto.lower()
+
+    for categoria in RELEVANCE_KEYWORDS.values():
+        for termo in categoria['termos']:
+            if re.search(r'\b' + re.escape(termo) + r'\b', texto_lower):
+                score += categoria['peso']
+
+    return score
+
+
+def _medir(nome: str, funcao, resumos: List[str]) -> List[int]:
+    """Executa a função sobre todos os resumos e exibe o tempo"""
+    inicio = time.perf_counter()
+    scores = [funcao(texto) for texto in resumos]
+    duracao = time.perf_counter() - inicio
+
+    print(f"  {nome:<28} {duracao:8.3f}s  "
+          f"({duracao / len(resumos) * 1e6:7.1f} µs/resumo)")
+    return scores
+
+
+def run_keyword_benchmark(quantidade: int = 100000) -> bool:
+    """
+    Compara o casador de palavras-chave com a busca termo a termo
+
+    Args:
+        quantidade: Número de resumos sintéticos
+
+    Returns:
+        True se os dois métodos produziram os mesmos scores
+    """
+    print(f"[INFO] Gerando {quantidade} resumos sintéticos...")
+    resumos = gerar_resumos(quantidade)
+
+    inicio = time.perf_counter()
+    matcher = KeywordMatcher(RELEVANCE_KEYWORDS)
+    print(f"  Construção do casador        {time.perf_counter() - inicio:8.3f}s")
+
+    referencia = _medir("Busca termo a termo", calcular_score_por_termo, resumos)
+    scores = _medir("KeywordMatcher", matcher.calcular_score, resumos)
+
+    divergencias = sum(1 for a, b in zip(referencia, scores) if a != b)
+    if divergencias:
+        print(f"[ERRO] {divergencias} scores divergentes")
+        return False
+
+    print("[OK] Scores idênticos nos dois métodos")
+    return True
+
+
+def run_batch_benchmark(quantidade: int = 50000, n_clusters: int = 5) -> bool:
+    """
+    Compara a pontuação em lote com o laço por notícia da seleção anterior
+    (score um a um + listas de scores por cluster)
+
+    Args:
+        quantidade: Número de notícias candidatas sintéticas
+        n_clusters: Número de clusters sorteados entre as notícias
+
+    Returns:
+        True se scores e agregados por cluster coincidem
+    """
+    print(f"[INFO] Gerando {quantidade} notícias candidatas sintéticas...")
+    resumos = gerar_resumos(quantidade)
+    clusters = [i % n_clusters for i in range(quantidade)]
+    matcher = KeywordMatcher(RELEVANCE_KEYWORDS)
+
+    inicio = time.perf_counter()
+    scores_laco = [calcular_score_por_termo(texto) for texto in resumos]
+    por_cluster: dict = {}
+    for cluster, score in zip(clusters, scores_laco):
+        por_cluster.setdefault(cluster, []).append(score)
+    medias_laco = {c: sum(v) / len(v) for c, v in por_cluster.items()}
+    duracao_laco = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    scores_lote = matcher.calcular_scores(resumos)
+    agregados = agregar_por_cluster(np.array(clusters), scores_lote)
+    duracao_lote = time.perf_counter() - inicio
+
+    print(f"  {'Laço por notícia':<28} {duracao_laco:8.3f}s")
+    print(f"  {'Lote (matriz esparsa)':<28} {duracao_lote:8.3f}s")
+
+    iguais = list(scores_lote.astype(int)) == scores_laco and all(
+        abs(agregados[c]['score_medio'] - media) < 1e-9 for c, media in medias_laco.items())
+    if not iguais:
+        print("[ERRO] Scores ou médias por cluster divergentes")
+        return False
+
+    print("[OK] Scores e médias por cluster idênticos nos dois métodos")
+    return True
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark da seleção estratégica")
+    parser.add_argument("--quantidade", type=int, default=100000,
+                        help="Número de resumos sintéticos (padrão: 100000)")
+    parser.add_argument("--modo", choices=["termos", "lote", "todos"], default="todos",
+                        help="termos: casador x busca termo a termo; "
+                             "lote: pontuação em lote x laço por notícia")
+    args = parser.parse_args()
+
+    sucesso = True
+    if args.modo in ("termos", "todos"):
+        sucesso = run_keyword_benchmark(args.quantidade) and sucesso
+    if args.modo in ("lote", "todos"):
+        sucesso = run_batch_benchmark(args.quantidade) and sucesso
+
+    return 0 if sucesso else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,8 @@ Permite executar testes individuais ou todos os testes de uma vez.
 
 from scripts.test_scrapers_robust import run_scraper_robust_test
 from scripts.test_database_integrity import run_database_integrity_test
+from scripts.test_deduplicacao import run_deduplication_test
+from scripts.test_api import run_api_test
 import sys
 import os
 import argparse
@@ -35,6 +37,20 @@ class TestRunner:
                 'function': run_scraper_robust_test,
                 'required_before_pipeline': False,
                 'execution_time': 'robusto'
+            },
+            'dedup': {
+                'name': 'Teste da Detecção de Duplicatas',
+                'description': 'Teste dos grupos de notícias quase duplicadas (MinHash + LSH)',
+                'function': run_deduplication_test,
+                'required_before_pipeline': False,
+                'execution_time': 'rápido'
+            },
+            'api': {
+                'name': 'Teste dos Endpoints da API',
+                'description': 'Teste das respostas da API REST com o TestClient do FastAPI',
+                'function': run_api_test,
+                'required_before_pipeline': False,
+                'execution_time': 'rápido'
             }
         }
 
@@ -249,6 +265,8 @@ Exemplos de uso:
   python scripts/run_tests.py --all                    # Executar todos os testes
   python scripts/run_tests.py --database              # Executar apenas teste de banco
   python scripts/run_tests.py --scrapers              # Executar apenas teste de scrapers
+  python scripts/run_tests.py --dedup                 # Executar apenas teste de deduplicação
+  python scripts/run_tests.py --api                   # Executar apenas teste da API
   python scripts/run_tests.py --prerequisites          # Executar testes obrigatórios
   python scripts/run_tests.py --list                   # Listar testes disponíveis
         """
@@ -262,6 +280,10 @@ Exemplos de uso:
                        help='Executar apenas teste de integridade do banco')
     group.add_argument('--scrapers', action='store_true',
                        help='Executar apenas teste robusto dos scrapers')
+    group.add_argument('--dedup', action='store_true',
+                       help='Executar apenas teste de detecção de duplicatas')
+    group.add_argument('--api', action='store_true',
+                       help='Executar apenas teste dos endpoints da API')
     group.add_argument('--prerequisites', action='store_true',
                        help='Executar apenas testes obrigatórios antes do pipeline')
     group.add_argument('--list', action='store_true',
@@ -290,6 +312,12 @@ Exemplos de uso:
         elif args.scrapers:
             success = runner.run_test('scrapers')
 
+        elif args.dedup:
+            success = runner.run_test('dedup')
+
+        elif args.api:
+            success = runner.run_test('api')
+
         elif args.prerequisites:
             success = runner.run_pipeline_prerequisites()
 
@@ -0,0 +1,88 @@
+# TESTE DOS ENDPOINTS DA API
+"""
+Teste rápido de endpoints da API REST com o TestClient do FastAPI, sem
+servidor em execução: verifica respostas em casos que já causaram erro.
+"""
+
+import os
+import sys
+from typing import List, Tuple
+
+# Adicionar o diretório raiz ao path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from api.app import app
+from api.access_log import get_access_logger
+
+
+class APITest:
+    """Casos dos endpoints da API"""
+
+    def __init__(self):
+        """Inicializa o teste"""
+        self.client = TestClient(app)
+        self.errors = []
+
+    def run_all_tests(self) -> Tuple[bool, List[str]]:
+        """
+        Executa todos os casos
+
+        Returns:
+            Tupla (sucesso, erros)
+        """
+        print("[INFO] Iniciando testes da API...")
+        self.errors = []
+
+        self._test_latency_stats_overflow()
+
+        for i, error in enumerate(self.errors, 1):
+            print(f"   {i}. {error}")
+
+        return len(self.errors) == 0, self.errors
+
+    def _test_latency_stats_overflow(self):
+        """Durações acima do último bucket não quebram /latency/stats"""
+        histograms = get_access_logger().histograms
+        route = "GET /teste/lenta"
+        for _ in range(5):
+            histograms.observe(route, 9000.0)
+
+        try:
+            response = self.client.get("/api/v1/latency/stats")
+            if response.status_code != 200:
+                self.errors.append(
+                    f"Latência: /latency/stats respondeu {response.status_code}")
+                return
+
+            stats = response.json()["data"]["routes"][route]
+            if stats["p99_ms"] is not None or stats["buckets_ms"]["+Inf"] != 5:
+                self.errors.append(f"Latência: estatísticas inesperadas {stats}")
+            else:
+                print("[OK] Percentis acima de 5000 ms retornados como null")
+        finally:
+            histograms.clear()
+
+
+def run_api_test() -> bool:
+    """
+    Função principal para executar o teste da API
+
+    Returns:
+        True se todos os casos passaram, False caso contrário
+    """
+    success, errors = APITest().run_all_tests()
+
+    if success:
+        print(f"\n[SUCESSO] Teste da API concluído com sucesso!")
+    else:
+        print(f"\n[ERRO] Teste da API falhou: {len(errors)} erro(s)")
+
+    return success
+
+
+if __name__ == "__main__":
+    # Executar teste quando chamado diretamente
+    success = run_api_test()
+    sys.exit(0 if success else 1)
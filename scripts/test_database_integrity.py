@@ -4,11 +4,13 @@ Teste rápido para verificar a integridade dos bancos de dados antes da execuç
 Este teste deve ser executado sempre antes do pipeline para evitar corrupção de dados.
 """
 
-from database.db_manager import get_db_manager
+from database.db_manager import get_db_manager, DatabaseManager
 from database.config import get_db_config
 import sqlite3
 import os
 import sys
+import itertools
+import tempfile
 from typing import Dict, List, Tuple, Any
 from datetime import datetime
 
@@ -45,6 +47,7 @@ class DatabaseIntegrityTest:
         self._test_database_connectivity()
         self._test_data_integrity()
         self._test_performance_indicators()
+        self._test_listing_query_plans()
 
         # Determinar sucesso
         success = len(self.errors) == 0
@@ -145,6 +148,66 @@ class DatabaseIntegrityTest:
         if os.path.exists(self.config.get_main_db_path()):
             self._test_performance(self.config.get_main_db_path(), 'noticias')
 
+    def _test_listing_query_plans(self):
+        """
+        Verifica via EXPLAIN QUERY PLAN que toda combinação de filtros da
+        listagem da API é atendida por índice, sem ordenação em memória, e que
+        a exportação percorre a tabela na ordem do rowid
+        """
+        print("  [INFO] Verificando planos de consulta da listagem...")
+
+        # Banco temporário com o esquema atual (independe dos bancos existentes)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            manager = DatabaseManager()
+            manager.main_db_path = os.path.join(tmp_dir, 'plano.db')
+
+            if not manager.initialize_main_database():
+                self.errors.append(
+                    "Falha ao criar banco temporário para os planos de consulta")
+                return
+
+            after_options = [None, (10.0, '2024-01-01 00:00:00', 1),
+                             (None, '2024-01-01 00:00:00', 1)]
+
+            with sqlite3.connect(manager.main_db_path) as conn:
+                for fonte, cluster, since, until, after in itertools.product(
+                        [None, 'Exame'], [None, 2],
+                        [None, '2024-01-01 00:00:00'], [None, '2024-02-01 00:00:00'],
+                        after_options):
+                    filters = {'status': 'postada', 'fonte': fonte, 'cluster': cluster,
+                               'since': since, 'until': until}
+                    only_null = after is not None and after[0] is None
+                    sql, params = manager.build_listing_query(
+                        filters, after, 16, only_null_score=only_null)
+
+                    plan = [row[3] for row in conn.execute(
+                        f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+                    plan_text = ' | '.join(plan)
+
+                    if 'INDEX' not in plan_text or 'TEMP B-TREE' in plan_text:
+                        combinacao = {k: v for k, v in filters.items()
+                                      if v is not None}
+                        self.errors.append(
+                            f"Listagem sem índice para {combinacao} (cursor={after is not None}): {plan_text}")
+
+                # Exportação: varredura na ordem do rowid, sem ordenar o resultado
+                for status, fonte, cluster, since in itertools.product(
+                        [None, 'postada'], [None, 'Exame'], [None, 2],
+                        [None, '2024-01-01 00:00:00']):
+                    filters = {'status': status, 'fonte': fonte, 'cluster': cluster,
+                               'since': since, 'until': None}
+                    sql, params = manager.build_export_query(filters)
+
+                    plan = [row[3] for row in conn.execute(
+                        f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+                    plan_text = ' | '.join(plan)
+
+                    if 'TEMP B-TREE' in plan_text or 'INDEX' in plan_text:
+                        combinacao = {k: v for k, v in filters.items()
+                                      if v is not None}
+                        self.errors.append(
+                            f"Exportação com ordenação temporária para {combinacao}: {plan_text}")
+
     def _is_valid_sqlite_file(self, file_path: str) -> bool:
         """Verifica se um arquivo é um SQLite válido"""
         try:
@@ -0,0 +1,138 @@
+# TESTE DA DETECÇÃO DE NOTÍCIAS QUASE DUPLICADAS
+"""
+Teste rápido da etapa de deduplicação (MinHash + LSH), sem banco de dados
+nem cache: verifica os grupos formados por detectar_duplicatas em textos
+sintéticos com resultado conhecido.
+"""
+
+import os
+import sys
+from typing import List, Tuple
+
+# Adicionar o diretório raiz ao path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipeline.deduplicacao import detectar_duplicatas, shingles
+from config.config import DEDUP_CONFIG
+
+
+def _palavras(inicio: int, fim: int) -> str:
+    """Texto com as palavras sintéticas de inicio (inclusive) a fim (exclusive)"""
+    return ' '.join(f"palavra{i}" for i in range(inicio, fim))
+
+
+def _jaccard(texto_a: str, texto_b: str) -> float:
+    """Similaridade de Jaccard exata entre os shingles de dois textos"""
+    a = set(shingles(texto_a, DEDUP_CONFIG['shingle']).tolist())
+    b = set(shingles(texto_b, DEDUP_CONFIG['shingle']).tolist())
+    return len(a & b) / len(a | b) if a | b else 0.0
+
+
+class DeduplicationTest:
+    """Casos da detecção de quase duplicatas"""
+
+    def __init__(self):
+        """Inicializa o teste"""
+        self.errors = []
+
+    def run_all_tests(self) -> Tuple[bool, List[str]]:
+        """
+        Executa todos os casos
+
+        Returns:
+            Tupla (sucesso, erros)
+        """
+        print("[INFO] Iniciando testes de detecção de duplicatas...")
+        self.errors = []
+
+        self._test_exact_duplicates()
+        self._test_distinct_texts()
+        self._test_empty_texts()
+        self._test_chain()
+
+        for i, error in enumerate(self.errors, 1):
+            print(f"   {i}. {error}")
+
+        return len(self.errors) == 0, self.errors
+
+    def _test_exact_duplicates(self):
+        """Cópias do mesmo texto formam um grupo em torno do mais longo"""
+        textos = [_palavras(0, 200), _palavras(0, 200) + " fim", _palavras(500, 700)]
+        grupos = detectar_duplicatas(textos)
+
+        esperado = [{'canonica': 1, 'duplicatas': [0]}]
+        obtido = [{'canonica': g['canonica'], 'duplicatas': [i for i, _ in g['duplicatas']]}
+                  for g in grupos]
+        if obtido != esperado:
+            self.errors.append(f"Cópias: esperado {esperado}, obtido {obtido}")
+        else:
+            print("[OK] Cópias agrupadas com a versão mais longa como canônica")
+
+    def _test_distinct_texts(self):
+        """Textos sem shingles em comum não formam grupos"""
+        textos = [_palavras(i * 100, i * 100 + 100) for i in range(10)]
+        grupos = detectar_duplicatas(textos)
+
+        if grupos:
+            self.errors.append(f"Textos distintos agrupados: {grupos}")
+        else:
+            print("[OK] Textos distintos mantidos")
+
+    def _test_empty_texts(self):
+        """Textos vazios não são duplicatas entre si"""
+        grupos = detectar_duplicatas(['', '', '   ', _palavras(0, 50)])
+
+        if grupos:
+            self.errors.append(f"Textos vazios agrupados: {grupos}")
+        else:
+            print("[OK] Textos vazios ignorados")
+
+    def _test_chain(self):
+        """
+        Cadeia A~B~C~D: cada texto é parecido com o vizinho, mas D não tem
+        relação com A. Só é removido quem é parecido com a canônica do grupo.
+        """
+        # Janelas de 100 palavras deslocadas de 25 em 25
+        textos = [_palavras(inicio, inicio + 100) for inicio in (0, 25, 50, 75)]
+        grupos = detectar_duplicatas(textos)
+
+        for grupo in grupos:
+            canonica = textos[grupo['canonica']]
+            for i, similaridade in grupo['duplicatas']:
+                if similaridade < DEDUP_CONFIG['limiar']:
+                    self.errors.append(
+                        f"Cadeia: texto {i} removido com similaridade {similaridade:.2f}")
+                if _jaccard(textos[i], canonica) < DEDUP_CONFIG['limiar'] - 0.15:
+                    self.errors.append(
+                        f"Cadeia: texto {i} sem relação com a canônica {grupo['canonica']}")
+
+        esperado = [{0, 1}, {2, 3}]
+        obtido = sorted(({g['canonica'], *(i for i, _ in g['duplicatas'])} for g in grupos),
+                        key=min)
+        if obtido != esperado:
+            self.errors.append(f"Cadeia: esperado {esperado}, obtido {obtido}")
+        elif not self.errors:
+            print("[OK] Cadeia dividida em grupos em torno de cada canônica")
+
+
+def run_deduplication_test() -> bool:
+    """
+    Função principal para executar o teste de deduplicação
+
+    Returns:
+        True se todos os casos passaram, False caso contrário
+    """
+    success, errors = DeduplicationTest().run_all_tests()
+
+    if success:
+        print(f"\n[SUCESSO] Teste de deduplicação concluído com sucesso!")
+    else:
+        print(f"\n[ERRO] Teste de deduplicação falhou: {len(errors)} erro(s)")
+
+    return success
+
+
+if __name__ == "__main__":
+    # Executar teste quando chamado diretamente
+    success = run_deduplication_test()
+    sys.exit(0 if success else 1)